@@ -1,10 +1,20 @@
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Query, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.concurrency import run_in_threadpool
+from fastapi.exception_handlers import http_exception_handler
+from fastapi.responses import Response, StreamingResponse
+from starlette.exceptions import HTTPException as StarletteHTTPException
 from pydantic import BaseModel
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Tuple, Union
+import asyncio
+import functools
+import math
+import numpy as np
 import sys
 import os
 import logging
+import threading
+import time
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -13,9 +23,23 @@ project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 sys.path.append(project_root)
 
 from src.data_loader import DataLoader
-from src.forecasting import TimeSeriesForecaster
-from src.config import DATASETS_CONFIG, RIVERS_BY, RIVER_COLORS
-from src.rivers_geojson import RIVERS_GEOJSON
+from src.dataset_watcher import DatasetWatcher
+from src.shared_datasets import SharedDatasetReader
+from src.forecasting import ProphetBusyError, ProphetDeferred, model_kind
+from src.forecast_cache import TTLCache
+from src.forecast_store import ForecastStore
+from src.forecast_worker import columnar_forecast, prophet_forecast, timed_forecast_series
+from src.execution import CpuExecutor, ExecutorSaturatedError
+from src.prophet_worker import ProphetWorkerPool
+from src.geo_payloads import GeoPayloadCache, StaticPayload, payload_response
+from src.geometry import SimplifiedCollection, parse_bbox
+from src.json_response import FastJSONResponse, dumps
+from src import metrics as prom
+from src.search_index import SearchIndex, catalog_occurrences
+from src.spatial_index import SpatialIndex
+from src import config as water_config
+from src import lakes_geojson, rivers_geojson
+from src.config import DATASETS_CONFIG
 
 app = FastAPI(title="Water Resources API")
 
@@ -27,19 +51,282 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-data_dir = os.path.join(project_root, 'data_clean')
-loader = DataLoader(data_dir=data_dir)
-forecaster = TimeSeriesForecaster()
+metrics = prom.Registry()
+http_latency = metrics.histogram(
+    "igisit_http_request_duration_seconds",
+    "Request latency by route template.",
+    labels=("method", "route"),
+)
+http_requests = metrics.counter(
+    "igisit_http_requests_total",
+    "Requests by route template and status code.",
+    labels=("method", "route", "status"),
+)
+http_in_flight = metrics.gauge(
+    "igisit_http_requests_in_flight", "Requests currently being processed."
+)
+http_exceptions = metrics.counter(
+    "igisit_http_exceptions_total",
+    "HTTPException responses by status code.",
+    labels=("status",),
+)
+forecast_fit_seconds = metrics.histogram(
+    "igisit_forecast_fit_seconds",
+    "Forecast fit duration by the chosen model kind.",
+    labels=("model",),
+    buckets=(0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0),
+)
+dataset_load_seconds = metrics.histogram(
+    "igisit_dataset_load_seconds",
+    "Time to open or parse a dataset.",
+    labels=("filename",),
+)
+# Added last, so it is the outermost middleware and also times CORS.
+app.add_middleware(
+    prom.MetricsMiddleware,
+    latency=http_latency,
+    requests=http_requests,
+    in_flight=http_in_flight,
+)
+
+# DATA_DIR points the API at another data_clean-style directory (e.g.
+# generated datasets for load tests).
+data_dir = os.environ.get("DATA_DIR") or os.path.join(project_root, 'data_clean')
+# SHARED_DATASETS=<prefix> attaches to datasets published by
+# scripts/publish_shared_datasets.py instead of loading them per worker.
+shared_prefix = os.environ.get("SHARED_DATASETS")
+loader = DataLoader(
+    data_dir=data_dir,
+    on_load=lambda filename, seconds: dataset_load_seconds.observe(seconds, filename),
+    shared=SharedDatasetReader(shared_prefix) if shared_prefix else None,
+)
+metrics.gauge(
+    "igisit_dataset_cache_entries",
+    "Entries in the DataLoader caches.",
+    labels=("cache",),
+    collect=lambda: [
+        (("stores",), len(loader.stores)),
+        (("frames",), len(loader.cache)),
+    ],
+)
+metrics.gauge(
+    "igisit_dataset_rows",
+    "Rows of every loaded dataset.",
+    labels=("filename",),
+    collect=lambda: [
+        ((filename,), len(store)) for filename, store in list(loader.stores.items())
+    ],
+)
+prophet_pool = ProphetWorkerPool(
+    workers=int(os.environ.get("PROPHET_WORKERS", "1")),
+    timeout=float(os.environ.get("PROPHET_TIMEOUT", "30")),
+    max_queue=int(os.environ.get("PROPHET_MAX_QUEUE", "4")),
+    start_timeout=float(os.environ.get("PROPHET_START_TIMEOUT", "120")),
+)
+forecast_cache = TTLCache(max_entries=256, ttl_seconds=3600)
+# Compressed /api/entity-data/{filename}/frames payloads.
+frames_cache = TTLCache(max_entries=64, ttl_seconds=3600)
+# /api/search index with the dataset versions it was built from.
+search_state: Dict = {}
+search_lock = threading.Lock()
+# /api/catalog payloads, keyed by the versions of all datasets.
+catalog_cache = TTLCache(max_entries=4, ttl_seconds=3600)
+# Polls data_dir and swaps reloaded datasets in the background; 0 disables
+# it (datasets are then re-checked on every request).  Not needed with
+# SHARED_DATASETS, where the publisher reloads.
+dataset_watcher = DatasetWatcher(
+    loader,
+    DATASETS_CONFIG,
+    interval=float(os.environ.get("DATASET_WATCH_INTERVAL", "2")),
+)
+dataset_reloads = metrics.counter(
+    "igisit_dataset_reloads_total",
+    "Datasets replaced by a newer version.",
+    labels=("filename",),
+)
+
+
+def drop_dataset_caches(filename: str, old, new) -> None:
+    if old is None:
+        return
+    dropped = forecast_cache.invalidate(lambda key: key[0] == filename)
+    frames_cache.invalidate(lambda key: key[0] == filename)
+    dataset_reloads.inc(filename)
+    logger.info("Dataset %s replaced, dropped %s cached forecasts", filename, dropped)
+
+
+loader.add_listener(drop_dataset_caches)
+forecast_store = ForecastStore(os.path.join(project_root, 'forecast_store'))
 
 CATEGORY_DEFAULT = "Реки"
+WATER_CATEGORIES = ("Реки", "Подземные воды")
+# Zoom levels with a pre-serialized simplified GeoJSON; deeper zooms get the
+# full geometry (the simplification tolerance is below a pixel there anyway).
+MAX_SIMPLIFY_ZOOM = int(os.environ.get("GEO_MAX_SIMPLIFY_ZOOM", "12"))
+ALL_ENTITIES = "*"
+# Upper bound on the series of one /api/forecast/batch request after
+# entity="*" expansion.
+BATCH_MAX_ITEMS = int(os.environ.get("FORECAST_BATCH_MAX_ITEMS", "500"))
+# How often a pending forecast checks whether its client is still there.
+DISCONNECT_POLL_INTERVAL = 0.5
+
+cpu_executor = CpuExecutor(
+    workers=int(os.environ.get("FORECAST_WORKERS", "0")) or None,
+    max_in_flight=int(os.environ.get("FORECAST_MAX_IN_FLIGHT", "0")) or None,
+    max_waiting=int(os.environ.get("FORECAST_MAX_QUEUE", "16")),
+    wait_timeout=float(os.environ.get("FORECAST_QUEUE_TIMEOUT", "5")),
+    blas_threads=int(os.environ.get("FORECAST_BLAS_THREADS", "1")),
+    max_batch_in_flight=int(os.environ.get("FORECAST_BATCH_IN_FLIGHT", "0")) or None,
+)
+
+
+@app.on_event("startup")
+def start_prophet_pool():
+    # Workers spawn and warm up Prophet in the background.
+    prophet_pool.start()
+
+
+@app.on_event("startup")
+def build_geo_payloads():
+    geo_payloads.build()
+
+
+@app.on_event("startup")
+def start_dataset_watcher():
+    if dataset_watcher.interval > 0 and loader.shared is None:
+        dataset_watcher.start()
+
+
+@app.on_event("startup")
+def warm_search_index():
+    # Loads every dataset as a side effect; the first /api/search is then fast.
+    threading.Thread(target=current_search_index, name="search-index", daemon=True).start()
+
+
+@app.on_event("shutdown")
+def stop_dataset_watcher():
+    dataset_watcher.stop()
+
+
+@app.on_event("shutdown")
+def shutdown_forecast_pools():
+    cpu_executor.shutdown()
+    prophet_pool.shutdown()
 
 
 def resolve_category_sources(category: Optional[str]):
     cat = category or CATEGORY_DEFAULT
     cat_normalized = cat.lower()
+    # Module attributes are read on every call: geo_payloads may reload them.
+    sources = (
+        water_config.RIVERS_BY,
+        water_config.RIVER_COLORS,
+        rivers_geojson.RIVERS_GEOJSON,
+    )
     if "подзем" in cat_normalized:
-        return RIVERS_BY, RIVER_COLORS, RIVERS_GEOJSON, "Подземные воды"
-    return RIVERS_BY, RIVER_COLORS, RIVERS_GEOJSON, "Реки"
+        return (*sources, "Подземные воды")
+    return (*sources, "Реки")
+
+
+def water_features_payload(category: str) -> Dict:
+    mapping, colors, _, resolved = resolve_category_sources(category)
+    features = [
+        {
+            "name": name,
+            "lat": data["lat"],
+            "lon": data["lon"],
+            "color": colors.get(name, "#4B5563"),
+        }
+        for name, data in mapping.items()
+    ]
+    return {"category": resolved, "features": features}
+
+
+def rivers_payload() -> Dict:
+    return {
+        "rivers": [
+            {
+                "name": name,
+                "lat": coords["lat"],
+                "lon": coords["lon"],
+                "color": water_config.RIVER_COLORS.get(name, "#808080")
+            }
+            for name, coords in water_config.RIVERS_BY.items()
+        ]
+    }
+
+
+def geo_payload_builders() -> Dict:
+    builders = {
+        "rivers": rivers_payload,
+        "rivers_geojson": lambda: rivers_geojson.RIVERS_GEOJSON,
+    }
+    for category in WATER_CATEGORIES:
+        builders[f"water_features:{category}"] = (
+            lambda category=category: water_features_payload(category)
+        )
+        builders[f"water_geojson:{category}"] = (
+            lambda category=category: resolve_category_sources(category)[2]
+        )
+        for zoom in range(MAX_SIMPLIFY_ZOOM + 1):
+            builders[f"water_geojson:{category}:z{zoom}"] = (
+                lambda category=category, zoom=zoom: geo_payloads.derived(
+                    f"water_levels:{category}"
+                ).render(zoom)
+            )
+    return builders
+
+
+def water_index_features() -> List[Dict]:
+    features = []
+    for kind, geojson in (
+        ("river", rivers_geojson.RIVERS_GEOJSON),
+        ("lake", lakes_geojson.LAKES_GEOJSON),
+    ):
+        for feature in geojson["features"]:
+            features.append(
+                {
+                    "properties": {**feature["properties"], "kind": kind},
+                    "geometry": feature["geometry"],
+                }
+            )
+    # Objects without a geometry are indexed by their marker point.
+    with_geometry = {feature["properties"].get("name") for feature in features}
+    for kind, mapping in (
+        ("river", water_config.RIVERS_BY),
+        ("lake", water_config.LAKES_BY),
+    ):
+        for name, data in mapping.items():
+            if name in with_geometry:
+                continue
+            features.append(
+                {
+                    "properties": {"name": name, "kind": kind},
+                    "geometry": {"type": "Point", "coordinates": [data["lon"], data["lat"]]},
+                }
+            )
+    return features
+
+
+def geo_derived_builders() -> Dict:
+    builders = {
+        f"water_levels:{category}": (
+            lambda category=category: SimplifiedCollection(
+                resolve_category_sources(category)[2]
+            )
+        )
+        for category in WATER_CATEGORIES
+    }
+    builders["water_index"] = lambda: SpatialIndex(water_index_features())
+    return builders
+
+
+geo_payloads = GeoPayloadCache(
+    modules=[water_config, lakes_geojson, rivers_geojson],
+    builders=geo_payload_builders(),
+    derived=geo_derived_builders(),
+    max_age=int(os.environ.get("GEO_CACHE_MAX_AGE", "300")),
+)
 
 
 def sort_categories(categories: List[str]) -> List[str]:
@@ -57,35 +344,98 @@ class ForecastRequest(BaseModel):
     category: Optional[str] = None
     periods: int = 10
 
+class BatchForecastRequest(BaseModel):
+    items: List[ForecastRequest]
+
 class ForecastResponse(BaseModel):
     historical: List[Dict]
     forecast: List[Dict]
     method: str
 
+class ColumnarHistorical(BaseModel):
+    years: List[int]
+    values: List[float]
+
+class ColumnarForecast(BaseModel):
+    years: List[int]
+    forecast: List[float]
+    lower: List[float]
+    upper: List[float]
+
+class ColumnarForecastResponse(BaseModel):
+    """/api/forecast?format=columnar"""
+    historical: ColumnarHistorical
+    forecast: ColumnarForecast
+    method: str
+
+@app.exception_handler(StarletteHTTPException)
+async def count_http_exceptions(request: Request, exc: StarletteHTTPException):
+    http_exceptions.inc(str(exc.status_code))
+    return await http_exception_handler(request, exc)
+
+
+@app.get("/metrics")
+def get_metrics():
+    return Response(metrics.render(), media_type=prom.CONTENT_TYPE)
+
+
 @app.get("/")
 def read_root():
     return {"message": "Water Resources API", "version": "1.0"}
 
 
 @app.get("/api/water/features")
-def get_water_features(category: Optional[str] = CATEGORY_DEFAULT):
-    mapping, colors, _, resolved = resolve_category_sources(category)
-    features = [
-        {
-            "name": name,
-            "lat": data["lat"],
-            "lon": data["lon"],
-            "color": colors.get(name, "#4B5563"),
-        }
-        for name, data in mapping.items()
-    ]
-    return {"category": resolved, "features": features}
+def get_water_features(request: Request, category: Optional[str] = CATEGORY_DEFAULT):
+    _, _, _, resolved = resolve_category_sources(category)
+    return geo_payloads.response(request, f"water_features:{resolved}")
 
 
 @app.get("/api/water/geojson")
-def get_water_geojson(category: Optional[str] = CATEGORY_DEFAULT):
-    _, _, geojson, _ = resolve_category_sources(category)
-    return geojson
+def get_water_geojson(
+    request: Request,
+    category: Optional[str] = CATEGORY_DEFAULT,
+    zoom: Optional[int] = Query(None, ge=0, le=30),
+    bbox: Optional[str] = None,
+):
+    _, _, _, resolved = resolve_category_sources(category)
+    if bbox is None:
+        key = f"water_geojson:{resolved}"
+        if zoom is not None and zoom <= MAX_SIMPLIFY_ZOOM:
+            key = f"{key}:z{zoom}"
+        return geo_payloads.response(request, key)
+
+    try:
+        box = parse_bbox(bbox)
+    except ValueError:
+        raise HTTPException(
+            status_code=400,
+            detail="Invalid bbox, expected minLon,minLat,maxLon,maxLat",
+        )
+    if zoom is not None and zoom > MAX_SIMPLIFY_ZOOM:
+        zoom = None
+    return geo_payloads.derived(f"water_levels:{resolved}").render(zoom, box)
+
+
+@app.get("/api/water/nearest")
+def get_water_nearest(
+    lat: float = Query(..., ge=-90, le=90),
+    lon: float = Query(..., ge=-180, le=180),
+    k: int = Query(5, ge=1, le=100),
+):
+    index = geo_payloads.derived("water_index")
+    return {"lat": lat, "lon": lon, "features": index.nearest(lon, lat, k)}
+
+
+@app.get("/api/water/within")
+def get_water_within(bbox: str):
+    try:
+        box = parse_bbox(bbox)
+    except ValueError:
+        raise HTTPException(
+            status_code=400,
+            detail="Invalid bbox, expected minLon,minLat,maxLon,maxLat",
+        )
+    return {"bbox": list(box), "features": geo_payloads.derived("water_index").within(box)}
 
 @app.get("/api/datasets")
 def get_datasets():
@@ -96,40 +446,227 @@ def get_datasets():
         ]
     }
 
+def dataset_info(filename: str, catalog) -> Dict:
+    categories = sort_categories(catalog.categories) if catalog.categories else []
+    return {
+        "filename": filename,
+        "title": DATASETS_CONFIG.get(filename, "Unknown"),
+        "has_entities": catalog.has_entities,
+        "entities": catalog.entities,
+        "entity_type": catalog.entity_type,
+        "indicators": catalog.indicators,
+        "categories": categories,
+        "category_entities": {
+            category: catalog.category_entities[category]
+            for category in categories
+            if category in catalog.category_entities
+        },
+        "year_range": catalog.year_range,
+    }
+
+
 @app.get("/api/dataset/{filename}")
 def get_dataset_info(filename: str):
     try:
-        df = loader.load_csv(filename)
-        has_entities, entities, entity_type, indicators, categories = loader.detect_structure(df)
-        categories = sort_categories(categories) if categories else []
-        year_range = loader.get_year_range(df)
-        
-        category_entities = {}
-        if categories and 'category' in df.columns and 'entity' in df.columns:
-            for category in categories:
-                subset = df[df['category'] == category]
-                if subset.empty:
-                    continue
-                category_entities[category] = sorted(
-                    subset['entity'].dropna().astype(str).unique().tolist()
-                )
-
-        return {
-            "filename": filename,
-            "title": DATASETS_CONFIG.get(filename, "Unknown"),
-            "has_entities": has_entities,
-            "entities": entities,
-            "entity_type": entity_type,
-            "indicators": indicators,
-            "categories": categories,
-            "category_entities": category_entities,
-            "year_range": year_range
-        }
+        return dataset_info(filename, loader.catalog(filename))
     except Exception as e:
         raise HTTPException(status_code=404, detail=str(e))
 
-@app.post("/api/forecast", response_model=ForecastResponse)
-def create_forecast(request: ForecastRequest):
+
+@app.get("/api/catalog")
+def get_catalog(request: Request, series: bool = True):
+    """
+    Metadata of every dataset in one call; ``series`` adds the non-empty
+    value count of every series.  Its indicator/entity codes index the
+    entry's lists; category codes index ``series.categories``, the full
+    alphabetical list (the entry's ``categories`` is filtered and
+    reordered for display).
+    """
+    snapshots = []
+    for filename in DATASETS_CONFIG:
+        try:
+            snapshots.append((filename, loader.snapshot(filename)))
+        except Exception as e:
+            logger.warning("Catalog skips %s: %s", filename, e)
+    cache_key = ("catalog", series, tuple((name, snap.version) for name, snap in snapshots))
+    payload = catalog_cache.get(cache_key)
+    if payload is None:
+        datasets = []
+        for filename, snap in snapshots:
+            entry = dataset_info(filename, snap.catalog)
+            if series:
+                entry["series"] = {
+                    field: values.tolist()
+                    for field, values in snap.catalog.to_dict()["series"].items()
+                }
+                entry["series"]["categories"] = snap.catalog.categories
+            datasets.append(entry)
+        payload = StaticPayload({"datasets": datasets}, compresslevel=6, quality=5)
+        # Only the latest versions matter.
+        catalog_cache.invalidate(lambda key: key[1] == series)
+        catalog_cache.put(cache_key, payload)
+    return payload_response(request, payload, "no-cache")
+
+def current_search_index() -> SearchIndex:
+    """
+    Index over all loaded datasets, rebuilt when any of them was reloaded.
+    """
+    snapshots = []
+    for filename in DATASETS_CONFIG:
+        try:
+            snapshots.append((filename, loader.snapshot(filename)))
+        except Exception as e:
+            logger.warning("Search index skips %s: %s", filename, e)
+    versions = tuple((filename, snap.version) for filename, snap in snapshots)
+    with search_lock:
+        if search_state.get("versions") != versions:
+            occurrences = []
+            for filename, snap in snapshots:
+                occurrences.extend(catalog_occurrences(filename, snap.catalog))
+            search_state["index"] = SearchIndex(occurrences)
+            search_state["versions"] = versions
+        return search_state["index"]
+
+
+@app.get("/api/search")
+def search_names(
+    q: str = Query(..., min_length=1, max_length=200),
+    limit: int = Query(20, ge=1, le=100),
+    kind: Optional[str] = Query(None, pattern="^(indicator|entity|category)$"),
+):
+    """
+    Ranked indicator/entity/category names: exact, name prefix, word
+    prefix, then trigram similarity.
+    """
+    index = current_search_index()
+    results = index.search(q, limit=limit, kinds=[kind] if kind else None)
+    return FastJSONResponse({"query": q, "results": results})
+
+
+def lookup_precomputed_forecast(request: ForecastRequest) -> Optional[Dict]:
+    series = loader.resolve_series(
+        request.filename,
+        indicator=request.indicator,
+        entity=request.entity,
+        category=request.category,
+    )
+    if series is None:
+        return None
+    return forecast_store.get(
+        request.filename,
+        loader.content_hash(request.filename),
+        *series,
+        request.periods,
+    )
+
+class ForecastInputError(ValueError):
+    """The requested series cannot be forecast (HTTP 400)."""
+
+
+def prepare_forecast(
+    request: ForecastRequest,
+) -> Tuple[Tuple, Optional[Dict], Optional[Tuple[List[int], List[float]]]]:
+    """
+    Blocking part of a forecast request, run in the threadpool: the cache
+    key and either the cached/precomputed payload (both shapes, see
+    forecast_shapes) or the series to fit.
+    """
+    snapshot = loader.snapshot(request.filename)
+    cache_key = (
+        request.filename,
+        request.indicator,
+        request.entity,
+        request.category,
+        request.periods,
+        snapshot.version,
+    )
+    payload = forecast_cache.get(cache_key)
+    if payload is not None:
+        logger.info("Forecast served from cache")
+        return cache_key, payload, None
+
+    rows = lookup_precomputed_forecast(request)
+    if rows is not None:
+        logger.info("Forecast served from precomputed store")
+        payload = {"rows": rows, "columnar": columnar_forecast(rows)}
+        forecast_cache.put(cache_key, payload)
+        return cache_key, payload, None
+
+    if not len(snapshot.store):
+        raise ForecastInputError("Dataset is empty")
+    years, values = loader.series_arrays(
+        request.filename,
+        indicator=request.indicator,
+        entity=request.entity,
+        category=request.category,
+    )
+    logger.info(f"Prepared timeseries: {len(years)} data points")
+    if not len(years):
+        raise ForecastInputError(
+            "No time series data available. Try selecting a specific entity or indicator."
+        )
+    if len(years) < 3:
+        raise ForecastInputError(f"Not enough data points (need at least 3, got {len(years)})")
+    return cache_key, None, (years.tolist(), values.tolist())
+
+
+async def fit_forecast(
+    years: List[int], values: List[float], periods: int, queued: bool = False
+) -> Dict:
+    """
+    Fits the polynomial models in the CPU pool; if they fail, the series
+    goes to prophet_pool from a thread holding a CPU executor slot.
+    """
+    run = cpu_executor.run_queued if queued else cpu_executor.run
+    try:
+        payload, seconds = await run(timed_forecast_series, years, values, periods, False)
+    except ProphetDeferred:
+        start = time.perf_counter()
+        # Set when the request goes away so the Prophet worker is freed.
+        cancel = threading.Event()
+        job = functools.partial(
+            prophet_forecast, prophet_pool.forecast, years, values, periods, cancel=cancel
+        )
+        try:
+            payload = await cpu_executor.run_blocking(job, queued=queued)
+        except asyncio.CancelledError:
+            cancel.set()
+            raise
+        seconds = time.perf_counter() - start
+    forecast_fit_seconds.observe(seconds, model_kind(payload["rows"]["method"]))
+    return payload
+
+async def cancel_on_disconnect(http_request: Request, awaitable):
+    """
+    Awaits ``awaitable`` but cancels it as soon as the client disconnects,
+    so an abandoned request stops holding CPU slots and Prophet workers.
+    """
+    task = asyncio.ensure_future(awaitable)
+    try:
+        while True:
+            done, _ = await asyncio.wait({task}, timeout=DISCONNECT_POLL_INTERVAL)
+            if done:
+                return task.result()
+            if await http_request.is_disconnected():
+                raise HTTPException(status_code=499, detail="Client closed request")
+    finally:
+        task.cancel()
+
+
+def forecast_response(payload: Dict, response_format: str) -> FastJSONResponse:
+    return FastJSONResponse(payload[response_format])
+
+
+@app.post("/api/forecast", response_model=Union[ForecastResponse, ColumnarForecastResponse])
+async def create_forecast(
+    request: ForecastRequest,
+    http_request: Request,
+    response_format: str = Query("rows", alias="format", pattern="^(rows|columnar)$"),
+):
+    """
+    format=columnar returns one list per field (years, values, forecast,
+    lower, upper) instead of one object per year.
+    """
     try:
         logger.info(
             "Forecast request: filename=%s, entity=%s, indicator=%s, category=%s, periods=%s",
@@ -139,78 +676,183 @@ def create_forecast(request: ForecastRequest):
             request.category,
             request.periods,
         )
-        
-        df = loader.load_csv(request.filename)
-        logger.info(f"Loaded dataset: {len(df)} rows, {len(df.columns)} columns")
-        
-        if df.empty:
-            logger.error("Dataset is empty")
-            raise HTTPException(status_code=400, detail="Dataset is empty")
-        
-        ts_data = loader.prepare_timeseries(
-            df,
-            indicator=request.indicator,
-            entity=request.entity,
-            category=request.category,
+
+        cache_key, payload, series = await run_in_threadpool(prepare_forecast, request)
+        if payload is not None:
+            return forecast_response(payload, response_format)
+
+        response = await cancel_on_disconnect(
+            http_request, fit_forecast(*series, request.periods)
         )
-        logger.info(f"Prepared timeseries: {len(ts_data)} data points")
-        
-        if ts_data.empty:
-            logger.error("No time series data available")
-            raise HTTPException(status_code=400, detail="No time series data available. Try selecting a specific entity or indicator.")
-        
-        if len(ts_data) < 3:
-            logger.error(f"Not enough data points: {len(ts_data)}")
-            raise HTTPException(status_code=400, detail=f"Not enough data points (need at least 3, got {len(ts_data)})")
-        
-        forecast_df, method = forecaster.auto_forecast(ts_data, periods=request.periods)
-        
-        if forecast_df.empty:
-            raise HTTPException(status_code=500, detail="Forecast failed to generate")
         
-        historical = []
-        for _, row in ts_data.iterrows():
-            try:
-                year_val = int(row['year'].year) if hasattr(row['year'], 'year') else int(row['year'])
-                value_val = float(row['value'])
-                historical.append({"year": year_val, "value": value_val})
-            except Exception as e:
-                continue
-        
-        if not historical:
+        if not response["rows"]["historical"]:
             raise HTTPException(status_code=500, detail="Failed to process historical data")
         
-        forecast = []
-        for _, row in forecast_df.iterrows():
-            try:
-                year_val = int(row['year'].year) if hasattr(row['year'], 'year') else int(row['year'])
-                forecast_val = float(row['forecast'])
-                lower_val = float(row['lower'])
-                upper_val = float(row['upper'])
-                forecast.append({
-                    "year": year_val,
-                    "forecast": forecast_val,
-                    "lower": lower_val,
-                    "upper": upper_val
-                })
-            except Exception as e:
-                continue
-        
-        if not forecast:
+        if not response["rows"]["forecast"]:
             raise HTTPException(status_code=500, detail="Failed to process forecast data")
         
-        return {
-            "historical": historical,
-            "forecast": forecast,
-            "method": method
-        }
+        forecast_cache.put(cache_key, response)
+        return forecast_response(response, response_format)
     except HTTPException:
         raise
+    except ForecastInputError as e:
+        logger.error(str(e))
+        raise HTTPException(status_code=400, detail=str(e))
+    except ExecutorSaturatedError as e:
+        raise HTTPException(
+            status_code=503,
+            detail=str(e),
+            headers={"Retry-After": str(e.retry_after)},
+        )
+    except ProphetBusyError as e:
+        raise HTTPException(
+            status_code=503,
+            detail=str(e),
+            headers={"Retry-After": str(math.ceil(prophet_pool.timeout))},
+        )
     except Exception as e:
         import traceback
         error_detail = f"{str(e)}\n{traceback.format_exc()}"
         raise HTTPException(status_code=500, detail=error_detail)
 
+def expand_batch_items(items: List[ForecastRequest]) -> List[ForecastRequest]:
+    expanded: List[ForecastRequest] = []
+    for item in items:
+        if item.entity != ALL_ENTITIES:
+            expanded.append(item)
+        else:
+            store = loader.load_store(item.filename)
+            year_map = store.entity_map(indicator=item.indicator, category=item.category)
+            for entity in (year_map.entities if year_map else []):
+                expanded.append(item.model_copy(update={"entity": entity}))
+        if len(expanded) > BATCH_MAX_ITEMS:
+            raise ForecastInputError(
+                f"Batch expands to more than {BATCH_MAX_ITEMS} series; split the request"
+            )
+    return expanded
+
+
+@app.post("/api/forecast/batch")
+async def create_forecast_batch(request: BatchForecastRequest):
+    """
+    Streams one NDJSON line per series as soon as its forecast is ready.
+    Use entity="*" to expand a spec to every entity of the indicator.
+    """
+    try:
+        items = await run_in_threadpool(expand_batch_items, request.items)
+    except ForecastInputError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=404, detail=str(e))
+
+    async def run_item(index: int, item: ForecastRequest) -> Dict:
+        result = {
+            "index": index,
+            "filename": item.filename,
+            "indicator": item.indicator,
+            "entity": item.entity,
+            "category": item.category,
+        }
+        try:
+            cache_key, payload, series = await run_in_threadpool(prepare_forecast, item)
+            if payload is None:
+                payload = await fit_forecast(*series, item.periods, queued=True)
+                forecast_cache.put(cache_key, payload)
+            result.update(status="ok", **payload["rows"])
+        except Exception as e:
+            result.update(status="error", detail=str(e))
+        return result
+
+    async def stream():
+        # A fixed number of workers pull the items, so a large batch never
+        # has more jobs waiting than the executor's batch lane admits.
+        pending = iter(enumerate(items))
+        results: asyncio.Queue = asyncio.Queue()
+
+        async def worker():
+            for index, item in pending:
+                await results.put(await run_item(index, item))
+
+        workers = [
+            asyncio.ensure_future(worker())
+            for _ in range(min(len(items), cpu_executor.max_batch_in_flight))
+        ]
+        try:
+            for _ in items:
+                # Same encoder as FastJSONResponse: NaN becomes null.
+                yield dumps(await results.get()) + b"\n"
+        finally:
+            for task in workers:
+                task.cancel()
+
+    return StreamingResponse(stream(), media_type="application/x-ndjson")
+
+@app.get("/api/forecast/cache")
+def get_forecast_cache_stats():
+    return forecast_cache.stats()
+
+@app.get("/api/execution")
+def get_execution_stats():
+    return cpu_executor.stats()
+
+def build_entity_frames(filename: str, indicator: Optional[str], category: Optional[str]) -> Dict:
+    """
+    /api/entity-data/{filename}/{year} for every year of the dataset's
+    range, resolved the same way.
+    """
+    catalog = loader.catalog(filename)
+    if not catalog.has_entities:
+        return {"type": catalog.entity_type, "frames": []}
+
+    entities = catalog.entities_for(category)
+    year_min, year_max = catalog.year_range
+    frames = []
+    for year in range(year_min, year_max + 1):
+        entity_values, resolved_year = loader.get_entity_data(
+            filename,
+            year,
+            entities,
+            indicator=indicator,
+            category=category,
+        )
+        frames.append(
+            {"year": resolved_year, "requested_year": year, "entities": entity_values}
+        )
+    return {
+        "type": catalog.entity_type,
+        "categories": catalog.categories,
+        "year_range": [year_min, year_max],
+        "frames": frames,
+    }
+
+
+# Registered before /{year}, which would otherwise try to parse "frames".
+@app.get("/api/entity-data/{filename}/frames")
+def get_entity_frames(
+    request: Request,
+    filename: str,
+    indicator: Optional[str] = None,
+    category: Optional[str] = None,
+):
+    try:
+        cache_key = (filename, indicator, category, loader.snapshot(filename).version)
+        payload = frames_cache.get(cache_key)
+        if payload is None:
+            # Built on a request path, so trade some ratio for speed.
+            payload = StaticPayload(
+                build_entity_frames(filename, indicator, category),
+                compresslevel=6,
+                quality=5,
+            )
+            frames_cache.put(cache_key, payload)
+    except FileNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+    # Revalidated on every use: the dataset may be reloaded meanwhile.
+    return payload_response(request, payload, "no-cache")
+
+
 @app.get("/api/entity-data/{filename}/{year}")
 def get_entity_data(
     filename: str,
@@ -219,52 +861,35 @@ def get_entity_data(
     category: Optional[str] = None,
 ):
     try:
-        df = loader.load_csv(filename)
-        has_entities, entities, entity_type, indicators, categories = loader.detect_structure(df)
-        
-        if not has_entities:
-            return {"entities": {}, "type": entity_type}
+        catalog = loader.catalog(filename)
+        if not catalog.has_entities:
+            return {"entities": {}, "type": catalog.entity_type}
 
-        if category and 'category' in df.columns:
-            cat_entities = df[df['category'] == category]['entity'].dropna().astype(str).unique().tolist()
-            if cat_entities:
-                entities = sorted(cat_entities)
-        
         entity_values, resolved_year = loader.get_entity_data(
-            df,
+            filename,
             year,
-            entities,
+            catalog.entities_for(category),
             indicator=indicator,
             category=category,
         )
         
         return {
             "entities": entity_values,
-            "type": entity_type,
+            "type": catalog.entity_type,
             "year": resolved_year,
             "requested_year": year,
-            "categories": categories,
+            "categories": catalog.categories,
         }
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.get("/api/rivers")
-def get_rivers():
-    return {
-        "rivers": [
-            {
-                "name": name,
-                "lat": coords["lat"],
-                "lon": coords["lon"],
-                "color": RIVER_COLORS.get(name, "#808080")
-            }
-            for name, coords in RIVERS_BY.items()
-        ]
-    }
+def get_rivers(request: Request):
+    return geo_payloads.response(request, "rivers")
 
 @app.get("/api/rivers/geojson")
-def get_rivers_geojson():
-    return RIVERS_GEOJSON
+def get_rivers_geojson(request: Request):
+    return geo_payloads.response(request, "rivers_geojson")
 
 @app.get("/api/debug/dataset/{filename}")
 def debug_dataset(filename: str):
@@ -281,28 +906,63 @@ def debug_dataset(filename: str):
         import traceback
         return {"error": str(e), "traceback": traceback.format_exc()}
 
+@app.get("/api/timeseries/{filename}/matrix")
+def get_timeseries_matrix(
+    filename: str,
+    indicator: Optional[str] = None,
+    category: Optional[str] = None,
+):
+    """
+    Every entity of the selection at once: ``values[i][j]`` is the value
+    of ``entities[j]`` in ``years[i]``, null where missing.  Years without
+    any value are left out.
+    """
+    try:
+        selection = loader.entity_matrix(filename, indicator=indicator, category=category)
+    except FileNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+    if selection is None:
+        raise HTTPException(status_code=404, detail="No entity data for this selection")
+
+    resolved_indicator, year_map = selection
+    return FastJSONResponse(
+        {
+            "indicator": resolved_indicator,
+            "category": category,
+            "years": year_map.year_axis[year_map.has_any],
+            "entities": year_map.entities,
+            "values": year_map.values[year_map.has_any],
+        }
+    )
+
+
 @app.get("/api/timeseries/{filename}")
 def get_timeseries(
     filename: str,
     entity: Optional[str] = None,
     indicator: Optional[str] = None,
     category: Optional[str] = None,
+    response_format: str = Query("rows", alias="format", pattern="^(rows|columnar)$"),
 ):
     try:
-        df = loader.load_csv(filename)
-        ts_data = loader.prepare_timeseries(
-            df, indicator=indicator, entity=entity, category=category
+        years, values = loader.series_arrays(
+            filename, indicator=indicator, entity=entity, category=category
         )
-        
-        if ts_data.empty:
-            return {"data": []}
-        
+        if response_format == "columnar":
+            return FastJSONResponse(
+                {
+                    "years": np.ascontiguousarray(years),
+                    "values": np.ascontiguousarray(values),
+                }
+            )
+
         data = [
-            {"year": int(row['year'].year), "value": float(row['value'])}
-            for _, row in ts_data.iterrows()
+            {"year": year, "value": value}
+            for year, value in zip(years.tolist(), values.tolist())
         ]
-        
-        return {"data": data}
+        return FastJSONResponse({"data": data})
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -20,7 +20,7 @@ for i, ind in enumerate(indicators[:10]):
     print(f"  {i+1}. {ind}")
 
 print("\n\nTrying to get timeseries without filter:")
-ts = loader.prepare_timeseries(df)
+ts = loader.prepare_timeseries('C1-1990-2023.csv')
 print(f"Result: {len(ts)} points")
 if not ts.empty:
     print(ts.head())
@@ -29,7 +29,7 @@ else:
 
 if indicators:
     print(f"\n\nTrying with indicator: {indicators[0]}")
-    ts = loader.prepare_timeseries(df, indicator=indicators[0])
+    ts = loader.prepare_timeseries('C1-1990-2023.csv', indicator=indicators[0])
     print(f"Result: {len(ts)} points")
     if not ts.empty:
         print(ts.head())
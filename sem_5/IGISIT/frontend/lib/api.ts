@@ -19,6 +19,28 @@ export interface DatasetInfo {
   year_range: [number, number];
 }
 
+export interface CatalogEntry extends DatasetInfo {
+  // One entry per series: positions in indicators/entities and in
+  // series.categories (-1 when missing) and the number of non-empty values.
+  series?: {
+    indicator: number[];
+    entity: number[];
+    category: number[];
+    values: number[];
+    // All categories in alphabetical order; unlike DatasetInfo.categories
+    // not filtered or reordered for display.
+    categories: string[];
+  };
+}
+
+export interface SearchResult {
+  kind: 'indicator' | 'entity' | 'category';
+  name: string;
+  score: number;
+  datasets: string[];
+  categories: string[];
+}
+
 export interface TimeSeriesPoint {
   year: number;
   value: number;
@@ -37,6 +59,62 @@ export interface ForecastResponse {
   method: string;
 }
 
+export interface ColumnarSeries {
+  years: number[];
+  values: number[];
+}
+
+export interface ColumnarForecastResponse {
+  historical: ColumnarSeries;
+  forecast: {
+    years: number[];
+    forecast: number[];
+    lower: number[];
+    upper: number[];
+  };
+  method: string;
+}
+
+export interface EntityMatrix {
+  indicator: string | null;
+  category: string | null;
+  years: number[];
+  entities: string[];
+  // values[i][j]: entities[j] in years[i], null where missing
+  values: (number | null)[][];
+}
+
+export interface EntityFrame {
+  year: number;
+  requested_year: number;
+  entities: Record<string, number>;
+}
+
+export interface EntityFrames {
+  type: string;
+  categories?: string[];
+  year_range?: [number, number];
+  frames: EntityFrame[];
+}
+
+export interface ForecastSpec {
+  filename: string;
+  entity?: string;
+  indicator?: string;
+  category?: string;
+  periods?: number;
+}
+
+export interface BatchForecastResult extends Partial<ForecastResponse> {
+  index: number;
+  filename: string;
+  entity?: string | null;
+  indicator?: string | null;
+  category?: string | null;
+  status: 'ok' | 'error';
+  detail?: string;
+}
+
 export interface WaterFeature {
   name: string;
   lat: number;
@@ -55,6 +133,23 @@ export const api = {
     return response.data;
   },
 
+  async search(
+    query: string,
+    limit: number = 20,
+    kind?: SearchResult['kind']
+  ): Promise<SearchResult[]> {
+    const params = new URLSearchParams({ q: query, limit: String(limit) });
+    if (kind) params.append('kind', kind);
+
+    const response = await axios.get(`${API_BASE_URL}/api/search?${params}`);
+    return response.data.results;
+  },
+
+  async getCatalog(series: boolean = true): Promise<CatalogEntry[]> {
+    const response = await axios.get(`${API_BASE_URL}/api/catalog?series=${series}`);
+    return response.data.datasets;
+  },
+
   async getForecast(
     filename: string,
     entity?: string,
@@ -72,6 +167,54 @@ export const api = {
     return response.data;
   },
 
+  async getForecastColumnar(
+    filename: string,
+    entity?: string,
+    indicator?: string,
+    category?: string,
+    periods: number = 10
+  ): Promise<ColumnarForecastResponse> {
+    const response = await axios.post(
+      `${API_BASE_URL}/api/forecast`,
+      { filename, entity, indicator, category, periods },
+      { params: { format: 'columnar' } }
+    );
+    return response.data;
+  },
+
+  async getForecastBatch(
+    items: ForecastSpec[],
+    onResult?: (result: BatchForecastResult) => void
+  ): Promise<BatchForecastResult[]> {
+    const response = await fetch(`${API_BASE_URL}/api/forecast/batch`, {
+      method: 'POST',
+      headers: { 'Content-Type': 'application/json' },
+      body: JSON.stringify({ items }),
+    });
+    if (!response.ok || !response.body) {
+      throw new Error(`Batch forecast failed: ${response.status}`);
+    }
+
+    const results: BatchForecastResult[] = [];
+    const reader = response.body.getReader();
+    const decoder = new TextDecoder();
+    let buffer = '';
+    while (true) {
+      const { done, value } = await reader.read();
+      buffer += decoder.decode(value, { stream: !done });
+      const lines = buffer.split('\n');
+      buffer = done ? '' : lines.pop() ?? '';
+      for (const line of lines) {
+        if (!line.trim()) continue;
+        const result: BatchForecastResult = JSON.parse(line);
+        results.push(result);
+        onResult?.(result);
+      }
+      if (done) break;
+    }
+    return results;
+  },
+
   async getEntityData(
     filename: string,
     year: number,
@@ -95,6 +238,19 @@ export const api = {
     return response.data;
   },
 
+  async getEntityFrames(
+    filename: string,
+    indicator?: string,
+    category?: string
+  ): Promise<EntityFrames> {
+    const params = new URLSearchParams();
+    if (indicator) params.append('indicator', indicator);
+    if (category) params.append('category', category);
+
+    const response = await axios.get(`${API_BASE_URL}/api/entity-data/${filename}/frames?${params}`);
+    return response.data;
+  },
+
   async getWaterFeatures(category: string): Promise<WaterFeature[]> {
     const response = await axios.get(`${API_BASE_URL}/api/water/features`, {
       params: { category },
@@ -102,9 +258,30 @@ export const api = {
     return response.data.features;
   },
 
-  async getWaterGeoJSON(category: string): Promise<any> {
+  async getWaterGeoJSON(
+    category: string,
+    zoom?: number,
+    bbox?: [number, number, number, number]
+  ): Promise<any> {
+    const params: any = { category };
+    if (zoom !== undefined) params.zoom = Math.round(zoom);
+    if (bbox) params.bbox = bbox.join(',');
     const response = await axios.get(`${API_BASE_URL}/api/water/geojson`, {
-      params: { category },
+      params,
+    });
+    return response.data;
+  },
+
+  async getNearestWater(lat: number, lon: number, k: number = 5): Promise<any> {
+    const response = await axios.get(`${API_BASE_URL}/api/water/nearest`, {
+      params: { lat, lon, k },
+    });
+    return response.data;
+  },
+
+  async getWaterWithin(bbox: [number, number, number, number]): Promise<any> {
+    const response = await axios.get(`${API_BASE_URL}/api/water/within`, {
+      params: { bbox: bbox.join(',') },
     });
     return response.data;
   },
@@ -123,5 +300,33 @@ export const api = {
     const response = await axios.get(`${API_BASE_URL}/api/timeseries/${filename}?${params}`);
     return response.data.data;
   },
+
+  async getTimeSeriesColumnar(
+    filename: string,
+    entity?: string,
+    indicator?: string,
+    category?: string
+  ): Promise<ColumnarSeries> {
+    const params = new URLSearchParams({ format: 'columnar' });
+    if (entity) params.append('entity', entity);
+    if (indicator) params.append('indicator', indicator);
+    if (category) params.append('category', category);
+
+    const response = await axios.get(`${API_BASE_URL}/api/timeseries/${filename}?${params}`);
+    return response.data;
+  },
+
+  async getTimeSeriesMatrix(
+    filename: string,
+    indicator?: string,
+    category?: string
+  ): Promise<EntityMatrix> {
+    const params = new URLSearchParams();
+    if (indicator) params.append('indicator', indicator);
+    if (category) params.append('category', category);
+
+    const response = await axios.get(`${API_BASE_URL}/api/timeseries/${filename}/matrix?${params}`);
+    return response.data;
+  },
 };
 
@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""
+Benchmark for the vectorized workbook parsers of normalize_datasets.
+
+Builds a synthetic sheet shaped like the raw Excel tables (title lines, a
+year header row, numbered data rows with "1 234,5"-style numbers, blanks
+and "…" placeholders) and parses it with the row-by-row reference
+implementation and with the vectorized parse_simple / C11 surface parser.
+Both outputs must be identical.
+
+Usage:
+    python scripts/bench_normalize.py [--rows 200000] [--years 20]
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List
+
+import numpy as np
+import pandas as pd
+
+SCRIPTS_DIR = Path(__file__).resolve().parent
+sys.path.append(str(SCRIPTS_DIR))
+
+from normalize_datasets import (  # noqa: E402
+    _parse_c11_surface_sheet,
+    clean_numeric,
+    ensure_column_order,
+    filter_indicator,
+    is_numeric_code,
+    normalize_text,
+    parse_simple,
+    try_parse_year,
+)
+
+
+def make_sheet(rows: int, years: int, seed: int = 0) -> pd.DataFrame:
+    """Object-typed frame as pd.read_excel(header=None) returns it."""
+    rng = np.random.default_rng(seed)
+    width = 2 + years
+    sheet: List[List] = [
+        ["Таблица 1. Синтетические данные"] + [None] * (width - 1),
+        [None, "(млн куб. м)"] + [None] * years,
+        [None, None] + [float(2000 + offset) for offset in range(years)],
+    ]
+    values = np.round(rng.normal(500, 200, size=(rows, years)), 2)
+    kinds = rng.integers(0, 10, size=(rows, years))
+    for idx in range(rows):
+        if idx % 500 == 0:
+            sheet.append([None, f"Показатель {idx // 500} (тыс. т)"] + [None] * years)
+            continue
+        cells: List = [f"{idx % 97}.", f"Объект {idx % 1000}"]
+        for value, kind in zip(values[idx], kinds[idx]):
+            if kind == 0:
+                cells.append(None)
+            elif kind == 1:
+                cells.append("…")
+            elif kind < 4:
+                cells.append(f"{value:,.2f}".replace(",", " ").replace(".", ","))
+            else:
+                cells.append(float(value))
+        sheet.append(cells)
+    return pd.DataFrame(sheet, dtype=object)
+
+
+def rowwise_year_values(row: pd.Series, year_cols) -> Dict[str, float]:
+    values: Dict[str, float] = {}
+    for col_idx, year in year_cols:
+        value = clean_numeric(row.iloc[col_idx])
+        if value is not None:
+            values[str(year)] = value
+    return values
+
+
+def rowwise_year_columns(df: pd.DataFrame):
+    for idx in range(len(df)):
+        years = [
+            (col_idx, year)
+            for col_idx, year in enumerate(map(try_parse_year, df.iloc[idx]))
+            if year is not None
+        ]
+        if len(years) >= 3:
+            return idx, years
+    raise ValueError("Could not detect header row with year columns")
+
+
+def rowwise_simple(df: pd.DataFrame) -> pd.DataFrame:
+    header_idx, year_cols = rowwise_year_columns(df)
+    rows = []
+    for idx in range(header_idx + 1, len(df)):
+        row = df.iloc[idx]
+        indicator = normalize_text(row.iloc[1]) or normalize_text(row.iloc[0])
+        if not indicator or not filter_indicator(indicator):
+            continue
+        values = rowwise_year_values(row, year_cols)
+        if values:
+            rows.append({"indicator": indicator, "entity": "Беларусь", **values})
+    return ensure_column_order(pd.DataFrame(rows))
+
+
+def rowwise_surface(df: pd.DataFrame) -> pd.DataFrame:
+    _, year_cols = rowwise_year_columns(df)
+    rows = []
+    current_indicator = ""
+    for idx in range(len(df)):
+        row = df.iloc[idx]
+        texts = [text for text in map(normalize_text, row) if text]
+        if not texts or any("единица" in text.lower() for text in texts):
+            continue
+        if len(texts) == 1 and "(" in texts[0]:
+            current_indicator = texts[0]
+            continue
+        entity = normalize_text(row.iloc[1])
+        if not is_numeric_code(normalize_text(row.iloc[0])) or not entity:
+            continue
+        values = rowwise_year_values(row, year_cols)
+        if values:
+            rows.append(
+                {
+                    "indicator": current_indicator or "Показатель",
+                    "entity": entity,
+                    "category": "Реки",
+                    **values,
+                }
+            )
+    return ensure_column_order(pd.DataFrame(rows))
+
+
+def timed(func):
+    start = time.perf_counter()
+    result = func()
+    return result, time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--years", type=int, default=20)
+    args = parser.parse_args()
+
+    sheet = make_sheet(args.rows, args.years)
+    print(f"Synthetic sheet: {sheet.shape[0]} rows x {sheet.shape[1]} columns")
+    print(f"{'parser':>10} {'row-wise s':>11} {'vectorized s':>13} {'speedup':>8} {'identical':>10}")
+    cases = [
+        ("simple", rowwise_simple, parse_simple),
+        (
+            "c11",
+            rowwise_surface,
+            lambda df: ensure_column_order(_parse_c11_surface_sheet(df, "Реки")),
+        ),
+    ]
+    for name, reference, vectorized in cases:
+        expected, slow = timed(lambda: reference(sheet))
+        actual, fast = timed(lambda: vectorized(sheet))
+        identical = expected.equals(actual)
+        print(
+            f"{name:>10} {slow:>11.2f} {fast:>13.2f} "
+            f"{slow / fast:>7.1f}x {str(identical):>10}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Microbenchmark for the polynomial candidate sweep of forecast_polynomial.
+
+Compares the per-candidate sklearn pipelines (PolynomialFeatures + Ridge)
+with the batched closed-form solver fit_polynomial_ridge_grid on random
+series of typical lengths and checks that both give the same predictions.
+
+Usage:
+    python scripts/bench_polynomial.py [--repeats 50]
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+from sklearn.linear_model import Ridge
+from sklearn.pipeline import make_pipeline
+from sklearn.preprocessing import PolynomialFeatures
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+sys.path.append(str(PROJECT_ROOT))
+
+from src.forecasting import fit_polynomial_ridge_grid  # noqa: E402
+
+ALPHA_GRID = [1.0, 0.3, 0.1, 0.03]
+
+
+def sweep_sklearn(X: np.ndarray, y: np.ndarray, degrees) -> np.ndarray:
+    preds = []
+    for degree in degrees:
+        for alpha in ALPHA_GRID:
+            model = make_pipeline(
+                PolynomialFeatures(degree=degree, include_bias=False),
+                Ridge(alpha=alpha),
+            )
+            model.fit(X, y)
+            preds.append(model.predict(X))
+    return np.array(preds).reshape(len(degrees), len(ALPHA_GRID), -1)
+
+
+def sweep_batched(X: np.ndarray, y: np.ndarray, degrees) -> np.ndarray:
+    _, _, in_sample = fit_polynomial_ridge_grid(X, y, degrees, ALPHA_GRID)
+    return in_sample
+
+
+def timed(func, repeats: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeats):
+        func()
+    return (time.perf_counter() - start) / repeats
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--repeats", type=int, default=50)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    print(f"{'points':>6} {'sklearn ms':>11} {'batched ms':>11} {'speedup':>8} {'max |diff|':>11}")
+    for points in (8, 20, 35, 50):
+        years = np.arange(1990, 1990 + points, dtype=float)
+        X = ((years - years[0]) / max(years[-1] - years[0], 1.0)).reshape(-1, 1)
+        y = 100 + 20 * np.sin(X[:, 0] * 4) + rng.normal(scale=3, size=points)
+        degrees = list(range(2, min(5, max(2, points - 1), 6) + 1))
+
+        reference = sweep_sklearn(X, y, degrees)
+        batched = sweep_batched(X, y, degrees)
+        diff = float(np.max(np.abs(reference - batched)))
+
+        slow = timed(lambda: sweep_sklearn(X, y, degrees), args.repeats)
+        fast = timed(lambda: sweep_batched(X, y, degrees), args.repeats)
+        print(
+            f"{points:>6} {slow * 1e3:>11.3f} {fast * 1e3:>11.3f} "
+            f"{slow / fast:>7.1f}x {diff:>11.2e}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+"""
+Generate synthetic datasets in the data_clean schema for scale testing.
+
+Every file gets the columns indicator, entity, [category,] <year>... with
+indicators x entities rows (entities are split between the categories).
+Series follow a per-row level and trend with multiplicative AR(1) noise;
+values are blanked at random (--missing) and some series start late
+(--late-start), the way the real tables have gaps.  By default one file is
+written for every name in DATASETS_CONFIG, so the API can serve the
+directory directly (DATA_DIR=<output>), together with the .bin companions
+that the backend memory-maps.
+
+Usage:
+    python scripts/generate_synthetic_data.py --output /tmp/data_synth \\
+        [--entities 10000] [--indicators 5] [--years 50] [--missing 0.1] \\
+        [--files C1-1990-2023.csv ...] [--no-binary] [--workers N]
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+sys.path.append(str(PROJECT_ROOT))
+
+from src.binary_dataset import write_binary  # noqa: E402
+from src.config import DATASETS_CONFIG  # noqa: E402
+
+TRENDS = ("linear", "exponential", "mixed")
+
+
+def generate_values(
+    rng: np.random.Generator,
+    rows: int,
+    years: int,
+    trend: str,
+    noise: float,
+    missing: float,
+    late_start: float,
+) -> np.ndarray:
+    t = np.arange(years, dtype=float)
+    level = rng.lognormal(mean=4.0, sigma=1.5, size=(rows, 1))
+    slope = rng.normal(0.0, 0.02, size=(rows, 1))
+    if trend == "linear":
+        shape = 1.0 + slope * t
+    elif trend == "exponential":
+        shape = np.exp(slope * t)
+    else:
+        use_exp = rng.random((rows, 1)) < 0.5
+        shape = np.where(use_exp, np.exp(slope * t), 1.0 + slope * t)
+    shape = np.maximum(shape, 0.05)
+
+    # AR(1) noise so neighbouring years are correlated like real series.
+    shocks = rng.normal(0.0, noise, size=(rows, years))
+    ar = np.empty_like(shocks)
+    ar[:, 0] = shocks[:, 0]
+    for col in range(1, years):
+        ar[:, col] = 0.6 * ar[:, col - 1] + shocks[:, col]
+    values = level * shape * np.exp(ar)
+
+    values[rng.random((rows, years)) < missing] = np.nan
+    late = rng.random(rows) < late_start
+    starts = rng.integers(0, max(years // 2, 1), size=rows)
+    values[late[:, None] & (t[None, :] < starts[:, None])] = np.nan
+    return np.round(values, 3)
+
+
+def build_frame(
+    rng: np.random.Generator,
+    indicators: int,
+    entities: int,
+    years: List[int],
+    categories: List[str],
+    trend: str,
+    noise: float,
+    missing: float,
+    late_start: float,
+) -> pd.DataFrame:
+    indicator_names = [f"Показатель {idx + 1} (тыс. т)" for idx in range(indicators)]
+    entity_names = np.array([f"Объект {idx + 1:05d}" for idx in range(entities)], dtype=object)
+    # Entities are split round-robin between the categories.
+    entity_category = (
+        np.array(categories, dtype=object)[np.arange(entities) % len(categories)]
+        if categories
+        else None
+    )
+
+    rows = indicators * entities
+    data = {
+        "indicator": np.repeat(np.array(indicator_names, dtype=object), entities),
+        "entity": np.tile(entity_names, indicators),
+    }
+    if entity_category is not None:
+        data["category"] = np.tile(entity_category, indicators)
+    values = generate_values(rng, rows, len(years), trend, noise, missing, late_start)
+    frame = pd.DataFrame(data)
+    frame = pd.concat(
+        [frame, pd.DataFrame(values, columns=[str(year) for year in years])], axis=1
+    )
+    # normalize_datasets never writes rows without a single value.
+    frame = frame[~np.isnan(values).all(axis=1)]
+    if entity_category is not None:
+        frame = frame.sort_values(["category", "indicator"], kind="stable")
+    return frame.reset_index(drop=True)
+
+
+def write_dataset(job: Tuple) -> Tuple[str, int, float]:
+    """Builds and writes one file; runs in a worker process."""
+    path, seed, *frame_args, binary = job
+    start = time.perf_counter()
+    frame = build_frame(np.random.default_rng(seed), *frame_args)
+    frame.to_csv(path, index=False)
+    if binary:
+        write_binary(path)
+    return os.path.basename(path), len(frame), time.perf_counter() - start
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--output", required=True, help="Directory for the CSV/.bin files")
+    parser.add_argument("--files", nargs="+", help="File names (default: all of DATASETS_CONFIG)")
+    parser.add_argument("--indicators", type=int, default=5)
+    parser.add_argument("--entities", type=int, default=10000)
+    parser.add_argument("--years", type=int, default=50)
+    parser.add_argument("--start-year", type=int, default=1975)
+    parser.add_argument(
+        "--categories",
+        default="Реки,Подземные воды",
+        help="Comma-separated categories; empty string for files without the column",
+    )
+    parser.add_argument("--trend", choices=TRENDS, default="mixed")
+    parser.add_argument("--noise", type=float, default=0.08, help="Std of the log noise")
+    parser.add_argument("--missing", type=float, default=0.1, help="Share of blank cells")
+    parser.add_argument(
+        "--late-start", type=float, default=0.2, help="Share of series starting late"
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--no-binary", action="store_true", help="Skip the .bin companions")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args(argv)
+
+    output = Path(args.output)
+    output.mkdir(parents=True, exist_ok=True)
+    files = args.files or list(DATASETS_CONFIG)
+    categories = [name.strip() for name in args.categories.split(",") if name.strip()]
+    years = list(range(args.start_year, args.start_year + args.years))
+
+    jobs = [
+        (
+            str(output / filename),
+            [args.seed, index],
+            args.indicators,
+            args.entities,
+            years,
+            categories,
+            args.trend,
+            args.noise,
+            args.missing,
+            args.late_start,
+            not args.no_binary,
+        )
+        for index, filename in enumerate(files)
+    ]
+    # Files are independent; CSV formatting dominates, so use processes.
+    with ProcessPoolExecutor(max_workers=max(1, min(args.workers, len(jobs)))) as pool:
+        for filename, rows, seconds in pool.map(write_dataset, jobs):
+            print(f"  + {filename}: {rows} rows x {len(years)} years in {seconds:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,354 @@
+#!/usr/bin/env python3
+"""
+Load test for the backend API.
+
+Starts the app with uvicorn on localhost (or targets --url), discovers the
+datasets through /api/datasets and /api/dataset/{filename}, then runs
+--concurrency client threads for --duration seconds.  Every client picks a
+weighted scenario at random:
+
+    dataset       GET  /api/dataset/{filename}
+    entity_sweep  GET  /api/entity-data/{filename}/{year} for every year of
+                  the range, as the map slider does
+    forecast      POST /api/forecast for a random series
+
+Throughput and p50/p95/p99 latency are reported per route template and,
+with --output, written to a JSON file; --compare prints the change against
+an earlier run.
+Only the standard library is used on the client side.
+
+Usage:
+    python scripts/load_test.py [--duration 30] [--concurrency 8]
+        [--mix dataset=3,entity_sweep=5,forecast=1] [--data-dir DIR]
+        [--url http://localhost:8000] [--output results.json]
+        [--compare before.json]
+"""
+
+from __future__ import annotations
+
+import argparse
+import http.client
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import threading
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import quote, urlencode, urlsplit
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+DEFAULT_MIX = "dataset=3,entity_sweep=5,forecast=1"
+PERCENTILES = (50, 95, 99)
+
+# (route template, status, seconds)
+Sample = Tuple[str, int, float]
+
+
+class Client:
+    """Keep-alive HTTP connection owned by one thread."""
+
+    def __init__(self, base_url: str, timeout: float = 60.0):
+        parts = urlsplit(base_url)
+        self.host = parts.hostname or "localhost"
+        self.port = parts.port or 80
+        self.timeout = timeout
+        self.conn: Optional[http.client.HTTPConnection] = None
+
+    def request(self, method: str, path: str, body: Optional[Dict] = None) -> Tuple[int, bytes]:
+        payload = json.dumps(body).encode("utf-8") if body is not None else None
+        headers = {"Content-Type": "application/json"} if payload else {}
+        for attempt in range(2):
+            if self.conn is None:
+                self.conn = http.client.HTTPConnection(self.host, self.port, timeout=self.timeout)
+            try:
+                self.conn.request(method, path, body=payload, headers=headers)
+                response = self.conn.getresponse()
+                return response.status, response.read()
+            except (http.client.HTTPException, ConnectionError):
+                # The server closed an idle keep-alive connection; reconnect once.
+                self.conn.close()
+                self.conn = None
+                if attempt:
+                    raise
+        raise RuntimeError("unreachable")
+
+    def get_json(self, path: str) -> Dict:
+        status, body = self.request("GET", path)
+        if status != 200:
+            raise RuntimeError(f"GET {path} -> {status}: {body[:200]!r}")
+        return json.loads(body)
+
+
+def start_server(port: int, data_dir: Optional[str], log_path: str) -> subprocess.Popen:
+    env = dict(os.environ)
+    if data_dir:
+        env["DATA_DIR"] = str(Path(data_dir).resolve())
+    # The API logs every forecast at INFO level; keep it out of the report.
+    log = open(log_path, "ab")
+    return subprocess.Popen(
+        [
+            sys.executable, "-m", "uvicorn", "main:app",
+            "--host", "127.0.0.1", "--port", str(port), "--log-level", "warning",
+        ],
+        cwd=PROJECT_ROOT / "backend",
+        env=env,
+        stdout=log,
+        stderr=subprocess.STDOUT,
+    )
+
+
+def wait_ready(
+    base_url: str, server: Optional[subprocess.Popen] = None, timeout: float = 60.0
+) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if server is not None and server.poll() is not None:
+            raise RuntimeError(f"API process exited with code {server.returncode}")
+        try:
+            Client(base_url, timeout=2).get_json("/")
+            return
+        except (OSError, RuntimeError, http.client.HTTPException):
+            time.sleep(0.2)
+    raise RuntimeError(f"API at {base_url} did not start within {timeout:.0f} s")
+
+
+def discover(client: Client) -> List[Dict]:
+    """Dataset info for every file the API can open."""
+    datasets = []
+    for item in client.get_json("/api/datasets")["datasets"]:
+        status, body = client.request("GET", f"/api/dataset/{quote(item['filename'])}")
+        if status == 200:
+            datasets.append(json.loads(body))
+        else:
+            print(f"  ! skipping {item['filename']}: HTTP {status}")
+    if not datasets:
+        raise RuntimeError("No datasets available")
+    return datasets
+
+
+def pick_series(rng: random.Random, info: Dict) -> Dict:
+    category = rng.choice(info["categories"]) if info.get("categories") else None
+    entities = (info.get("category_entities") or {}).get(category) or info.get("entities") or []
+    return {
+        "indicator": rng.choice(info["indicators"]) if info.get("indicators") else None,
+        "category": category,
+        "entity": rng.choice(entities) if entities else None,
+    }
+
+
+def scenario_dataset(client: Client, rng: random.Random, info: Dict) -> List[Sample]:
+    start = time.perf_counter()
+    status, _ = client.request("GET", f"/api/dataset/{quote(info['filename'])}")
+    return [("/api/dataset/{filename}", status, time.perf_counter() - start)]
+
+
+def scenario_entity_sweep(client: Client, rng: random.Random, info: Dict) -> List[Sample]:
+    series = pick_series(rng, info)
+    query = urlencode({k: v for k, v in series.items() if k != "entity" and v})
+    first, last = info["year_range"]
+    samples = []
+    for year in range(first, last + 1):
+        path = f"/api/entity-data/{quote(info['filename'])}/{year}"
+        start = time.perf_counter()
+        status, _ = client.request("GET", f"{path}?{query}" if query else path)
+        samples.append(("/api/entity-data/{filename}/{year}", status, time.perf_counter() - start))
+    return samples
+
+
+def scenario_forecast(client: Client, rng: random.Random, info: Dict) -> List[Sample]:
+    body = {"filename": info["filename"], "periods": rng.choice((5, 10)), **pick_series(rng, info)}
+    start = time.perf_counter()
+    status, _ = client.request("POST", "/api/forecast", body)
+    return [("/api/forecast", status, time.perf_counter() - start)]
+
+
+SCENARIOS = {
+    "dataset": scenario_dataset,
+    "entity_sweep": scenario_entity_sweep,
+    "forecast": scenario_forecast,
+}
+
+
+def parse_mix(text: str) -> Dict[str, float]:
+    mix = {}
+    for part in text.split(","):
+        name, _, weight = part.partition("=")
+        name = name.strip()
+        if name not in SCENARIOS:
+            raise argparse.ArgumentTypeError(f"unknown scenario {name!r}")
+        mix[name] = float(weight or 1)
+    return mix
+
+
+def run_load(
+    base_url: str, datasets: List[Dict], mix: Dict[str, float],
+    concurrency: int, duration: float, seed: int,
+) -> Tuple[List[Sample], float]:
+    names = list(mix)
+    weights = [mix[name] for name in names]
+    results: List[List[Sample]] = [[] for _ in range(concurrency)]
+    errors: List[str] = []
+    deadline = time.perf_counter() + duration
+
+    def worker(index: int) -> None:
+        rng = random.Random(seed * 1000 + index)
+        client = Client(base_url)
+        while time.perf_counter() < deadline:
+            scenario = SCENARIOS[rng.choices(names, weights)[0]]
+            try:
+                results[index].extend(scenario(client, rng, rng.choice(datasets)))
+            except Exception as e:  # keep the other clients running
+                errors.append(str(e))
+                client = Client(base_url)
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(concurrency)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+    if errors:
+        print(f"  ! {len(errors)} client errors, first: {errors[0]}")
+    return [sample for samples in results for sample in samples], elapsed
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    # Nearest-rank definition.
+    if not sorted_values:
+        return float("nan")
+    rank = max(1, -(-len(sorted_values) * pct // 100))
+    return sorted_values[int(rank) - 1]
+
+
+def summarize(samples: List[Sample], elapsed: float) -> Dict[str, Dict]:
+    by_route: Dict[str, List[Tuple[int, float]]] = {}
+    for route, status, seconds in samples:
+        by_route.setdefault(route, []).append((status, seconds))
+    by_route["total"] = [(status, seconds) for _, status, seconds in samples]
+
+    summary = {}
+    for route, items in by_route.items():
+        latencies = sorted(seconds for _, seconds in items)
+        statuses: Dict[str, int] = {}
+        for status, _ in items:
+            statuses[str(status)] = statuses.get(str(status), 0) + 1
+        summary[route] = {
+            "requests": len(items),
+            "throughput_rps": round(len(items) / elapsed, 2),
+            "errors": sum(count for code, count in statuses.items() if not code.startswith("2")),
+            "statuses": statuses,
+            "mean_ms": round(1000 * sum(latencies) / len(latencies), 3),
+            **{
+                f"p{pct}_ms": round(1000 * percentile(latencies, pct), 3)
+                for pct in PERCENTILES
+            },
+        }
+    return summary
+
+
+def print_summary(summary: Dict[str, Dict]) -> None:
+    header = f"{'route':<38} {'reqs':>7} {'rps':>8} {'err':>5} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}"
+    print(header)
+    print("-" * len(header))
+    for route, row in summary.items():
+        print(
+            f"{route:<38} {row['requests']:>7} {row['throughput_rps']:>8.1f} {row['errors']:>5} "
+            f"{row['p50_ms']:>9.2f} {row['p95_ms']:>9.2f} {row['p99_ms']:>9.2f}"
+        )
+
+
+def print_comparison(summary: Dict[str, Dict], baseline_path: str) -> None:
+    with open(baseline_path, encoding="utf-8") as fh:
+        baseline = json.load(fh)["routes"]
+    print(f"\nChange against {baseline_path} (negative latency change is better):")
+    print(f"{'route':<38} {'rps':>9} {'p50':>9} {'p95':>9} {'p99':>9}")
+    for route, row in summary.items():
+        before = baseline.get(route)
+        if not before:
+            continue
+
+        def change(key: str) -> str:
+            if not before[key]:
+                return "n/a"
+            return f"{100 * (row[key] - before[key]) / before[key]:+.1f}%"
+
+        print(
+            f"{route:<38} {change('throughput_rps'):>9} {change('p50_ms'):>9} "
+            f"{change('p95_ms'):>9} {change('p99_ms'):>9}"
+        )
+
+
+def git_revision() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=PROJECT_ROOT, capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", help="Use a running API instead of starting one")
+    parser.add_argument("--port", type=int, default=8765, help="Port for the started API")
+    parser.add_argument("--data-dir", help="data_clean-style directory for the started API")
+    parser.add_argument("--server-log", default=os.devnull, help="Output file of the started API")
+    parser.add_argument("--duration", type=float, default=30.0)
+    parser.add_argument("--warmup", type=float, default=3.0, help="Seconds of untimed load first")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--mix", type=parse_mix, default=parse_mix(DEFAULT_MIX))
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="Write the results JSON here (e.g. /tmp/before.json)")
+    parser.add_argument("--compare", help="Earlier results JSON to compare against")
+    args = parser.parse_args()
+
+    server = None
+    base_url = args.url or f"http://127.0.0.1:{args.port}"
+    if args.url is None:
+        server = start_server(args.port, args.data_dir, args.server_log)
+    try:
+        wait_ready(base_url, server)
+        datasets = discover(Client(base_url))
+        print(f"{len(datasets)} datasets, mix {args.mix}, {args.concurrency} clients, {args.duration:.0f} s")
+        if args.warmup > 0:
+            run_load(base_url, datasets, args.mix, args.concurrency, args.warmup, args.seed + 1)
+        samples, elapsed = run_load(
+            base_url, datasets, args.mix, args.concurrency, args.duration, args.seed
+        )
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait(timeout=30)
+
+    summary = summarize(samples, elapsed)
+    print_summary(summary)
+    result = {
+        "started_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "revision": git_revision(),
+        "python": platform.python_version(),
+        "cpu_count": os.cpu_count(),
+        "base_url": base_url,
+        "data_dir": args.data_dir or "data_clean",
+        "duration_s": round(elapsed, 3),
+        "concurrency": args.concurrency,
+        "mix": args.mix,
+        "seed": args.seed,
+        "routes": summary,
+    }
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as fh:
+            json.dump(result, fh, ensure_ascii=False, indent=2)
+        print(f"\nResults written to {args.output}")
+    if args.compare:
+        print_comparison(summary, args.compare)
+
+
+if __name__ == "__main__":
+    main()
@@ -9,23 +9,58 @@ exports a tabular representation with the following guarantees:
     - Year columns are numeric (1990-2035) and sorted ascending.
     - Missing numeric values are left blank.
 
+Next to every CSV a memory-mapped binary companion (<name>.bin, see
+src/binary_dataset.py) is written so the backend can open datasets without
+parsing.  --binary-only regenerates just those files from existing CSVs.
+
+data_clean/manifest.json records the SHA-256 of every source workbook and
+the parser version used; unchanged datasets are skipped and the rest are
+parsed in parallel worker processes.
+
 Usage:
-    python scripts/normalize_datasets.py
+    python scripts/normalize_datasets.py [--force] [--workers N] [--binary-only]
 """
 
 from __future__ import annotations
 
+import argparse
+import hashlib
+import json
 import math
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from dataclasses import dataclass
 from pathlib import Path
-from statistics import fmean
-from typing import Callable, Dict, Iterable, List, Sequence, Tuple
+from typing import Callable, Dict, Iterable, Iterator, List, Sequence, Tuple
 
+import numpy as np
+import openpyxl
 import pandas as pd
+from openpyxl.cell.cell import TYPE_ERROR, TYPE_NUMERIC
 
 PROJECT_ROOT = Path(__file__).resolve().parents[1]
+sys.path.append(str(PROJECT_ROOT))
+
+from src.binary_dataset import open_binary, write_binary  # noqa: E402
+
 RAW_DIR = PROJECT_ROOT / "data_xlsx"
 OUT_DIR = PROJECT_ROOT / "data_clean"
+MANIFEST_PATH = OUT_DIR / "manifest.json"
+
+# Bump whenever parser output changes so that every dataset is rebuilt.
+PARSER_VERSION = 1
+
+SKIP_INDICATOR_TOKENS = (
+    "таблица",
+    "временные ряды",
+    "единица",
+    "справочно",
+    "примечание",
+    "по данным",
+    "название реки",
+)
 
 
 # --------------------------------------------------------------------------------------
@@ -82,16 +117,25 @@ def clean_numeric(value) -> float | None:
 def find_year_columns(df: pd.DataFrame) -> Tuple[int, List[Tuple[int, int]]]:
     """
     Returns (header_row_index, [(column_index, year), ...])
+
+    Rows are scanned in blocks of doubling size, so a header near the top
+    of a large sheet only costs a few small blocks.
     """
-    for idx in range(len(df)):
-        row = df.iloc[idx]
-        years: List[Tuple[int, int]] = []
-        for col_idx, value in enumerate(row):
-            year = try_parse_year(value)
-            if year is not None:
-                years.append((col_idx, year))
-        if len(years) >= 3:
-            return idx, years
+    start, block = 0, 32
+    while start < len(df):
+        part = df.iloc[start:start + block]
+        years = np.column_stack(
+            [year_array(text) for text in text_columns(part)]
+            or [np.zeros(len(part), dtype=np.int64)]
+        )
+        hits = np.flatnonzero((years > 0).sum(axis=1) >= 3)
+        if len(hits):
+            row = years[hits[0]]
+            return start + int(hits[0]), [
+                (int(col_idx), int(row[col_idx])) for col_idx in np.flatnonzero(row)
+            ]
+        start += block
+        block *= 2
     raise ValueError("Could not detect header row with year columns")
 
 
@@ -106,16 +150,7 @@ def ensure_column_order(df: pd.DataFrame) -> pd.DataFrame:
 
 def filter_indicator(text: str) -> bool:
     lowered = text.lower()
-    skip_tokens = [
-        "таблица",
-        "временные ряды",
-        "единица",
-        "справочно",
-        "примечание",
-        "по данным",
-        "название реки",
-    ]
-    return not any(token in lowered for token in skip_tokens)
+    return not any(token in lowered for token in SKIP_INDICATOR_TOKENS)
 
 
 def is_numeric_code(text: str) -> bool:
@@ -126,55 +161,242 @@ def is_numeric_code(text: str) -> bool:
 
 
 # --------------------------------------------------------------------------------------
-# Dataset-specific parsers
+# Vectorized helpers
+#
+# Column-at-a-time versions of the utilities above built on NumPy string
+# arrays.  Each returns exactly what applying its scalar counterpart cell by
+# cell would; columns are processed one by one so that the fixed-width string
+# arrays stay as narrow as the longest cell of that column.
 # --------------------------------------------------------------------------------------
 
-def parse_simple(
-    df: pd.DataFrame, *, default_entity: str = "Беларусь"
-) -> pd.DataFrame:
-    header_idx, year_cols = find_year_columns(df)
-    rows: List[Dict[str, float]] = []
-
-    for idx in range(header_idx + 1, len(df)):
-        row = df.iloc[idx]
-        indicator = normalize_text(row.iloc[1] if len(row) > 1 else "")
-        if not indicator:
-            indicator = normalize_text(row.iloc[0])
-        if not indicator or not filter_indicator(indicator):
+NUMERIC_NOISE = ("\u202f", " ", "%", '"', "'", "<", ">")
+MISSING_TOKENS = ("", "…", "...", "-", "nan", "None")
+PARSE_CHUNK = 4096
+
+
+def cell_types(cells: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Masks of the float and of the None cells of an object array."""
+    # Factorizing the cell types keeps the per-cell work in C.
+    codes, kinds = pd.factorize(
+        np.fromiter(map(type, cells), dtype=object, count=len(cells))
+    )
+    floats = np.array([issubclass(kind, float) for kind in kinds], dtype=bool)
+    nones = np.array([kind is type(None) for kind in kinds], dtype=bool)
+    return floats[codes], nones[codes]
+
+
+def _is_blank(value) -> bool:
+    return value is None or (isinstance(value, float) and math.isnan(value))
+
+
+def _replace(text: np.ndarray, old: str, new: str) -> np.ndarray:
+    # np.char.replace fails on empty arrays with some NumPy releases.
+    return np.char.replace(text, old, new) if len(text) else text
+
+
+def normalize_text_array(cells: np.ndarray) -> np.ndarray:
+    text = np.char.strip(cells.astype(str))
+    blank = pd.isna(cells)
+    if blank.any():
+        # pd.isna also flags NaT/NA, which normalize_text prints as text.
+        for pos in np.flatnonzero(blank):
+            if _is_blank(cells[pos]):
+                text[pos] = ""
+    return text
+
+
+def text_column(df: pd.DataFrame, pos: int) -> np.ndarray:
+    if pos >= df.shape[1]:
+        return np.full(len(df), "", dtype=str)
+    column = df.iloc[:, pos]
+    kinds = {dtype.kind for dtype in df.dtypes}
+    if column.dtype.kind in "iu" and "f" in kinds and kinds <= set("iuf"):
+        # df.iloc[idx] upcasts such rows to float, so 5 reads as "5.0".
+        column = column.astype(np.float64)
+    return normalize_text_array(column.to_numpy(dtype=object))
+
+
+def text_columns(df: pd.DataFrame) -> List[np.ndarray]:
+    return [text_column(df, pos) for pos in range(df.shape[1])]
+
+
+def word_column(df: pd.DataFrame, pos: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Returns (filled, text) like text_column, except that number cells are
+    only reported as filled and get empty text: formatting floats is the
+    slowest part of normalizing a sheet and no keyword check can match them.
+    """
+    column = df.iloc[:, pos]
+    if column.dtype.kind in "iuf":
+        return column.notna().to_numpy(), np.full(len(column), "", dtype=str)
+
+    cells = column.to_numpy(dtype=object)
+    numbers, _ = cell_types(cells)
+    words = normalize_text_array(cells[~numbers])
+    text = np.zeros(len(cells), dtype=words.dtype)
+    text[~numbers] = words
+    filled = text != ""
+    filled[numbers] = ~np.isnan(cells[numbers].astype(np.float64))
+    return filled, text
+
+
+def contains_lower(text: np.ndarray, tokens: Sequence[str]) -> np.ndarray:
+    # str.lower rather than np.char.lower: they differ for a few code points.
+    found = np.zeros(len(text), dtype=bool)
+    filled = np.flatnonzero(text != "")
+    if not len(filled):
+        return found
+    lowered = np.array([value.lower() for value in text[filled].tolist()], dtype=str)
+    for token in tokens:
+        found[filled] |= np.char.find(lowered, token) >= 0
+    return found
+
+
+def is_numeric_code_array(text: np.ndarray) -> np.ndarray:
+    cleaned = _replace(_replace(text, ".", ""), ",", "")
+    return (text != "") & np.char.isdigit(cleaned)
+
+
+def year_array(text: np.ndarray) -> np.ndarray:
+    """try_parse_year over normalized text; 0 marks "not a year"."""
+    years = np.zeros(len(text), dtype=np.int64)
+    digits = _replace(text, ".0", "")
+    candidate = np.char.isdigit(digits)
+    if candidate.any():
+        parsed = digits[candidate].astype(np.float64)
+        valid = (parsed >= 1900) & (parsed <= 2035)
+        years[np.flatnonzero(candidate)[valid]] = parsed[valid]
+    return years
+
+
+def _parse_floats(text: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    # NumPy parses strings exactly like float(); a chunk holding a string
+    # float() rejects is retried cell by cell.
+    values = np.full(len(text), np.nan)
+    present = np.ones(len(text), dtype=bool)
+    for start in range(0, len(text), PARSE_CHUNK):
+        chunk = text[start:start + PARSE_CHUNK]
+        try:
+            values[start:start + len(chunk)] = chunk.astype(np.float64)
             continue
+        except (ValueError, OverflowError):
+            pass
+        for offset, candidate in enumerate(chunk.tolist()):
+            try:
+                values[start + offset] = float(candidate)
+            except ValueError:
+                present[start + offset] = False
+    return values, present
 
-        values: Dict[str, float] = {}
-        for col_idx, year in year_cols:
-            if col_idx >= len(row):
-                continue
-            value = clean_numeric(row.iloc[col_idx])
-            if value is not None:
-                values[str(year)] = value
 
-        if not values:
+def clean_numeric_array(cells: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    clean_numeric over an array; returns (values, present) where present is
+    False wherever clean_numeric would return None.
+    """
+    if cells.dtype.kind in "iuf":
+        values = cells.astype(np.float64)
+        return values, ~np.isnan(values)
+
+    floats, nones = cell_types(cells)
+    values = np.full(len(cells), np.nan)
+    values[floats] = cells[floats].astype(np.float64)
+    present = floats & ~np.isnan(values)
+
+    strings = np.flatnonzero(~floats & ~nones)
+    if len(strings):
+        text = cells[strings].astype(str)
+        for token in NUMERIC_NOISE:
+            text = _replace(text, token, "")
+        filled = ~np.isin(text, MISSING_TOKENS)
+        text = _replace(text[filled], ",", ".")
+        parsed, ok = _parse_floats(text)
+        targets = strings[filled]
+        values[targets] = parsed
+        present[targets] = ok
+    return values, present
+
+
+def collect_year_values(
+    df: pd.DataFrame,
+    year_cols: List[Tuple[int, int]],
+    rows: np.ndarray,
+    base: Dict[str, Sequence],
+) -> pd.DataFrame:
+    """
+    Builds the output frame for the selected ``rows`` of ``df``: ``base``
+    holds the text columns (already restricted to ``rows``), year values are
+    cleaned in bulk.  Rows without any value are dropped; when a year appears
+    in several columns the last present value wins.
+    """
+    by_year: Dict[int, Tuple[np.ndarray, np.ndarray]] = {}
+    for col_idx, year in year_cols:
+        if col_idx >= df.shape[1]:
             continue
+        values, present = clean_numeric_array(df.iloc[:, col_idx].to_numpy()[rows])
+        if year in by_year:
+            old_values, old_present = by_year[year]
+            values = np.where(present, values, old_values)
+            present = present | old_present
+        by_year[year] = (values, present)
+
+    keep = np.zeros(len(rows), dtype=bool)
+    for _, present in by_year.values():
+        keep |= present
+
+    columns: Dict[str, np.ndarray] = {
+        name: np.array(list(column), dtype=object)[keep]
+        for name, column in base.items()
+    }
+    for year in sorted(by_year):
+        values, present = by_year[year]
+        if present[keep].any():
+            columns[str(year)] = np.where(present, values, np.nan)[keep]
+    return pd.DataFrame(columns)
 
-        data_row = {"indicator": indicator, "entity": default_entity}
-        data_row.update(values)
-        rows.append(data_row)
 
-    if not rows:
+# --------------------------------------------------------------------------------------
+# Dataset-specific parsers
+# --------------------------------------------------------------------------------------
+
+def parse_simple(
+    df: pd.DataFrame, *, default_entity: str = "Беларусь"
+) -> pd.DataFrame:
+    header_idx, year_cols = find_year_columns(df)
+    body = df.iloc[header_idx + 1:]
+
+    indicator = text_column(body, 1)
+    indicator = np.where(indicator != "", indicator, text_column(body, 0))
+    selected = (indicator != "") & ~contains_lower(indicator, SKIP_INDICATOR_TOKENS)
+    rows = np.flatnonzero(selected)
+
+    parsed = collect_year_values(
+        body,
+        year_cols,
+        rows,
+        {"indicator": indicator[rows].tolist(), "entity": [default_entity] * len(rows)},
+    )
+    if parsed.empty:
         raise ValueError("No data rows parsed for simple dataset")
 
-    return ensure_column_order(pd.DataFrame(rows))
+    return ensure_column_order(parsed)
 
 
 def parse_c9(df: pd.DataFrame) -> pd.DataFrame:
     header_idx, year_cols = find_year_columns(df)
-    rows: List[Dict[str, float]] = []
+    body = df.iloc[header_idx + 1:]
+    firsts = text_column(body, 0)
+    seconds = text_column(body, 1)
+    numeric = is_numeric_code_array(firsts)
+
+    rows: List[int] = []
+    indicators: List[str] = []
     current_group = ""
     current_subgroup = ""
 
-    for idx in range(header_idx + 1, len(df)):
-        row = df.iloc[idx]
-        first = normalize_text(row.iloc[0] if len(row) > 0 else "")
-        second = normalize_text(row.iloc[1] if len(row) > 1 else "")
-
+    # Group headers change the context of the rows below them, so this walk
+    # stays sequential; it only touches the two text columns.
+    for pos, (first, second) in enumerate(zip(firsts.tolist(), seconds.tolist())):
         if not first and second:
             if "подземные" in second.lower() or "коммунальные" in second.lower():
                 current_group = second
@@ -184,7 +406,7 @@ def parse_c9(df: pd.DataFrame) -> pd.DataFrame:
                 current_subgroup = second
                 continue
 
-        if not is_numeric_code(first):
+        if not numeric[pos]:
             continue
 
         full_indicator = " - ".join(
@@ -192,70 +414,52 @@ def parse_c9(df: pd.DataFrame) -> pd.DataFrame:
         )
         if not full_indicator:
             continue
-
-        values: Dict[str, float] = {}
-        for col_idx, year in year_cols:
-            if col_idx >= len(row):
-                continue
-            value = clean_numeric(row.iloc[col_idx])
-            if value is not None:
-                values[str(year)] = value
-
-        if not values:
-            continue
-
-        record = {"indicator": full_indicator, "entity": "Беларусь"}
-        record.update(values)
-        rows.append(record)
-
-    if not rows:
+        rows.append(pos)
+        indicators.append(full_indicator)
+
+    parsed = collect_year_values(
+        body,
+        year_cols,
+        np.asarray(rows, dtype=np.intp),
+        {"indicator": indicators, "entity": ["Беларусь"] * len(rows)},
+    )
+    if parsed.empty:
         raise ValueError("Failed to parse C9 dataset")
 
-    return ensure_column_order(pd.DataFrame(rows))
+    return ensure_column_order(parsed)
 
 
 def parse_c10(df: pd.DataFrame) -> pd.DataFrame:
     header_idx, year_cols = find_year_columns(df)
-    rows: List[Dict[str, float]] = []
     current_river = "Неизвестная река"
 
     # Попробуем найти название реки в любом месте таблицы
-    for idx in range(len(df)):
-        text_values = [normalize_text(val) for val in df.iloc[idx].tolist()]
-        if any("название реки" in text.lower() for text in text_values if text):
-            for text in text_values:
-                if text and "название реки" not in text.lower():
-                    current_river = text
-                    break
-            break
-
-    for idx in range(header_idx + 1, len(df)):
-        row = df.iloc[idx]
-
-        first = normalize_text(row.iloc[0] if len(row) > 0 else "")
-        indicator = normalize_text(row.iloc[1] if len(row) > 1 else "")
-        if not is_numeric_code(first) or not indicator:
-            continue
-
-        values: Dict[str, float] = {}
-        for col_idx, year in year_cols:
-            if col_idx >= len(row):
-                continue
-            value = clean_numeric(row.iloc[col_idx])
-            if value is not None:
-                values[str(year)] = value
-
-        if not values:
-            continue
+    text = [word_column(df, pos)[1] for pos in range(df.shape[1])]
+    marked = np.zeros(len(df), dtype=bool)
+    for column in text:
+        marked |= contains_lower(column, ["название реки"])
+    if marked.any():
+        row = int(np.flatnonzero(marked)[0])
+        for value in (normalize_text(df.iat[row, pos]) for pos in range(df.shape[1])):
+            if value and "название реки" not in value.lower():
+                current_river = value
+                break
 
-        record = {"indicator": indicator, "entity": current_river}
-        record.update(values)
-        rows.append(record)
+    body = df.iloc[header_idx + 1:]
+    indicator = text_column(body, 1)
+    selected = is_numeric_code_array(text_column(body, 0)) & (indicator != "")
+    rows = np.flatnonzero(selected)
 
-    if not rows:
+    parsed = collect_year_values(
+        body,
+        year_cols,
+        rows,
+        {"indicator": indicator[rows].tolist(), "entity": [current_river] * len(rows)},
+    )
+    if parsed.empty:
         raise ValueError("Failed to parse C10 dataset")
 
-    return ensure_column_order(pd.DataFrame(rows))
+    return ensure_column_order(parsed)
 
 
 def _categorize_c11_sheet(sheet_name: str) -> str | None:
@@ -271,128 +475,184 @@ def _categorize_c11_sheet(sheet_name: str) -> str | None:
 
 def _parse_c11_surface_sheet(df: pd.DataFrame, category: str) -> pd.DataFrame:
     _, year_cols = find_year_columns(df)
-    rows: List[Dict[str, float]] = []
-    current_indicator = ""
-
-    for idx in range(len(df)):
-        row = df.iloc[idx]
-        texts = [normalize_text(val) for val in row.tolist() if normalize_text(val)]
-        if not texts:
-            continue
-
-        if any("единица" in txt.lower() for txt in texts):
-            continue
+    counts = np.zeros(len(df), dtype=np.int64)
+    unit_row = np.zeros(len(df), dtype=bool)
+    only = np.full(len(df), "", dtype=object)
+    for pos in range(df.shape[1]):
+        filled, column = word_column(df, pos)
+        counts += filled
+        unit_row |= contains_lower(column, ["единица"])
+        only[filled] = column[filled]
+
+    # A row whose only text contains "(" names the indicator of the rows below.
+    title = np.full(len(df), None, dtype=object)
+    single = np.flatnonzero((counts == 1) & ~unit_row)
+    is_title = np.array(["(" in value for value in only[single]], dtype=bool)
+    title[single[is_title]] = only[single[is_title]]
+    current_indicator = pd.Series(title, dtype=object).ffill().fillna("").to_numpy()
+    is_title_row = pd.notna(title)
+
+    entity = text_column(df, 1)
+    selected = (
+        (counts > 0)
+        & ~unit_row
+        & ~is_title_row
+        & is_numeric_code_array(text_column(df, 0))
+        & (entity != "")
+    )
+    rows = np.flatnonzero(selected)
+    indicator = [str(value) or "Показатель" for value in current_indicator[rows]]
+
+    return collect_year_values(
+        df,
+        year_cols,
+        rows,
+        {
+            "indicator": indicator,
+            "entity": entity[rows].tolist(),
+            "category": [category] * len(rows),
+        },
+    )
 
-        if len(texts) == 1 and "(" in texts[0]:
-            current_indicator = texts[0]
-            continue
 
-        first = normalize_text(row.iloc[0] if len(row) > 0 else "")
-        if not is_numeric_code(first):
-            continue
+# Strings pd.read_excel reads as NaN by default; the streaming reader below
+# treats them the same way so that both readers see identical cell values.
+EXCEL_NA_STRINGS = frozenset(
+    {
+        "", "#N/A", "#N/A N/A", "#NA", "-1.#IND", "-1.#QNAN", "-NaN", "-nan",
+        "1.#IND", "1.#QNAN", "<NA>", "N/A", "NA", "NULL", "NaN", "None",
+        "n/a", "nan", "null",
+    }
+)
 
-        entity_name = normalize_text(row.iloc[1] if len(row) > 1 else "")
-        if not entity_name:
-            continue
 
-        values: Dict[str, float] = {}
-        for col_idx, year in year_cols:
-            if col_idx >= len(row):
-                continue
-            value = clean_numeric(row.iloc[col_idx])
-            if value is not None:
-                values[str(year)] = value
+def _excel_value(cell):
+    """Cell value as pd.read_excel (openpyxl engine) would report it."""
+    value = cell.value
+    if value is None or cell.data_type == TYPE_ERROR:
+        return None
+    if cell.data_type == TYPE_NUMERIC:
+        integral = int(value)
+        return integral if integral == value else float(value)
+    if isinstance(value, str) and value in EXCEL_NA_STRINGS:
+        return None
+    return value
 
-        if not values:
-            continue
 
-        record = {
-            "indicator": current_indicator or "Показатель",
-            "entity": entity_name,
-            "category": category,
-        }
-        record.update(values)
-        rows.append(record)
+def iter_sheet_rows(sheet) -> Iterator[Tuple]:
+    """Streams the rows of a read-only worksheet as tuples of cell values."""
+    sheet.reset_dimensions()
+    for row in sheet.rows:
+        yield tuple(_excel_value(cell) for cell in row)
 
-    return pd.DataFrame(rows)
 
+class RunningMean:
+    """
+    Streaming equivalent of statistics.fmean: the sum is kept exactly as
+    non-overlapping partials (the algorithm behind math.fsum), so the mean
+    is bit-identical to fmean over the full list without storing it.
+    """
 
-def _parse_c11_groundwater_sheet(df: pd.DataFrame, year: int) -> List[Tuple[str, float]]:
+    __slots__ = ("partials", "special", "count")
+
+    def __init__(self):
+        self.partials: List[float] = []
+        self.special: Dict[str, float] = {}
+        self.count = 0
+
+    def add(self, value: float) -> None:
+        self.count += 1
+        if not math.isfinite(value):
+            # fsum only cares which of inf, -inf and nan occurred.
+            self.special[repr(value)] = value
+            return
+        partials: List[float] = []
+        for other in self.partials:
+            if abs(value) < abs(other):
+                value, other = other, value
+            high = value + other
+            low = other - (high - value)
+            if low:
+                partials.append(low)
+            value = high
+        partials.append(value)
+        self.partials = partials
+
+    def mean(self) -> float:
+        return math.fsum(self.partials + list(self.special.values())) / self.count
+
+
+def _parse_c11_groundwater_rows(rows: Iterable[Sequence]) -> Iterator[Tuple[str, float]]:
+    """Yields (basin, value) readings of one groundwater sheet, row by row."""
     value_col = None
-    start_idx = 0
-    for i in range(len(df)):
-        for j, val in enumerate(df.iloc[i]):
-            if isinstance(val, str) and "фактическое значение" in val.lower():
-                value_col = j
-                start_idx = i + 1
-                break
-        if value_col is not None:
-            break
-
-    if value_col is None:
-        return []
-
     current_basin = None
-    measurements: List[Tuple[str, float]] = []
-    for idx in range(start_idx, len(df)):
-        texts = [normalize_text(val) for val in df.iloc[idx].tolist() if normalize_text(val)]
-        if any("бассейн реки" in text.lower() for text in texts):
-            basin_text = next(
-                (text for text in texts if "бассейн реки" in text.lower()),
-                ""
+    for row in rows:
+        if value_col is None:
+            value_col = next(
+                (
+                    col_idx
+                    for col_idx, value in enumerate(row)
+                    if isinstance(value, str) and "фактическое значение" in value.lower()
+                ),
+                None,
             )
+            continue
+
+        texts = [text for text in map(normalize_text, row) if text]
+        basin_text = next((text for text in texts if "бассейн реки" in text.lower()), None)
+        if basin_text is not None:
             basin_name = basin_text.split("Бассейн реки")[-1].strip()
             basin_name = basin_name.replace(":", "").strip()
             current_basin = basin_name or current_basin
             continue
 
-        first = normalize_text(df.iloc[idx, 0] if len(df.columns) > 0 else "")
-        if not is_numeric_code(first):
+        if not is_numeric_code(normalize_text(row[0] if row else None)):
             continue
         if not current_basin:
             continue
 
-        value = clean_numeric(df.iloc[idx, value_col])
+        value = clean_numeric(row[value_col] if value_col < len(row) else None)
         if value is None:
             continue
 
-        measurements.append((current_basin, value))
+        yield current_basin, value
 
-    return measurements
+
+def _groundwater_sheet_year(sheet_name: str) -> int:
+    if "2005-2015" in sheet_name:
+        return 2015
+    digits = "".join(ch for ch in sheet_name if ch.isdigit())
+    return int(digits[-4:]) if digits[-4:] else 0
 
 
 def parse_c11_workbook(path: Path) -> pd.DataFrame:
-    xl = pd.ExcelFile(path)
+    """
+    Streams the workbook sheet by sheet through openpyxl's read-only mode.
+    Only one surface sheet is materialized at a time; groundwater sheets
+    are folded row by row into per-basin running means.
+    """
+    workbook = openpyxl.load_workbook(path, read_only=True, data_only=True)
     frames: List[pd.DataFrame] = []
-
-    # Surface waters (rivers, lakes)
-    for sheet in xl.sheet_names:
-        category = _categorize_c11_sheet(sheet)
-        if category not in {"Реки", "Озера"}:
-            continue
-        df_sheet = xl.parse(sheet, header=None)
-        parsed = _parse_c11_surface_sheet(df_sheet, category)
-        if not parsed.empty:
-            frames.append(parsed)
-
     # Groundwater sheets need to be combined across multiple years
-    groundwater_stats: Dict[str, Dict[str, List[float]]] = {}
-    for sheet in xl.sheet_names:
-        category = _categorize_c11_sheet(sheet)
-        if category != "Подземные воды":
-            continue
-        df_sheet = xl.parse(sheet, header=None)
-        if "2005-2015" in sheet:
-            year = 2015
-        else:
-            digits = "".join(ch for ch in sheet if ch.isdigit())
-            year = int(digits[-4:]) if digits[-4:] else 0
-        if year == 0:
-            continue
-        measurements = _parse_c11_groundwater_sheet(df_sheet, year)
-        for basin, value in measurements:
-            basin_map = groundwater_stats.setdefault(basin, {})
-            basin_map.setdefault(str(year), []).append(value)
+    groundwater_stats: Dict[str, Dict[str, RunningMean]] = {}
+    try:
+        for sheet_name in workbook.sheetnames:
+            category = _categorize_c11_sheet(sheet_name)
+            if category in {"Реки", "Озера"}:
+                rows = iter_sheet_rows(workbook[sheet_name])
+                parsed = _parse_c11_surface_sheet(pd.DataFrame(list(rows)), category)
+                if not parsed.empty:
+                    frames.append(parsed)
+            elif category == "Подземные воды":
+                year = _groundwater_sheet_year(sheet_name)
+                if year == 0:
+                    continue
+                rows = iter_sheet_rows(workbook[sheet_name])
+                for basin, value in _parse_c11_groundwater_rows(rows):
+                    basin_map = groundwater_stats.setdefault(basin, {})
+                    basin_map.setdefault(str(year), RunningMean()).add(value)
+    finally:
+        workbook.close()
 
     if groundwater_stats:
         gw_rows = []
@@ -402,8 +662,8 @@ def parse_c11_workbook(path: Path) -> pd.DataFrame:
                 "entity": basin,
                 "category": "Подземные воды",
             }
-            for year_str, values in year_values.items():
-                record[year_str] = fmean(values)
+            for year_str, running in year_values.items():
+                record[year_str] = running.mean()
             gw_rows.append(record)
         frames.append(pd.DataFrame(gw_rows))
 
@@ -467,32 +727,169 @@ DATASETS: List[DatasetSpec] = [
 # Main workflow
 # --------------------------------------------------------------------------------------
 
+def file_sha256(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as fh:
+        for chunk in iter(lambda: fh.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def parser_version(spec: DatasetSpec) -> str:
+    return f"{PARSER_VERSION}:{spec.parser.__name__}"
+
+
+def load_manifest() -> Dict[str, Dict]:
+    if not MANIFEST_PATH.exists():
+        return {}
+    try:
+        return json.loads(MANIFEST_PATH.read_text(encoding="utf-8"))
+    except ValueError:
+        return {}
+
+
+def save_manifest(manifest: Dict[str, Dict]) -> None:
+    tmp_path = MANIFEST_PATH.with_suffix(".json.tmp")
+    tmp_path.write_text(
+        json.dumps(manifest, ensure_ascii=False, indent=2, sort_keys=True),
+        encoding="utf-8",
+    )
+    os.replace(tmp_path, MANIFEST_PATH)
+
+
+def is_up_to_date(spec: DatasetSpec, entry: Dict | None, source_hash: str) -> bool:
+    return (
+        entry is not None
+        and entry.get("source_sha256") == source_hash
+        and entry.get("parser_version") == parser_version(spec)
+        and (OUT_DIR / f"{spec.name}.csv").exists()
+    )
+
+
+def normalize_dataset(spec: DatasetSpec) -> Tuple[str, int, float]:
+    """Parses one workbook and writes its CSV and binary; runs in a worker."""
+    started = time.perf_counter()
+    source_path = RAW_DIR / spec.source
+    if spec.use_workbook:
+        clean_df = spec.parser(source_path)
+    else:
+        df_raw = pd.read_excel(source_path, header=None)
+        clean_df = spec.parser(df_raw)
+
+    clean_df = clean_df.fillna("")
+
+    output_path = OUT_DIR / f"{spec.name}.csv"
+    clean_df.to_csv(output_path, index=False)
+    write_binary(str(output_path))
+    return spec.name, len(clean_df), time.perf_counter() - started
+
+
+def ensure_binary(spec: DatasetSpec) -> bool:
+    """Rewrites the binary of an unchanged dataset if it is missing or stale."""
+    csv_path = OUT_DIR / f"{spec.name}.csv"
+    stat = csv_path.stat()
+    if open_binary(str(csv_path), (stat.st_mtime_ns, stat.st_size)) is not None:
+        return False
+    write_binary(str(csv_path))
+    return True
+
+
+def write_binaries() -> None:
+    print("Saved binary datasets:")
+    for spec in DATASETS:
+        csv_path = OUT_DIR / f"{spec.name}.csv"
+        if not csv_path.exists():
+            print(f"  ! missing {csv_path.name}, run without --binary-only first")
+            continue
+        print(f"  - {Path(write_binary(str(csv_path))).name}")
+
+
 def main() -> None:
+    parser = argparse.ArgumentParser(description="Normalize raw datasets")
+    parser.add_argument(
+        "--binary-only",
+        action="store_true",
+        help="only regenerate .bin files from existing CSVs",
+    )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="re-parse every dataset even if the manifest says it is unchanged",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="number of parallel parser processes",
+    )
+    args = parser.parse_args()
+
     OUT_DIR.mkdir(exist_ok=True)
-    summary: List[Tuple[str, int]] = []
+    if args.binary_only:
+        write_binaries()
+        return
+
+    started = time.perf_counter()
+    manifest = {} if args.force else load_manifest()
+    pending: List[DatasetSpec] = []
+    hashes: Dict[str, str] = {}
+    skipped: List[str] = []
 
     for spec in DATASETS:
         source_path = RAW_DIR / spec.source
         if not source_path.exists():
             raise FileNotFoundError(f"Missing source file: {source_path}")
-
-        if spec.use_workbook:
-            clean_df = spec.parser(source_path)
+        hashes[spec.name] = file_sha256(source_path)
+        if is_up_to_date(spec, manifest.get(spec.name), hashes[spec.name]):
+            skipped.append(spec.name)
         else:
-            df_raw = pd.read_excel(source_path, header=None)
-            clean_df = spec.parser(df_raw)
-
-        clean_df = clean_df.fillna("")
-
-        output_path = OUT_DIR / f"{spec.name}.csv"
-        clean_df.to_csv(output_path, index=False)
-        summary.append((spec.name, len(clean_df)))
-
-    print("Saved clean datasets:")
-    for name, rows in summary:
-        print(f"  - {name}.csv ({rows} rows)")
+            pending.append(spec)
+
+    summary: List[Tuple[str, int, float]] = []
+    failures: List[Tuple[str, str]] = []
+    specs_by_name = {spec.name: spec for spec in pending}
+    if pending:
+        workers = max(1, min(args.workers, len(pending)))
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = {pool.submit(normalize_dataset, spec): spec.name for spec in pending}
+            for future in as_completed(futures):
+                name = futures[future]
+                try:
+                    summary.append(future.result())
+                except Exception as exc:
+                    failures.append((name, str(exc)))
+                    continue
+                spec = specs_by_name[name]
+                manifest[name] = {
+                    "source": spec.source,
+                    "source_sha256": hashes[name],
+                    "parser_version": parser_version(spec),
+                    "rows": summary[-1][1],
+                }
+        save_manifest(manifest)
+
+    all_specs = {spec.name: spec for spec in DATASETS}
+    refreshed = [name for name in skipped if ensure_binary(all_specs[name])]
+
+    order = {spec.name: idx for idx, spec in enumerate(DATASETS)}
+    summary.sort(key=lambda item: order[item[0]])
+    if summary:
+        print("Saved clean datasets:")
+    for name, rows, seconds in summary:
+        print(f"  - {name}.csv + {name}.bin ({rows} rows, {seconds:.2f}s)")
+    if skipped:
+        print(f"Unchanged, skipped: {len(skipped)}")
+        for name in skipped:
+            note = " (binary refreshed)" if name in refreshed else ""
+            print(f"  - {name}{note}")
+    if failures:
+        print("Failed:")
+        for name, error in failures:
+            print(f"  ! {name}: {error}")
+    print(f"Total: {time.perf_counter() - started:.2f}s")
+    if failures:
+        sys.exit(1)
 
 
 if __name__ == "__main__":
     main()
-
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Precompute forecasts for every series in data_clean/ into forecast_store/.
+
+Each (file, indicator, entity, category) row that DataLoader can serve is
+forecast with TimeSeriesForecaster.auto_forecast in a process pool.  The
+results are written with ForecastStore together with the SHA-256 of every
+source CSV; /api/forecast serves them while the CSV is unchanged and falls
+back to live fitting otherwise.
+
+Usage:
+    python scripts/precompute_forecasts.py [--periods 10] [--workers N]
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+sys.path.append(str(PROJECT_ROOT))
+
+from src.config import DATASETS_CONFIG  # noqa: E402
+from src.data_loader import DataLoader  # noqa: E402
+from src.forecast_store import ForecastStore, SeriesKey  # noqa: E402
+from src.forecast_worker import forecast_series  # noqa: E402
+
+DATA_DIR = PROJECT_ROOT / "data_clean"
+STORE_DIR = PROJECT_ROOT / "forecast_store"
+
+
+def collect_jobs(
+    loader: DataLoader, periods: List[int]
+) -> Tuple[Dict[str, str], List[Tuple[SeriesKey, List[int], List[float]]]]:
+    hashes: Dict[str, str] = {}
+    jobs: List[Tuple[SeriesKey, List[int], List[float]]] = []
+    for filename in DATASETS_CONFIG:
+        if not (DATA_DIR / filename).exists():
+            print(f"  ! skipping missing dataset {filename}")
+            continue
+        hashes[filename] = loader.content_hash(filename)
+        store = loader.load_store(filename)
+        seen = set()
+        for row in range(len(store)):
+            names = store.row_key(row)
+            # prepare_timeseries always resolves a key to its first row.
+            if names in seen:
+                continue
+            seen.add(names)
+            years, values = store.series(row)
+            if len(years) < 3:
+                continue
+            for horizon in periods:
+                jobs.append(
+                    ((filename, *names, horizon), years.tolist(), values.tolist())
+                )
+    return hashes, jobs
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--periods", type=int, nargs="+", default=[10])
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--out", type=Path, default=STORE_DIR)
+    args = parser.parse_args()
+
+    loader = DataLoader(data_dir=str(DATA_DIR))
+    hashes, jobs = collect_jobs(loader, args.periods)
+    print(f"Forecasting {len(jobs)} series with {args.workers} workers...")
+
+    started = time.perf_counter()
+    results = []
+    failures = 0
+    with ProcessPoolExecutor(max_workers=args.workers) as pool:
+        futures = {
+            pool.submit(forecast_series, years, values, key[-1]): key
+            for key, years, values in jobs
+        }
+        for future in as_completed(futures):
+            key = futures[future]
+            try:
+                results.append((key, future.result()))
+            except Exception as exc:
+                failures += 1
+                print(f"  ! {key}: {exc}")
+
+    results.sort(key=lambda item: tuple(str(part) for part in item[0]))
+    stored = ForecastStore.write(str(args.out), hashes, results)
+    elapsed = time.perf_counter() - started
+    print(
+        f"Saved {stored} forecasts to {args.out} "
+        f"({failures} failed, {elapsed:.1f}s)"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+Publish the datasets into shared memory for multi-worker API deployments.
+
+The process loads every file of DATASETS_CONFIG once, copies it into
+POSIX shared memory and keeps polling the data directory: a rewritten CSV
+is republished under a new generation.  API workers started with
+SHARED_DATASETS=<prefix> attach to the segments read-only instead of
+loading their own copies (see src/shared_datasets.py).
+
+Usage:
+    python scripts/publish_shared_datasets.py [--prefix igisit] \\
+        [--data-dir data_clean] [--interval 5] [--keep 60]
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import signal
+import sys
+from pathlib import Path
+from typing import List, Optional
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+sys.path.append(str(PROJECT_ROOT))
+
+from src.config import DATASETS_CONFIG  # noqa: E402
+from src.data_loader import DataLoader  # noqa: E402
+from src.shared_datasets import SharedDatasetPublisher  # noqa: E402
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--prefix", default="igisit", help="Segment name prefix (SHARED_DATASETS)")
+    parser.add_argument("--data-dir", default=str(PROJECT_ROOT / "data_clean"))
+    parser.add_argument("--interval", type=float, default=5.0, help="Polling interval, seconds")
+    parser.add_argument(
+        "--keep", type=float, default=60.0, help="Seconds before retired segments are unlinked"
+    )
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO)
+    publisher = SharedDatasetPublisher(
+        DataLoader(args.data_dir), DATASETS_CONFIG, args.prefix, keep_seconds=args.keep
+    )
+    # SIGTERM (systemd, docker stop) unwinds through run() and unlinks.
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+    try:
+        publisher.run(args.interval)
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
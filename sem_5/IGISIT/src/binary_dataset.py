@@ -0,0 +1,160 @@
+"""
+Binary companion format for data_clean CSV files.
+
+    <name>.bin = magic (8 bytes) | header length (uint64 LE) | JSON header
+                 | zero padding to a 64-byte boundary
+                 | arrays, each starting on a 64-byte boundary
+
+The JSON header holds the year axis, the indicator/entity/category string
+tables, the size and mtime of the CSV the file was generated from and the
+dtype/shape/offset of every array: the value matrix (rows x years), the
+per-row codes into the string tables (-1 = missing; no category_codes
+without a category column) and the derived arrays of DatasetStore (long
+table, key index, groups, entity year maps).  Readers
+map the file with np.memmap, so opening a dataset needs no parsing or
+rebuilding and every process shares the page cache.  A binary whose
+recorded CSV size/mtime differs is stale and must be ignored.
+"""
+
+import json
+import os
+import struct
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+from .dataset_store import DatasetStore, read_clean_csv
+
+MAGIC = b'IGWRBIN1'
+ALIGNMENT = 64
+BINARY_SUFFIX = '.bin'
+
+
+def align(size: int) -> int:
+    return size + (-size) % ALIGNMENT
+
+
+def array_layout(arrays: Dict[str, np.ndarray]) -> Tuple[Dict[str, Dict], int]:
+    """
+    dtype/shape/offset of every array packed back to back on 64-byte
+    boundaries, and the total size.  Shared with src/shared_datasets.py.
+    """
+    layout: Dict[str, Dict] = {}
+    position = 0
+    for name, array in arrays.items():
+        layout[name] = {
+            "dtype": array.dtype.str,
+            "shape": list(array.shape),
+            "offset": position,
+        }
+        position = align(position + array.nbytes)
+    return layout, position
+
+
+def arrays_from_buffer(buffer: np.ndarray, base: int, layout: Dict[str, Dict]) -> Dict[str, np.ndarray]:
+    """Views of the arrays of ``layout`` into a mapped uint8 buffer."""
+    arrays = {}
+    for name, spec in layout.items():
+        dtype = np.dtype(spec['dtype'])
+        count = int(np.prod(spec['shape'], dtype=np.int64))
+        offset = base + spec['offset']
+        arrays[name] = (
+            buffer[offset:offset + count * dtype.itemsize]
+            .view(dtype)
+            .reshape(spec['shape'])
+        )
+    return arrays
+
+
+def store_header(store: DatasetStore) -> Dict:
+    """Year axis and string tables; the header part DatasetStore.from_binary reads."""
+    strings = {"indicator": store.indicators, "entity": store.entities}
+    if store.has_category:
+        strings["category"] = store.categories
+    return {"rows": len(store), "years": store.year_axis.tolist(), "strings": strings}
+
+
+def store_arrays(store: DatasetStore) -> Dict[str, np.ndarray]:
+    """
+    Matrix, per-row codes and derived arrays in a fixed little-endian
+    layout.  category_codes is only present for datasets with categories.
+    """
+    arrays = {
+        "matrix": np.ascontiguousarray(store.matrix, dtype='<f8'),
+        "indicator_codes": np.ascontiguousarray(store.indicator_codes, dtype='<i4'),
+        "entity_codes": np.ascontiguousarray(store.entity_codes, dtype='<i4'),
+    }
+    if store.has_category:
+        arrays["category_codes"] = np.ascontiguousarray(store.category_codes, dtype='<i4')
+    for name, array in store.derived.items():
+        arrays[name] = np.ascontiguousarray(array, dtype=array.dtype.newbyteorder('<'))
+    return arrays
+
+
+def binary_path(csv_path: str) -> str:
+    root, _ = os.path.splitext(csv_path)
+    return root + BINARY_SUFFIX
+
+
+def write_binary(csv_path: str) -> str:
+    """
+    Writes the binary companion of a data_clean CSV.  The CSV is parsed
+    exactly as DataLoader parses it, so both paths yield the same store.
+    """
+    store = DatasetStore.from_frame(read_clean_csv(csv_path))
+    arrays = store_arrays(store)
+    layout, _ = array_layout(arrays)
+
+    stat = os.stat(csv_path)
+    header = json.dumps(
+        {
+            **store_header(store),
+            "source": {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns},
+            "arrays": layout,
+        },
+        ensure_ascii=False,
+    ).encode('utf-8')
+
+    prefix = len(MAGIC) + 8 + len(header)
+    path = binary_path(csv_path)
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'wb') as fh:
+        fh.write(MAGIC)
+        fh.write(struct.pack('<Q', len(header)))
+        fh.write(header)
+        fh.write(b'\0' * (align(prefix) - prefix))
+        for array in arrays.values():
+            fh.write(array.tobytes())
+            fh.write(b'\0' * (align(array.nbytes) - array.nbytes))
+    os.replace(tmp_path, path)
+    return path
+
+
+def open_binary(
+    csv_path: str, source_version: Tuple[int, int]
+) -> Optional[Tuple[Dict, Dict[str, np.ndarray]]]:
+    """
+    Returns (header, memory-mapped arrays), or None when the binary file
+    is missing, malformed or was generated from a different CSV version
+    (``source_version`` is (mtime_ns, size) of the CSV).
+    """
+    path = binary_path(csv_path)
+    try:
+        with open(path, 'rb') as fh:
+            if fh.read(len(MAGIC)) != MAGIC:
+                return None
+            (header_len,) = struct.unpack('<Q', fh.read(8))
+            header = json.loads(fh.read(header_len).decode('utf-8'))
+    except (OSError, ValueError, struct.error):
+        return None
+
+    source = header.get('source', {})
+    if (source.get('mtime_ns'), source.get('size')) != tuple(source_version):
+        return None
+
+    try:
+        buffer = np.memmap(path, dtype=np.uint8, mode='r')
+        arrays = arrays_from_buffer(buffer, align(len(MAGIC) + 8 + header_len), header['arrays'])
+    except (OSError, ValueError, KeyError):
+        return None
+    return header, arrays
@@ -1,24 +1,55 @@
+import hashlib
 import logging
-import math
 import os
-from typing import Dict, List, Optional, Tuple
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Tuple
 
+import numpy as np
 import pandas as pd
 
+from .binary_dataset import open_binary
+from .dataset_catalog import KNOWN_RIVERS, DatasetCatalog
+from .dataset_store import DatasetStore, EntityYearMap, read_clean_csv
+from .shared_datasets import SharedDatasetReader
+
 logger = logging.getLogger(__name__)
 
-KNOWN_RIVERS = [
-    'Березина',
-    'Вилия',
-    'Днепр',
-    'Западная Двина',
-    'Западный Буг',
-    'Мухавец',
-    'Неман',
-    'Припять',
-    'Свислочь',
-    'Сож',
-]
+
+class DatasetSnapshot:
+    """
+    One loaded version of a dataset.  Snapshots are never modified: a
+    reload builds a new one and swaps the reference, so a request that
+    already holds a snapshot keeps reading consistent data without locks.
+    """
+
+    __slots__ = ('filename', 'version', 'store', 'catalog', '_frame', '_frame_lock')
+
+    def __init__(
+        self,
+        filename: str,
+        version: Tuple[int, int],
+        store: DatasetStore,
+        frame: Optional[pd.DataFrame] = None,
+    ):
+        self.filename = filename
+        self.version = version
+        self.store = store
+        self.catalog = DatasetCatalog(store)
+        self._frame = frame
+        self._frame_lock = threading.Lock()
+
+    @property
+    def has_frame(self) -> bool:
+        return self._frame is not None
+
+    def frame(self) -> pd.DataFrame:
+        """The dataset as a DataFrame, materialized on first use."""
+        if self._frame is None:
+            with self._frame_lock:
+                if self._frame is None:
+                    self._frame = self.store.to_frame()
+        return self._frame
 
 
 class DataLoader:
@@ -30,35 +61,154 @@ class DataLoader:
         - <year>: numeric columns for every available year
     """
 
-    def __init__(self, data_dir: str = 'data_clean'):
+    def __init__(
+        self,
+        data_dir: str = 'data_clean',
+        on_load: Optional[Callable[[str, float], None]] = None,
+        shared: Optional[SharedDatasetReader] = None,
+    ):
+        """
+        ``on_load(filename, seconds)`` is called after every (re)load of a
+        dataset, e.g. to export load times as metrics.  With ``shared``
+        datasets published in shared memory are used instead of loading
+        them in this process.
+        """
         self.data_dir = data_dir
-        self.cache: Dict[str, pd.DataFrame] = {}
+        self.on_load = on_load
+        self.shared = shared
+        self.snapshots: Dict[str, DatasetSnapshot] = {}
+        # Set while a DatasetWatcher keeps the snapshots fresh; requests
+        # then skip the per-call stat of the CSV.
+        self.watched = False
+        self._listeners: List[Callable[[str, Optional[DatasetSnapshot], DatasetSnapshot], None]] = []
+        # One lock per dataset: a slow parse never delays other files.
+        self._load_locks: Dict[str, threading.Lock] = {}
+        self._load_locks_lock = threading.Lock()
+        self._hashes: Dict[str, Tuple[Tuple[int, int], str]] = {}
+
+    @property
+    def stores(self) -> Dict[str, DatasetStore]:
+        return {filename: snap.store for filename, snap in list(self.snapshots.items())}
+
+    @property
+    def cache(self) -> Dict[str, pd.DataFrame]:
+        """DataFrames materialized so far (see DatasetSnapshot.frame)."""
+        return {
+            filename: snap.frame()
+            for filename, snap in list(self.snapshots.items())
+            if snap.has_frame
+        }
+
+    def add_listener(
+        self, listener: Callable[[str, Optional[DatasetSnapshot], DatasetSnapshot], None]
+    ) -> None:
+        """
+        ``listener(filename, old, new)`` runs after a snapshot is replaced,
+        e.g. to drop caches derived from the old version.
+        """
+        self._listeners.append(listener)
+
+    def _load_lock(self, filename: str) -> threading.Lock:
+        with self._load_locks_lock:
+            lock = self._load_locks.get(filename)
+            if lock is None:
+                lock = self._load_locks[filename] = threading.Lock()
+            return lock
 
     def _resolve_path(self, filename: str) -> str:
         return os.path.join(self.data_dir, filename)
 
-    def load_csv(self, filename: str) -> pd.DataFrame:
-        if filename in self.cache:
-            return self.cache[filename]
-
+    def dataset_version(self, filename: str) -> Tuple[int, int]:
+        """
+        (mtime_ns, size) of the source CSV; changes whenever the file is rewritten.
+        """
         path = self._resolve_path(filename)
         if not os.path.exists(path):
             raise FileNotFoundError(f"Dataset not found: {path}")
+        stat = os.stat(path)
+        return stat.st_mtime_ns, stat.st_size
 
-        df = pd.read_csv(path)
-        df.columns = [str(col).strip() for col in df.columns]
+    def content_hash(self, filename: str) -> str:
+        """
+        SHA-256 of the source CSV, recomputed only when its version changes.
+        """
+        version = self.dataset_version(filename)
+        cached = self._hashes.get(filename)
+        if cached and cached[0] == version:
+            return cached[1]
+        digest = hashlib.sha256()
+        with open(self._resolve_path(filename), 'rb') as fh:
+            for chunk in iter(lambda: fh.read(1 << 20), b''):
+                digest.update(chunk)
+        self._hashes[filename] = (version, digest.hexdigest())
+        return digest.hexdigest()
+
+    def _swap(self, snapshot: DatasetSnapshot) -> DatasetSnapshot:
+        old = self.snapshots.get(snapshot.filename)
+        self.snapshots[snapshot.filename] = snapshot
+        for listener in self._listeners:
+            try:
+                listener(snapshot.filename, old, snapshot)
+            except Exception as exc:
+                logger.warning("Dataset reload listener failed for %s: %s", snapshot.filename, exc)
+        return snapshot
 
-        if 'indicator' not in df.columns:
-            raise ValueError(
-                f"Dataset {filename} must contain an 'indicator' column. "
-                "Re-run scripts/normalize_datasets.py."
-            )
+    def reload(self, filename: str, version: Optional[Tuple[int, int]] = None) -> DatasetSnapshot:
+        """
+        Parses the dataset into a new snapshot and swaps it in.  Prefers
+        the memory-mapped binary written by scripts/normalize_datasets.py
+        and falls back to parsing the CSV when the binary is missing or stale.
+        """
+        with self._load_lock(filename):
+            version = version or self.dataset_version(filename)
+            current = self.snapshots.get(filename)
+            if current is not None and current.version == version:
+                # Another thread loaded this version while we waited.
+                return current
+
+            start = time.perf_counter()
+            path = self._resolve_path(filename)
+            binary = open_binary(path, version)
+            if binary is not None:
+                snapshot = DatasetSnapshot(filename, version, DatasetStore.from_binary(*binary))
+            else:
+                df = read_clean_csv(path)
+                snapshot = DatasetSnapshot(filename, version, DatasetStore.from_frame(df), df)
+            self._swap(snapshot)
+        if self.on_load is not None:
+            self.on_load(filename, time.perf_counter() - start)
+        return snapshot
+
+    def snapshot(self, filename: str) -> DatasetSnapshot:
+        """
+        Current snapshot of the dataset.  Without a watcher the CSV version
+        is checked on every call and a changed file is reloaded inline.
+        """
+        if self.shared is not None:
+            published = self.shared.store(filename)
+            if published is not None:
+                store, version = published
+                current = self.snapshots.get(filename)
+                if current is not None and current.store is store:
+                    return current
+                return self._swap(DatasetSnapshot(filename, version, store))
+
+        current = self.snapshots.get(filename)
+        if current is not None and self.watched:
+            return current
+        version = self.dataset_version(filename)
+        if current is not None and current.version == version:
+            return current
+        return self.reload(filename, version)
+
+    def load_store(self, filename: str) -> DatasetStore:
+        return self.snapshot(filename).store
 
-        if 'entity' not in df.columns:
-            df['entity'] = 'Беларусь'
+    def load_csv(self, filename: str) -> pd.DataFrame:
+        return self.snapshot(filename).frame()
 
-        self.cache[filename] = df
-        return df
+    def catalog(self, filename: str) -> DatasetCatalog:
+        return self.snapshot(filename).catalog
 
     def _year_columns(self, df: pd.DataFrame) -> List[str]:
         return sorted([col for col in df.columns if col.isdigit()], key=int)
@@ -117,135 +267,96 @@ class DataLoader:
                 )
         return rows
 
-    def prepare_timeseries(
+    def resolve_series(
         self,
-        df: pd.DataFrame,
+        filename: str,
         indicator: Optional[str] = None,
         entity: Optional[str] = None,
         category: Optional[str] = None,
-    ) -> pd.DataFrame:
-        subset = df.copy()
-
-        if indicator and indicator not in {'', 'Автоматически'}:
-            subset = subset[subset['indicator'] == indicator]
-
-        if category and 'category' in subset.columns:
-            subset = subset[subset['category'] == category]
-
-        if entity and entity not in {'', 'Все'} and 'entity' in subset.columns:
-            subset = subset[subset['entity'] == entity]
-
-        if subset.empty:
-            subset = df.iloc[[0]]
+    ) -> Optional[Tuple[Optional[str], Optional[str], Optional[str]]]:
+        """
+        Names of the row prepare_timeseries would use for these filters.
+        """
+        store = self.load_store(filename)
+        if not len(store):
+            return None
+        row = store.find_row(indicator=indicator, entity=entity, category=category)
+        return store.row_key(row if row is not None else 0)
 
-        row = subset.iloc[0]
-        year_cols = self._year_columns(df)
+    def series_arrays(
+        self,
+        filename: str,
+        indicator: Optional[str] = None,
+        entity: Optional[str] = None,
+        category: Optional[str] = None,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Years and values of the series prepare_timeseries would return,
+        without building a DataFrame.
+        """
+        store = self.load_store(filename)
+        if not len(store):
+            return np.zeros(0, dtype=int), np.zeros(0)
 
-        years: List[int] = []
-        values: List[float] = []
-        for col in year_cols:
-            value = row.get(col)
-            if value in {'', None} or pd.isna(value):
-                continue
-            try:
-                value_float = float(value)
-            except (ValueError, TypeError):
-                continue
-            years.append(int(col))
-            values.append(value_float)
+        row = store.find_row(indicator=indicator, entity=entity, category=category)
+        return store.series(row if row is not None else 0)
 
-        if not years:
+    def prepare_timeseries(
+        self,
+        filename: str,
+        indicator: Optional[str] = None,
+        entity: Optional[str] = None,
+        category: Optional[str] = None,
+    ) -> pd.DataFrame:
+        years, values = self.series_arrays(
+            filename, indicator=indicator, entity=entity, category=category
+        )
+        if not len(years):
             return pd.DataFrame()
 
         return pd.DataFrame(
             {
-                'year': pd.to_datetime(years, format='%Y'),
-                'value': values,
+                'year': pd.to_datetime(years.tolist(), format='%Y'),
+                'value': values.copy(),
             }
-        ).sort_values('year')
+        )
 
     def get_entity_data(
         self,
-        df: pd.DataFrame,
+        filename: str,
         year: int,
         entities: List[str],
         indicator: Optional[str] = None,
         category: Optional[str] = None,
         fallback_to_nearest: bool = True,
     ) -> Tuple[Dict[str, float], int]:
-        if 'entity' not in df.columns:
-            return {}, year
-
-        subset = df.copy()
-        if indicator and indicator not in {'', 'Автоматически'}:
-            subset = subset[subset['indicator'] == indicator]
-
-        if category and 'category' in subset.columns:
-            subset = subset[subset['category'] == category]
-
-        year_columns = self._year_columns(df)
-        if not year_columns:
-            return {}, year
-
-        available_years = sorted(int(col) for col in year_columns)
-
-        entity_names = (
-            entities
-            if entities
-            else subset['entity'].dropna().astype(str).unique().tolist()
-        )
-
-        if not entity_names:
+        store = self.load_store(filename)
+        year_map = store.entity_map(indicator=indicator, category=category)
+        if year_map is None:
             return {}, year
+        return year_map.lookup(year, entities, fallback_to_nearest)
 
-        def collect_values(target_year: int) -> Dict[str, float]:
-            year_col = str(target_year)
-            if year_col not in subset.columns:
-                return {}
-
-            values: Dict[str, float] = {}
-            for entity in entity_names:
-                rows = subset[subset['entity'] == entity]
-                if rows.empty:
-                    continue
-                value_float = None
-                for _, row in rows.iterrows():
-                    value = row.get(year_col)
-                    if value in {'', None} or (isinstance(value, str) and not value.strip()):
-                        continue
-                    try:
-                        candidate = float(value)
-                    except (TypeError, ValueError):
-                        continue
-                    if math.isnan(candidate) or math.isinf(candidate):
-                        continue
-                    value_float = candidate
-                    break
-                if value_float is None:
-                    continue
-                values[entity] = value_float
-            return values
-
-        search_order: List[int] = []
-        if year in available_years:
-            search_order.append(year)
-
-        if fallback_to_nearest:
-            earlier = sorted((y for y in available_years if y < year), reverse=True)
-            later = sorted(y for y in available_years if y > year)
-            for candidate in earlier + later:
-                if candidate not in search_order:
-                    search_order.append(candidate)
-        else:
-            if year not in search_order:
-                search_order.append(year)
-
-        for candidate_year in search_order:
-            values = collect_values(candidate_year)
-            if values:
-                return values, candidate_year
-
-        return {}, year
+    def entity_matrix(
+        self,
+        filename: str,
+        indicator: Optional[str] = None,
+        category: Optional[str] = None,
+    ) -> Optional[Tuple[Optional[str], EntityYearMap]]:
+        """
+        (indicator, year x entity map) for the selection.  Without an
+        indicator the one prepare_timeseries would pick is used, so the
+        entities are never mixed across indicators.
+        """
+        store = self.load_store(filename)
+        if not len(store):
+            return None
+        if indicator is None:
+            row = store.find_row(category=category)
+            indicator = store.row_key(row if row is not None else 0)[0]
+        year_map = store.entity_map(indicator=indicator, category=category)
+        if year_map is None or not year_map.entities:
+            return None
+        return indicator, year_map
 
     def get_year_range(self, df: pd.DataFrame) -> Tuple[int, int]:
         year_cols = self._year_columns(df)
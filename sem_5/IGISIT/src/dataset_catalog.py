@@ -0,0 +1,106 @@
+"""
+Per-dataset metadata computed once per load from the DatasetStore codes.
+
+Everything DataLoader.detect_structure and get_year_range derive from the
+DataFrame (sorted indicators, entities, categories, entity type, year
+range) plus the entities of every category and the number of non-empty
+values of every series.
+"""
+
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+from .dataset_store import DatasetStore
+
+KNOWN_RIVERS = [
+    'Березина',
+    'Вилия',
+    'Днепр',
+    'Западная Двина',
+    'Западный Буг',
+    'Мухавец',
+    'Неман',
+    'Припять',
+    'Свислочь',
+    'Сож',
+]
+
+# Reported by get_year_range for datasets without year columns.
+DEFAULT_YEAR_RANGE = (2000, 2024)
+
+
+def _sorted_positions(table: List[str], codes: np.ndarray) -> Tuple[List[str], np.ndarray]:
+    """Sorted names used by ``codes`` and the codes remapped into them (-1 kept)."""
+    used = np.unique(codes[codes >= 0])
+    names = sorted(table[code] for code in used.tolist())
+    position = {name: idx for idx, name in enumerate(names)}
+    remap = np.full(len(table) + 1, -1, dtype=np.int32)
+    for code in used.tolist():
+        remap[code] = position[table[code]]
+    # codes == -1 index the trailing -1.
+    return names, remap[codes]
+
+
+class DatasetCatalog:
+    def __init__(self, store: DatasetStore):
+        self.indicators, indicator_pos = _sorted_positions(store.indicators, store.indicator_codes)
+        all_entities, entity_pos = _sorted_positions(store.entities, store.entity_codes)
+        if store.has_category:
+            self.categories, category_pos = _sorted_positions(
+                store.categories, store.category_codes
+            )
+        else:
+            self.categories, category_pos = [], np.full(len(store), -1, dtype=np.int32)
+
+        self.has_entities = len(all_entities) > 1
+        self.entities = all_entities if self.has_entities else []
+        if not self.has_entities:
+            self.entity_type = 'belarus'
+        elif any(entity in KNOWN_RIVERS for entity in self.entities):
+            self.entity_type = 'river'
+        else:
+            self.entity_type = 'region'
+
+        self.category_entities: Dict[str, List[str]] = {}
+        for position, category in enumerate(self.categories):
+            present = np.unique(entity_pos[(category_pos == position) & (entity_pos >= 0)])
+            if len(present):
+                self.category_entities[category] = [all_entities[idx] for idx in present.tolist()]
+
+        years = store.year_axis
+        self.year_range = (
+            (int(years.min()), int(years.max())) if len(years) else DEFAULT_YEAR_RANGE
+        )
+
+        # One entry per series (file row); names are positions in the lists
+        # above, -1 when missing (entity is -1 without an entity breakdown).
+        self.series_indicator = indicator_pos
+        self.series_entity = entity_pos if self.has_entities else np.full_like(entity_pos, -1)
+        self.series_category = category_pos
+        self.series_values = np.diff(store.offsets)
+
+    def entities_for(self, category=None) -> List[str]:
+        """Entities the map shows for the category (all when unknown)."""
+        if category and self.categories:
+            return self.category_entities.get(category) or self.entities
+        return self.entities
+
+    def to_dict(self, series: bool = True) -> Dict:
+        data = {
+            "has_entities": self.has_entities,
+            "entities": self.entities,
+            "entity_type": self.entity_type,
+            "indicators": self.indicators,
+            "categories": self.categories,
+            "category_entities": self.category_entities,
+            "year_range": list(self.year_range),
+        }
+        if series:
+            data["series"] = {
+                "indicator": self.series_indicator,
+                "entity": self.series_entity,
+                "category": self.series_category,
+                "values": self.series_values,
+            }
+        return data
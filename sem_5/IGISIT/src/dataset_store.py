@@ -0,0 +1,543 @@
+import os
+from itertools import product
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+SKIP_INDICATORS = {'', 'Автоматически'}
+SKIP_ENTITIES = {'', 'Все'}
+
+# Key used for a filter that is not applied (any indicator/entity/category).
+ANY = -1
+# Bits per code in a packed (indicator, entity, category) key.
+KEY_BITS = 21
+
+
+def read_clean_csv(path: str) -> pd.DataFrame:
+    df = pd.read_csv(path)
+    df.columns = [str(col).strip() for col in df.columns]
+
+    if 'indicator' not in df.columns:
+        raise ValueError(
+            f"Dataset {os.path.basename(path)} must contain an 'indicator' column. "
+            "Re-run scripts/normalize_datasets.py."
+        )
+
+    if 'entity' not in df.columns:
+        df['entity'] = 'Беларусь'
+    return df
+
+
+def encode_column(column: Optional[pd.Series], size: int) -> Tuple[List[str], np.ndarray]:
+    if column is None:
+        return [], np.full(size, ANY, dtype=np.int32)
+    mask = column.notna()
+    codes = np.full(size, ANY, dtype=np.int32)
+    if mask.any():
+        values = column[mask].astype(str)
+        encoded, uniques = pd.factorize(values, sort=False)
+        codes[mask.to_numpy()] = encoded
+        return [str(value) for value in uniques], codes
+    return [], codes
+
+
+def _nearest_fill(has_any: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    For every year position returns the closest position at or before it
+    (prev) and at or after it (next) that has at least one value, or -1.
+    """
+    positions = np.arange(len(has_any))
+    marked = np.where(has_any, positions, -1)
+    prev_fill = np.maximum.accumulate(marked) if len(marked) else marked
+    marked = np.where(has_any, positions, len(has_any))
+    next_fill = (
+        np.minimum.accumulate(marked[::-1])[::-1] if len(marked) else marked
+    )
+    next_fill = np.where(next_fill == len(has_any), -1, next_fill)
+    return prev_fill, next_fill
+
+
+class EntityYearMap:
+    """
+    Dense year x entity matrix for one (indicator, category) selection.
+
+    ``values[i, j]`` is the first finite value of entity ``codes[j]`` in
+    year ``year_axis[i]`` (in file row order).  Nearest non-empty years are
+    precomputed so that resolving a slider year is a single row read.  All
+    state is plain arrays, so maps can be views into a .bin file or a
+    shared-memory segment (see pack_entity_maps).
+    """
+
+    def __init__(
+        self,
+        year_axis: np.ndarray,
+        entity_names: List[str],
+        entity_lookup: Dict[str, int],
+        codes: np.ndarray,
+        values: np.ndarray,
+        finite: np.ndarray,
+        has_any: np.ndarray,
+        prev_fill: np.ndarray,
+        next_fill: np.ndarray,
+    ):
+        """
+        ``entity_names``/``entity_lookup`` are the store's entity table and
+        its name -> code dict; ``codes`` are the entity codes of the columns.
+        """
+        self.year_axis = year_axis
+        self.codes = codes
+        self.values = values
+        self.finite = finite
+        self.has_any = has_any
+        self.prev_fill = prev_fill
+        self.next_fill = next_fill
+        self._entity_names = entity_names
+        self._entity_lookup = entity_lookup
+        self._entities: Optional[List[str]] = None
+        self._columns: Optional[np.ndarray] = None
+
+    @property
+    def entities(self) -> List[str]:
+        if self._entities is None:
+            self._entities = [self._entity_names[code] for code in self.codes.tolist()]
+        return self._entities
+
+    def _column_of(self) -> np.ndarray:
+        """Entity code -> column, -1 for entities outside the selection."""
+        if self._columns is None:
+            columns = np.full(len(self._entity_names), -1, dtype=np.int64)
+            columns[self.codes] = np.arange(len(self.codes))
+            self._columns = columns
+        return self._columns
+
+    @classmethod
+    def build(
+        cls,
+        year_axis: np.ndarray,
+        matrix: np.ndarray,
+        rows: np.ndarray,
+        entity_codes: np.ndarray,
+        entity_names: List[str],
+        entity_lookup: Optional[Dict[str, int]] = None,
+    ) -> 'EntityYearMap':
+        rows = rows[entity_codes[rows] >= 0]
+        codes = entity_codes[rows]
+        # Entities keep their first-appearance order inside the selection.
+        unique_codes, first_pos = np.unique(codes, return_index=True)
+        appearance = unique_codes[np.argsort(first_pos)]
+        columns = np.empty(len(entity_names), dtype=np.int64)
+        columns[appearance] = np.arange(len(appearance))
+
+        values = np.full((len(year_axis), len(appearance)), np.nan)
+        if len(rows) and len(year_axis):
+            order = np.argsort(columns[codes], kind='stable')
+            sorted_rows = rows[order]
+            sorted_cols = columns[codes][order]
+            starts = np.flatnonzero(np.r_[True, sorted_cols[1:] != sorted_cols[:-1]])
+            block = matrix[sorted_rows]
+            valid = np.isfinite(block)
+            rank = np.where(valid, np.arange(len(sorted_rows))[:, None], len(sorted_rows))
+            first = np.minimum.reduceat(rank, starts, axis=0)
+            found = first < len(sorted_rows)
+            picked = block[np.minimum(first, len(sorted_rows) - 1), np.arange(len(year_axis))]
+            values[:, sorted_cols[starts]] = np.where(found, picked, np.nan).T
+
+        finite = np.isfinite(values)
+        has_any = finite.any(axis=1)
+        prev_fill, next_fill = _nearest_fill(has_any)
+        if entity_lookup is None:
+            entity_lookup = {name: code for code, name in enumerate(entity_names)}
+        return cls(
+            year_axis, entity_names, entity_lookup, appearance.astype(np.int32),
+            values, finite, has_any, prev_fill, next_fill,
+        )
+
+    def _resolve(
+        self, year: int, has_any: np.ndarray, prev_fill: np.ndarray,
+        next_fill: np.ndarray, fallback_to_nearest: bool,
+    ) -> Optional[int]:
+        pos = int(np.searchsorted(self.year_axis, year, side='right')) - 1
+        exact = pos >= 0 and self.year_axis[pos] == year
+        if not fallback_to_nearest:
+            return pos if exact and has_any[pos] else None
+        if pos >= 0 and prev_fill[pos] >= 0:
+            return int(prev_fill[pos])
+        if pos + 1 < len(next_fill) and next_fill[pos + 1] >= 0:
+            return int(next_fill[pos + 1])
+        return None
+
+    def lookup(
+        self,
+        year: int,
+        entities: Optional[List[str]] = None,
+        fallback_to_nearest: bool = True,
+    ) -> Tuple[Dict[str, float], int]:
+        if entities:
+            column_of = self._column_of()
+            names, picked = [], []
+            for name in entities:
+                code = self._entity_lookup.get(name)
+                if code is not None and column_of[code] >= 0:
+                    names.append(name)
+                    picked.append(column_of[code])
+            columns = np.array(picked, dtype=np.int64)
+        else:
+            names = self.entities
+            columns = np.arange(len(names), dtype=np.int64)
+        if not names or not len(self.year_axis):
+            return {}, year
+
+        if len(set(columns.tolist())) == len(self.codes):
+            has_any, prev_fill, next_fill = self.has_any, self.prev_fill, self.next_fill
+        else:
+            has_any = self.finite[:, columns].any(axis=1)
+            prev_fill, next_fill = _nearest_fill(has_any)
+
+        pos = self._resolve(year, has_any, prev_fill, next_fill, fallback_to_nearest)
+        if pos is None:
+            return {}, year
+
+        row = self.values[pos, columns]
+        mask = self.finite[pos, columns]
+        values = {
+            name: value
+            for name, value, ok in zip(names, row.tolist(), mask.tolist())
+            if ok
+        }
+        return values, int(self.year_axis[pos])
+
+
+def pack_key(indicator, entity, category):
+    """
+    One int64 per (indicator, entity, category) code triple; works on
+    scalars and arrays.  ANY (-1) packs to 0 in its field.
+    """
+    return (
+        ((np.int64(1) + indicator) << (2 * KEY_BITS))
+        | ((np.int64(1) + entity) << KEY_BITS)
+        | (np.int64(1) + category)
+    )
+
+
+def _sorted_pairs(keys: np.ndarray, rows: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    order = np.lexsort((rows, keys))
+    return keys[order], rows[order]
+
+
+def build_derived(
+    year_axis: np.ndarray,
+    matrix: np.ndarray,
+    indicator_codes: np.ndarray,
+    entity_codes: np.ndarray,
+    category_codes: np.ndarray,
+    entity_names: List[str],
+) -> Dict[str, np.ndarray]:
+    """
+    Every array DatasetStore derives from the matrix and codes: the long
+    table, the key index, the (indicator, category) groups and the packed
+    entity year maps.  Written into .bin files and shared-memory segments
+    so that readers map them instead of rebuilding them.
+    """
+    size = len(matrix)
+    present = ~np.isnan(matrix)
+    offsets = np.zeros(size + 1, dtype=np.int64)
+    np.cumsum(present.sum(axis=1), out=offsets[1:])
+    derived = {
+        "offsets": offsets,
+        "years": np.ascontiguousarray(np.broadcast_to(year_axis, matrix.shape)[present], dtype=np.int64),
+        "values": np.ascontiguousarray(matrix[present], dtype=np.float64),
+    }
+
+    rows = np.arange(size, dtype=np.int64)
+    ind = indicator_codes.astype(np.int64)
+    ent = entity_codes.astype(np.int64)
+    cat = category_codes.astype(np.int64)
+    skip = np.full(size, ANY, dtype=np.int64)
+
+    # Every full or partial key -> first row having it.
+    keys, key_rows = _sorted_pairs(
+        np.concatenate([
+            pack_key(i, e, c) for i, e, c in product((ind, skip), (ent, skip), (cat, skip))
+        ]),
+        np.tile(rows, 8),
+    )
+    first = np.r_[True, keys[1:] != keys[:-1]] if len(keys) else np.zeros(0, dtype=bool)
+    derived["index_keys"] = keys[first]
+    derived["index_rows"] = key_rows[first]
+
+    # (indicator, category) group -> its rows in file order (CSR).
+    keys, key_rows = _sorted_pairs(
+        np.concatenate([pack_key(i, skip, c) for i, c in product((ind, skip), (cat, skip))]),
+        np.tile(rows, 4),
+    )
+    if len(keys):
+        unique = np.r_[True, (keys[1:] != keys[:-1]) | (key_rows[1:] != key_rows[:-1])]
+        keys, key_rows = keys[unique], key_rows[unique]
+    group_keys, group_starts = np.unique(keys, return_index=True)
+    derived["group_keys"] = group_keys
+    derived["group_offsets"] = np.r_[group_starts, len(keys)].astype(np.int64)
+    derived["group_rows"] = key_rows
+
+    entity_lookup = {name: code for code, name in enumerate(entity_names)}
+    maps = [
+        EntityYearMap.build(
+            year_axis, matrix, key_rows[start:stop], entity_codes, entity_names, entity_lookup
+        )
+        for start, stop in zip(derived["group_offsets"][:-1], derived["group_offsets"][1:])
+    ]
+    derived.update(pack_entity_maps(maps, len(year_axis)))
+    return derived
+
+
+def pack_entity_maps(maps: List[EntityYearMap], years: int) -> Dict[str, np.ndarray]:
+    """
+    Concatenates the maps (one per group) into flat arrays: columns of
+    map ``g`` are ``map_entity_codes[map_entity_offsets[g]:...[g + 1]]``,
+    its values the matching slice of ``map_values`` times ``years``.
+    """
+    entity_offsets = np.zeros(len(maps) + 1, dtype=np.int64)
+    np.cumsum([len(m.codes) for m in maps], out=entity_offsets[1:])
+
+    def concat(parts, dtype):
+        return np.concatenate(parts).astype(dtype) if parts else np.zeros(0, dtype=dtype)
+
+    def stack(parts, dtype):
+        return np.stack(parts).astype(dtype) if parts else np.zeros((0, years), dtype=dtype)
+
+    return {
+        "map_entity_offsets": entity_offsets,
+        "map_entity_codes": concat([m.codes for m in maps], np.int32),
+        "map_values": concat([m.values.ravel() for m in maps], np.float64),
+        "map_finite": concat([m.finite.ravel() for m in maps], np.bool_),
+        "map_has_any": stack([m.has_any for m in maps], np.bool_),
+        "map_prev_fill": stack([m.prev_fill for m in maps], np.int64),
+        "map_next_fill": stack([m.next_fill for m in maps], np.int64),
+    }
+
+
+class DatasetStore:
+    """
+    Read-only columnar view of one normalized dataset.
+
+    Every CSV row is one series identified by (indicator, entity, category).
+    Keys are dictionary-encoded into integer codes and the non-empty
+    (year, value) pairs are kept in a long table: the values of row ``r``
+    live in ``years[offsets[r]:offsets[r + 1]]`` / ``values[...]``.
+    A sorted array of packed keys maps every full or partial key to the
+    first matching row, so series lookups never scan or copy the source
+    frame.  Year x entity maps for every (indicator, category) selection
+    are precomputed as well (see build_derived).
+    """
+
+    def __init__(
+        self,
+        indicators: List[str],
+        entities: List[str],
+        categories: List[str],
+        indicator_codes: np.ndarray,
+        entity_codes: np.ndarray,
+        category_codes: np.ndarray,
+        year_axis: np.ndarray,
+        matrix: np.ndarray,
+        has_category: bool,
+        derived: Optional[Dict[str, np.ndarray]] = None,
+    ):
+        """
+        ``derived`` = the arrays of build_derived when they were already
+        computed elsewhere (a .bin file or a shared-memory segment).
+        """
+        self.indicators = indicators
+        self.entities = entities
+        self.categories = categories
+        self.indicator_codes = indicator_codes
+        self.entity_codes = entity_codes
+        self.category_codes = category_codes
+        self.year_axis = year_axis
+        self.matrix = matrix
+        self.has_category = has_category
+
+        self._indicator_lookup = {name: code for code, name in enumerate(indicators)}
+        self._entity_lookup = {name: code for code, name in enumerate(entities)}
+        self._category_lookup = {name: code for code, name in enumerate(categories)}
+
+        if derived is None:
+            derived = build_derived(
+                year_axis, matrix, indicator_codes, entity_codes, category_codes, entities
+            )
+        self.derived = derived
+        self.offsets = derived["offsets"]
+        self.years = derived["years"]
+        self.values = derived["values"]
+        # Map views are cheap but created on first use per group.
+        self._entity_maps: Dict[int, EntityYearMap] = {}
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame) -> 'DatasetStore':
+        year_cols = sorted([col for col in df.columns if col.isdigit()], key=int)
+        size = len(df)
+        indicators, indicator_codes = encode_column(df.get('indicator'), size)
+        entities, entity_codes = encode_column(df.get('entity'), size)
+        categories, category_codes = encode_column(df.get('category'), size)
+
+        if year_cols:
+            matrix = (
+                df[year_cols]
+                .apply(pd.to_numeric, errors='coerce')
+                .to_numpy(dtype=np.float64)
+            )
+        else:
+            matrix = np.empty((size, 0), dtype=np.float64)
+
+        return cls(
+            indicators,
+            entities,
+            categories,
+            indicator_codes,
+            entity_codes,
+            category_codes,
+            np.array([int(col) for col in year_cols], dtype=np.int64),
+            np.ascontiguousarray(matrix),
+            has_category='category' in df.columns,
+        )
+
+    @classmethod
+    def from_binary(cls, header: Dict, arrays: Dict[str, np.ndarray]) -> 'DatasetStore':
+        """
+        Builds a store over the mapped arrays of a .bin file or a shared
+        segment (see binary_dataset) without copying them.
+        """
+        derived = dict(arrays)
+        matrix = derived.pop('matrix')
+        has_category = 'category_codes' in derived
+        category_codes = (
+            derived.pop('category_codes')
+            if has_category
+            else np.full(len(matrix), ANY, dtype=np.int32)
+        )
+        strings = header['strings']
+        return cls(
+            strings.get('indicator', []),
+            strings.get('entity', []),
+            strings.get('category', []),
+            derived.pop('indicator_codes'),
+            derived.pop('entity_codes'),
+            category_codes,
+            np.asarray(header['years'], dtype=np.int64),
+            matrix,
+            has_category=has_category,
+            derived=derived,
+        )
+
+    def to_frame(self) -> pd.DataFrame:
+        """Wide DataFrame in the data_clean CSV layout."""
+        def names(table: List[str], codes: np.ndarray) -> List[Optional[str]]:
+            return [table[code] if code >= 0 else None for code in codes.tolist()]
+
+        columns: Dict[str, object] = {
+            'indicator': names(self.indicators, self.indicator_codes),
+            'entity': names(self.entities, self.entity_codes),
+        }
+        if self.has_category:
+            columns['category'] = names(self.categories, self.category_codes)
+        for pos, year in enumerate(self.year_axis.tolist()):
+            columns[str(year)] = np.asarray(self.matrix[:, pos])
+        return pd.DataFrame(columns)
+
+    def __len__(self) -> int:
+        return len(self.matrix)
+
+    def _code(self, lookup: Dict[str, int], name: Optional[str], skip) -> Optional[int]:
+        """Returns ANY when the filter is off and None when nothing can match."""
+        if not name or name in skip:
+            return ANY
+        return lookup.get(name)
+
+    def find_row(
+        self,
+        indicator: Optional[str] = None,
+        entity: Optional[str] = None,
+        category: Optional[str] = None,
+    ) -> Optional[int]:
+        ind = self._code(self._indicator_lookup, indicator, SKIP_INDICATORS)
+        ent = self._code(self._entity_lookup, entity, SKIP_ENTITIES)
+        cat = (
+            self._code(self._category_lookup, category, ())
+            if self.has_category
+            else ANY
+        )
+        if ind is None or ent is None or cat is None:
+            return None
+        keys = self.derived["index_keys"]
+        key = pack_key(ind, ent, cat)
+        pos = int(np.searchsorted(keys, key))
+        if pos < len(keys) and keys[pos] == key:
+            return int(self.derived["index_rows"][pos])
+        return None
+
+    def _group(
+        self, indicator: Optional[str], category: Optional[str]
+    ) -> Optional[int]:
+        """Position of the (indicator, category) group in group_keys."""
+        ind = self._code(self._indicator_lookup, indicator, SKIP_INDICATORS)
+        cat = (
+            self._code(self._category_lookup, category, ())
+            if self.has_category
+            else ANY
+        )
+        if ind is None or cat is None:
+            return None
+        keys = self.derived["group_keys"]
+        key = pack_key(ind, ANY, cat)
+        pos = int(np.searchsorted(keys, key))
+        return pos if pos < len(keys) and keys[pos] == key else None
+
+    def group_rows(
+        self, indicator: Optional[str] = None, category: Optional[str] = None
+    ) -> np.ndarray:
+        group = self._group(indicator, category)
+        if group is None:
+            return np.zeros(0, dtype=np.int64)
+        offsets = self.derived["group_offsets"]
+        return self.derived["group_rows"][offsets[group]:offsets[group + 1]]
+
+    def entity_map(
+        self, indicator: Optional[str] = None, category: Optional[str] = None
+    ) -> Optional[EntityYearMap]:
+        group = self._group(indicator, category)
+        if group is None:
+            return None
+        year_map = self._entity_maps.get(group)
+        if year_map is None:
+            derived = self.derived
+            start, stop = derived["map_entity_offsets"][group:group + 2].tolist()
+            shape = (len(self.year_axis), stop - start)
+            span = slice(start * shape[0], stop * shape[0])
+            year_map = EntityYearMap(
+                self.year_axis,
+                self.entities,
+                self._entity_lookup,
+                derived["map_entity_codes"][start:stop],
+                derived["map_values"][span].reshape(shape),
+                derived["map_finite"][span].reshape(shape),
+                derived["map_has_any"][group],
+                derived["map_prev_fill"][group],
+                derived["map_next_fill"][group],
+            )
+            self._entity_maps[group] = year_map
+        return year_map
+
+    def row_key(self, row: int) -> Tuple[Optional[str], Optional[str], Optional[str]]:
+        """(indicator, entity, category) names of a row; None where missing."""
+        def name(table: List[str], code: int) -> Optional[str]:
+            return table[code] if code >= 0 else None
+
+        return (
+            name(self.indicators, int(self.indicator_codes[row])),
+            name(self.entities, int(self.entity_codes[row])),
+            name(self.categories, int(self.category_codes[row])),
+        )
+
+    def series(self, row: int) -> Tuple[np.ndarray, np.ndarray]:
+        start, stop = self.offsets[row], self.offsets[row + 1]
+        return self.years[start:stop], self.values[start:stop]
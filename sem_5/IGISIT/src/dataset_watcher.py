@@ -0,0 +1,75 @@
+"""
+Background reload of changed datasets.
+
+DatasetWatcher polls the (mtime, size) of every watched CSV and reloads a
+file in its own thread once the version has been stable for one poll, so
+a file that is still being written is not parsed half-way.  The new
+snapshot is swapped in by DataLoader.reload; requests never wait for a
+parse.  Polling is used instead of inotify to stay dependency-free and to
+work on bind mounts and network filesystems, where inotify events are
+not delivered.
+"""
+
+import logging
+import threading
+from typing import Dict, Iterable, Optional, Tuple
+
+from .data_loader import DataLoader
+
+logger = logging.getLogger(__name__)
+
+
+class DatasetWatcher:
+    def __init__(self, loader: DataLoader, filenames: Iterable[str], interval: float = 2.0):
+        self.loader = loader
+        self.filenames = list(filenames)
+        self.interval = interval
+        self._pending: Dict[str, Tuple[int, int]] = {}
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def poll(self) -> None:
+        """One pass: loads missing datasets, reloads settled changes."""
+        for filename in self.filenames:
+            try:
+                version = self.loader.dataset_version(filename)
+            except FileNotFoundError:
+                self._pending.pop(filename, None)
+                continue
+
+            current = self.loader.snapshots.get(filename)
+            if current is not None and current.version == version:
+                self._pending.pop(filename, None)
+                continue
+            # First sight of a change: wait one interval for the writer.
+            if current is not None and self._pending.get(filename) != version:
+                self._pending[filename] = version
+                continue
+
+            self._pending.pop(filename, None)
+            try:
+                self.loader.reload(filename, version)
+                if current is not None:
+                    logger.info("Reloaded dataset %s", filename)
+            except Exception as exc:
+                # Keep serving the previous snapshot; retried next poll.
+                logger.warning("Failed to reload %s: %s", filename, exc)
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            self.poll()
+            self._stop.wait(self.interval)
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self.loader.watched = True
+        self._thread = threading.Thread(target=self._run, name="dataset-watcher", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.interval + 1)
+            self._thread = None
+        self.loader.watched = False
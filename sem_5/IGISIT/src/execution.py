@@ -0,0 +1,222 @@
+"""
+Execution layer for CPU-heavy endpoints.
+
+Work is sent to a bounded process pool so that model fitting never runs
+on the event loop or in Starlette's shared threadpool.  Admission control
+keeps at most ``max_in_flight`` jobs running, lets ``max_waiting`` more
+wait for up to ``wait_timeout`` seconds and rejects the rest at once with
+ExecutorSaturatedError, which the API turns into ``503 Retry-After``.
+Queued (batch) jobs wait in their own lane of ``max_batch_in_flight``
+slots first, so at most that many of them compete with interactive
+requests.  A slot is held until the job itself finishes, even when the
+request that started it has gone away.
+
+This module must not import numpy at the top level: it provides the pool
+initializer, which has to pin BLAS threads before numpy is loaded in the
+worker.
+"""
+
+import asyncio
+import math
+import multiprocessing
+import os
+import threading
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+BLAS_THREAD_VARS = (
+    'OMP_NUM_THREADS',
+    'OPENBLAS_NUM_THREADS',
+    'MKL_NUM_THREADS',
+    'VECLIB_MAXIMUM_THREADS',
+    'NUMEXPR_NUM_THREADS',
+)
+
+
+class ExecutorSaturatedError(RuntimeError):
+    def __init__(self, message: str, retry_after: int):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+def pin_blas_threads(threads: int) -> None:
+    for name in BLAS_THREAD_VARS:
+        os.environ[name] = str(threads)
+    try:
+        from threadpoolctl import threadpool_limits
+    except ImportError:
+        return
+    threadpool_limits(threads)
+
+
+class CpuExecutor:
+    def __init__(
+        self,
+        workers: Optional[int] = None,
+        max_in_flight: Optional[int] = None,
+        max_waiting: int = 16,
+        wait_timeout: float = 5.0,
+        blas_threads: int = 1,
+        max_batch_in_flight: Optional[int] = None,
+    ):
+        self.workers = workers or os.cpu_count() or 1
+        self.max_in_flight = max_in_flight or self.workers
+        # Batch jobs get half of the slots by default.
+        self.max_batch_in_flight = max_batch_in_flight or max(1, self.max_in_flight // 2)
+        self.max_waiting = max_waiting
+        self.wait_timeout = wait_timeout
+        self.blas_threads = blas_threads
+        self.retry_after = max(1, math.ceil(wait_timeout))
+        self.in_flight = 0
+        self.waiting = 0
+        self.rejected = 0
+        self.completed = 0
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._threads: Optional[ThreadPoolExecutor] = None
+        self._pool_lock = threading.Lock()
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._batch_slots: Optional[asyncio.Semaphore] = None
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        with self._pool_lock:
+            if self._pool is None:
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context('spawn'),
+                    initializer=pin_blas_threads,
+                    initargs=(self.blas_threads,),
+                )
+            return self._pool
+
+    def _get_threads(self) -> ThreadPoolExecutor:
+        with self._pool_lock:
+            if self._threads is None:
+                # Never queues: the slots bound the jobs to max_in_flight.
+                self._threads = ThreadPoolExecutor(
+                    max_workers=self.max_in_flight, thread_name_prefix='cpu-executor'
+                )
+            return self._threads
+
+    def _get_slots(self) -> asyncio.Semaphore:
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.max_in_flight)
+        return self._slots
+
+    def _get_batch_slots(self) -> asyncio.Semaphore:
+        if self._batch_slots is None:
+            self._batch_slots = asyncio.Semaphore(self.max_batch_in_flight)
+        return self._batch_slots
+
+    def _release(self, queued: bool) -> None:
+        self._get_slots().release()
+        if queued:
+            self._get_batch_slots().release()
+
+    def _finished(self, queued: bool) -> None:
+        self.in_flight -= 1
+        self.completed += 1
+        self._release(queued)
+
+    async def _execute(
+        self, executor: Callable[[], Executor], queued: bool, func: Callable, *args: Any
+    ) -> Any:
+        loop = asyncio.get_running_loop()
+        try:
+            future: Future = executor().submit(func, *args)
+        except BaseException:
+            self._release(queued)
+            raise
+        self.in_flight += 1
+
+        def finished(_: Future) -> None:
+            try:
+                loop.call_soon_threadsafe(self._finished, queued)
+            except RuntimeError:
+                # Event loop already closed (shutdown).
+                pass
+
+        # Cancelling the awaiting task does not stop a started job, so the
+        # slot is given back when the job itself is done.
+        future.add_done_callback(finished)
+        return await asyncio.wrap_future(future)
+
+    async def _admit(self, queued: bool) -> None:
+        """
+        Takes a slot.  Queued jobs first wait, without a limit, for one of
+        the batch lane's slots; the others raise ExecutorSaturatedError
+        when no slot frees up within the admission limits.
+        """
+        slots = self._get_slots()
+        if queued:
+            await self._get_batch_slots().acquire()
+            try:
+                await slots.acquire()
+            except BaseException:
+                self._get_batch_slots().release()
+                raise
+            return
+        if not slots.locked():
+            await slots.acquire()
+            return
+        if self.waiting >= self.max_waiting:
+            self.rejected += 1
+            raise ExecutorSaturatedError(
+                "Forecast workers are saturated", self.retry_after
+            )
+        self.waiting += 1
+        try:
+            await asyncio.wait_for(slots.acquire(), self.wait_timeout)
+        except asyncio.TimeoutError:
+            self.rejected += 1
+            raise ExecutorSaturatedError(
+                "Timed out waiting for a forecast worker", self.retry_after
+            )
+        finally:
+            self.waiting -= 1
+
+    async def run(self, func: Callable, *args: Any) -> Any:
+        """
+        Runs ``func(*args)`` in the pool or raises ExecutorSaturatedError
+        when no slot frees up within the admission limits.
+        """
+        await self._admit(queued=False)
+        return await self._execute(self._get_pool, False, func, *args)
+
+    async def run_queued(self, func: Callable, *args: Any) -> Any:
+        """
+        Like run() but waits in the batch lane without a limit; used for
+        batch jobs whose caller already expects a long-running response.
+        """
+        await self._admit(queued=True)
+        return await self._execute(self._get_pool, True, func, *args)
+
+    async def run_blocking(self, func: Callable, *args: Any, queued: bool = False) -> Any:
+        """
+        Runs ``func(*args)`` in a thread under the same admission limits;
+        for calls that block on other worker processes (the Prophet pool).
+        """
+        await self._admit(queued)
+        return await self._execute(self._get_threads, queued, func, *args)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "workers": self.workers,
+            "max_in_flight": self.max_in_flight,
+            "max_batch_in_flight": self.max_batch_in_flight,
+            "max_waiting": self.max_waiting,
+            "wait_timeout": self.wait_timeout,
+            "blas_threads": self.blas_threads,
+            "in_flight": self.in_flight,
+            "waiting": self.waiting,
+            "rejected": self.rejected,
+            "completed": self.completed,
+        }
+
+    def shutdown(self) -> None:
+        with self._pool_lock:
+            if self._pool is not None:
+                self._pool.shutdown(wait=False, cancel_futures=True)
+                self._pool = None
+            if self._threads is not None:
+                self._threads.shutdown(wait=False, cancel_futures=True)
+                self._threads = None
@@ -0,0 +1,181 @@
+"""
+On-disk store of precomputed forecasts (see scripts/precompute_forecasts.py).
+
+Layout of the store directory:
+    index.json           - dataset content hashes, the name of the arrays
+                           file and one entry per series
+    forecasts-<id>.npz   - flat arrays of historical and forecast points;
+                           every series owns an [offset, offset + count) slice
+
+A new arrays file is written under a fresh name before index.json is
+swapped, so readers never combine an index with the wrong arrays.
+"""
+
+import glob
+import json
+import os
+import threading
+import uuid
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+STORE_FORMAT = 1
+
+SeriesKey = Tuple[str, Optional[str], Optional[str], Optional[str], int]
+
+
+class ForecastStore:
+    def __init__(self, path: str):
+        self.path = path
+        self.index_path = os.path.join(path, 'index.json')
+        self._lock = threading.Lock()
+        self._mtime: Optional[int] = None
+        # (dataset hashes, series entries, arrays), swapped as one reference.
+        self._state: Tuple[Dict[str, str], Dict[SeriesKey, Dict], Dict[str, np.ndarray]] = (
+            {}, {}, {}
+        )
+
+    def _refresh(self) -> None:
+        try:
+            mtime = os.stat(self.index_path).st_mtime_ns
+        except FileNotFoundError:
+            mtime = None
+        if mtime == self._mtime:
+            return
+        with self._lock:
+            if mtime == self._mtime:
+                return
+            if mtime is None:
+                hashes, series, arrays = {}, {}, {}
+            else:
+                with open(self.index_path, encoding='utf-8') as fh:
+                    index = json.load(fh)
+                if index.get('format') != STORE_FORMAT:
+                    hashes, series, arrays = {}, {}, {}
+                else:
+                    arrays_path = os.path.join(self.path, index['arrays'])
+                    try:
+                        with np.load(arrays_path) as npz:
+                            arrays = {name: npz[name] for name in npz.files}
+                    except FileNotFoundError:
+                        # Replaced while we were reading; pick it up next time.
+                        return
+                    hashes = index['datasets']
+                    series = {
+                        tuple(entry['key']): entry for entry in index['series']
+                    }
+            self._state = (hashes, series, arrays)
+            self._mtime = mtime
+
+    def __len__(self) -> int:
+        self._refresh()
+        return len(self._state[1])
+
+    def get(
+        self,
+        filename: str,
+        content_hash: str,
+        indicator: Optional[str],
+        entity: Optional[str],
+        category: Optional[str],
+        periods: int,
+    ) -> Optional[Dict]:
+        """
+        Returns a forecast payload, or None when the series is missing or
+        was computed from a different version of the dataset.
+        """
+        self._refresh()
+        hashes, series, arrays = self._state
+        if hashes.get(filename) != content_hash:
+            return None
+        entry = series.get((filename, indicator, entity, category, periods))
+        if entry is None:
+            return None
+
+        h_start, h_stop = entry['historical']
+        f_start, f_stop = entry['forecast']
+        return {
+            "historical": [
+                {"year": year, "value": value}
+                for year, value in zip(
+                    arrays['hist_years'][h_start:h_stop].tolist(),
+                    arrays['hist_values'][h_start:h_stop].tolist(),
+                )
+            ],
+            "forecast": [
+                {"year": year, "forecast": forecast, "lower": lower, "upper": upper}
+                for year, forecast, lower, upper in zip(
+                    arrays['fc_years'][f_start:f_stop].tolist(),
+                    arrays['fc_forecast'][f_start:f_stop].tolist(),
+                    arrays['fc_lower'][f_start:f_stop].tolist(),
+                    arrays['fc_upper'][f_start:f_stop].tolist(),
+                )
+            ],
+            "method": entry['method'],
+        }
+
+    @staticmethod
+    def write(
+        path: str,
+        dataset_hashes: Dict[str, str],
+        results: Iterable[Tuple[SeriesKey, Dict]],
+    ) -> int:
+        """
+        Atomically replaces the store with ``results`` (key, payload) pairs,
+        where payloads have the /api/forecast response shape.
+        """
+        os.makedirs(path, exist_ok=True)
+        columns: Dict[str, List] = {
+            name: []
+            for name in (
+                'hist_years', 'hist_values',
+                'fc_years', 'fc_forecast', 'fc_lower', 'fc_upper',
+            )
+        }
+        series = []
+        for key, payload in results:
+            h_start = len(columns['hist_years'])
+            for point in payload['historical']:
+                columns['hist_years'].append(point['year'])
+                columns['hist_values'].append(point['value'])
+            f_start = len(columns['fc_years'])
+            for point in payload['forecast']:
+                columns['fc_years'].append(point['year'])
+                columns['fc_forecast'].append(point['forecast'])
+                columns['fc_lower'].append(point['lower'])
+                columns['fc_upper'].append(point['upper'])
+            series.append(
+                {
+                    "key": list(key),
+                    "method": payload['method'],
+                    "historical": [h_start, len(columns['hist_years'])],
+                    "forecast": [f_start, len(columns['fc_years'])],
+                }
+            )
+
+        arrays = {
+            name: np.asarray(values, dtype=np.int32 if name.endswith('years') else np.float64)
+            for name, values in columns.items()
+        }
+        arrays_name = f"forecasts-{uuid.uuid4().hex[:12]}.npz"
+        np.savez_compressed(os.path.join(path, arrays_name), **arrays)
+
+        index_tmp = os.path.join(path, 'index.json.tmp')
+        with open(index_tmp, 'w', encoding='utf-8') as fh:
+            json.dump(
+                {
+                    "format": STORE_FORMAT,
+                    "arrays": arrays_name,
+                    "datasets": dataset_hashes,
+                    "series": series,
+                },
+                fh,
+                ensure_ascii=False,
+            )
+        os.replace(index_tmp, os.path.join(path, 'index.json'))
+
+        for stale in glob.glob(os.path.join(path, 'forecasts-*.npz')):
+            if os.path.basename(stale) != arrays_name:
+                os.remove(stale)
+        return len(series)
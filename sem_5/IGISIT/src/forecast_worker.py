@@ -0,0 +1,140 @@
+"""
+Process-pool entry points for CPU-heavy forecasting.
+
+Functions here receive plain Python lists and return JSON-ready dicts so
+that only small payloads cross the process boundary.
+"""
+
+import time
+from typing import Callable, Dict, List, Tuple
+
+import pandas as pd
+
+from .forecasting import PROPHET_FALLBACK_METHOD, ProphetDeferred, TimeSeriesForecaster
+
+_forecasters: Dict[bool, TimeSeriesForecaster] = {}
+
+
+def _defer_prophet(df: pd.DataFrame, periods: int) -> pd.DataFrame:
+    raise ProphetDeferred("Prophet fallback is left to the caller")
+
+
+def _get_forecaster(prophet_fallback: bool) -> TimeSeriesForecaster:
+    if prophet_fallback not in _forecasters:
+        _forecasters[prophet_fallback] = TimeSeriesForecaster(
+            prophet_runner=None if prophet_fallback else _defer_prophet
+        )
+    return _forecasters[prophet_fallback]
+
+
+def _series_frame(years: List[int], values: List[float]) -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            'year': pd.to_datetime(years, format='%Y'),
+            'value': values,
+        }
+    )
+
+
+def forecast_shapes(
+    years: List[int], values: List[float], forecast_df: pd.DataFrame, method: str
+) -> Dict[str, Dict]:
+    """
+    The API payload in both response formats, built from the same column
+    lists: "rows" (one dict per year) and "columnar" (one list per field).
+    """
+    if forecast_df.empty:
+        raise ValueError("Forecast failed to generate")
+
+    forecast_df = forecast_df.dropna(subset=['year', 'forecast', 'lower', 'upper'])
+    historical = {
+        "years": [int(year) for year in years],
+        "values": [float(value) for value in values],
+    }
+    forecast = {"years": forecast_df['year'].dt.year.to_numpy().tolist()}
+    for column in ('forecast', 'lower', 'upper'):
+        forecast[column] = forecast_df[column].to_numpy(dtype=float).tolist()
+    return {
+        "rows": {
+            "historical": [
+                {"year": year, "value": value}
+                for year, value in zip(historical["years"], historical["values"])
+            ],
+            "forecast": [
+                {"year": year, "forecast": value, "lower": lower, "upper": upper}
+                for year, value, lower, upper in zip(
+                    forecast["years"], forecast["forecast"], forecast["lower"], forecast["upper"]
+                )
+            ],
+            "method": method,
+        },
+        "columnar": {"historical": historical, "forecast": forecast, "method": method},
+    }
+
+
+def build_forecast(
+    forecaster: TimeSeriesForecaster, years: List[int], values: List[float], periods: int
+) -> Dict[str, Dict]:
+    """Fits the series; returns both shapes (see forecast_shapes)."""
+    forecast_df, method = forecaster.auto_forecast(_series_frame(years, values), periods=periods)
+    return forecast_shapes(years, values, forecast_df, method)
+
+
+def prophet_forecast(
+    runner: Callable[..., pd.DataFrame],
+    years: List[int],
+    values: List[float],
+    periods: int,
+    **runner_kwargs,
+) -> Dict[str, Dict]:
+    """
+    Prophet fallback for a series whose polynomial fit raised
+    ProphetDeferred: the cleaned series goes straight to ``runner``
+    (ProphetWorkerPool.forecast) without repeating the polynomial sweep.
+    """
+    ts_data = _series_frame(years, values).dropna()
+    forecast_df = runner(ts_data, periods, **runner_kwargs)
+    return forecast_shapes(years, values, forecast_df, PROPHET_FALLBACK_METHOD)
+
+
+def columnar_forecast(payload: Dict) -> Dict:
+    """
+    Columnar shape of a rows payload; only for payloads that exist as rows
+    alone (the precomputed forecast store).
+    """
+    historical = payload["historical"]
+    forecast = payload["forecast"]
+    return {
+        "historical": {
+            "years": [row["year"] for row in historical],
+            "values": [row["value"] for row in historical],
+        },
+        "forecast": {
+            "years": [row["year"] for row in forecast],
+            **{
+                field: [row[field] for row in forecast]
+                for field in ("forecast", "lower", "upper")
+            },
+        },
+        "method": payload["method"],
+    }
+
+
+def forecast_series(
+    years: List[int], values: List[float], periods: int, prophet_fallback: bool = True
+) -> Dict:
+    """
+    Rows payload of the forecast.  With prophet_fallback=False a polynomial
+    failure raises ProphetDeferred instead of fitting Prophet inside the
+    pool worker.
+    """
+    return build_forecast(_get_forecaster(prophet_fallback), years, values, periods)["rows"]
+
+
+def timed_forecast_series(
+    years: List[int], values: List[float], periods: int, prophet_fallback: bool = True
+) -> Tuple[Dict[str, Dict], float]:
+    """Both shapes of the forecast plus the fit time measured inside the worker."""
+    start = time.perf_counter()
+    shapes = build_forecast(_get_forecaster(prophet_fallback), years, values, periods)
+    return shapes, time.perf_counter() - start
@@ -1,8 +1,6 @@
 import pandas as pd
 import numpy as np
-from prophet import Prophet
 from sklearn.linear_model import Ridge
-from sklearn.preprocessing import PolynomialFeatures
 from sklearn.pipeline import make_pipeline
 from sklearn.kernel_ridge import KernelRidge
 
@@ -11,18 +9,122 @@ try:
 except ImportError:  # pragma: no cover
     SplineTransformer = None
 from sklearn.metrics import mean_squared_error
-from typing import Tuple
+from typing import Callable, List, Optional, Tuple
 import warnings
 
 warnings.filterwarnings('ignore')
 
 
+class ProphetDeferred(Exception):
+    """
+    Raised by a prophet_runner that leaves the Prophet fallback to the
+    caller (e.g. a pool worker handing it back to the API process).
+    """
+
+
+class ProphetBusyError(RuntimeError):
+    """
+    Raised by a prophet_runner that cannot take the job right now (pool
+    disabled or its queue full); the API answers 503 instead of failing.
+    """
+
+
+# Method label of forecasts that fell back to Prophet.
+PROPHET_FALLBACK_METHOD = "Prophet (fallback after polynomial failure)"
+
+# Prefix of the method label returned by auto_forecast -> model kind.
+MODEL_KINDS = (
+    ("Polynomial Regression", "poly"),
+    ("Kernel Ridge", "kernel"),
+    ("Spline Ridge", "spline"),
+    ("Prophet", "prophet"),
+)
+
+
+def model_kind(method: str) -> str:
+    for prefix, kind in MODEL_KINDS:
+        if method.startswith(prefix):
+            return kind
+    return "unknown"
+
+
+class PolynomialRidgeModel:
+    """
+    Fitted equivalent of make_pipeline(PolynomialFeatures(degree,
+    include_bias=False), Ridge(alpha)) for a single input column.
+    """
+
+    def __init__(self, degree: int, coef: np.ndarray, intercept: float):
+        self.degree = degree
+        self.coef = coef
+        self.intercept = intercept
+
+    def predict(self, X: np.ndarray) -> np.ndarray:
+        x = np.asarray(X, dtype=float).reshape(-1)
+        powers = x[:, None] ** np.arange(1, self.degree + 1)
+        return powers @ self.coef + self.intercept
+
+
+def fit_polynomial_ridge_grid(
+    x: np.ndarray, y: np.ndarray, degrees: List[int], alphas: List[float]
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Solves every (degree, alpha) polynomial ridge candidate at once.
+
+    The Vandermonde matrix of the highest degree is built and centred once;
+    its Gram matrix holds the normal equations of every lower degree as a
+    leading block.  Each candidate block is padded with the identity to a
+    common size, so one batched solve gives all coefficient vectors (the
+    padded coefficients are exactly zero).  This is the same system
+    sklearn's Ridge solves with its cholesky solver.
+
+    Returns (coefs, intercepts, in_sample) with shapes
+    (len(degrees), len(alphas), max_degree), (len(degrees), len(alphas))
+    and (len(degrees), len(alphas), len(x)).
+    """
+    x = np.asarray(x, dtype=float).reshape(-1)
+    y = np.asarray(y, dtype=float).reshape(-1)
+    max_deg = max(degrees)
+    vander = x[:, None] ** np.arange(1, max_deg + 1)
+    x_offset = vander.mean(axis=0)
+    y_offset = y.mean()
+    centred = vander - x_offset
+    gram = centred.T @ centred
+    rhs = centred.T @ (y - y_offset)
+
+    degree_arr = np.asarray(degrees)
+    alpha_arr = np.asarray(alphas, dtype=float)
+    active = np.arange(max_deg)[None, :] < degree_arr[:, None]
+    block = active[:, :, None] & active[:, None, :]
+    eye = np.eye(max_deg)
+
+    systems = np.where(block, gram, eye)[:, None, :, :] + (
+        alpha_arr[None, :, None, None] * (eye * active[:, None, :])[:, None, :, :]
+    )
+    targets = np.where(active, rhs, 0.0)[:, None, :, None]
+    targets = np.broadcast_to(targets, systems.shape[:-1] + (1,))
+    coefs = np.linalg.solve(systems, targets)[..., 0]
+
+    intercepts = y_offset - coefs @ x_offset
+    in_sample = np.einsum('nk,dak->dan', vander, coefs) + intercepts[..., None]
+    return coefs, intercepts, in_sample
+
+
 class TimeSeriesForecaster:
-    def __init__(self):
+    def __init__(
+        self,
+        prophet_runner: Optional[Callable[[pd.DataFrame, int], pd.DataFrame]] = None,
+    ):
         self.model = None
         self.method = None
+        # Runs the Prophet fallback, e.g. ProphetWorkerPool.forecast;
+        # defaults to fitting in the calling process.
+        self.prophet_runner = prophet_runner or self.forecast_prophet
 
     def forecast_prophet(self, df: pd.DataFrame, periods: int = 10) -> pd.DataFrame:
+        # Imported lazily: loading Stan is expensive and only the fallback needs it.
+        from prophet import Prophet
+
         df_prophet = df.copy()
 
         if 'year' not in df_prophet.columns or 'value' not in df_prophet.columns:
@@ -101,19 +203,25 @@ class TimeSeriesForecaster:
         value_scale = max(float(np.std(y)), float(np.mean(np.abs(y))), 1e-6)
         best_poly = None
         alpha_grid = [1.0, 0.3, 0.1, 0.03]
-        for degree in degrees:
-            for alpha in alpha_grid:
-                model = make_pipeline(
-                    PolynomialFeatures(degree=degree, include_bias=False),
-                    Ridge(alpha=alpha),
-                )
-                label = f"Polynomial Regression (deg={degree}, α={alpha})"
-                candidates.append(('poly', degree, model, label))
+        try:
+            coefs, intercepts, in_sample = fit_polynomial_ridge_grid(
+                X, y, degrees, alpha_grid
+            )
+        except np.linalg.LinAlgError:
+            coefs = None
+        if coefs is not None:
+            for d_idx, degree in enumerate(degrees):
+                for a_idx, alpha in enumerate(alpha_grid):
+                    model = PolynomialRidgeModel(
+                        degree, coefs[d_idx, a_idx, :degree], intercepts[d_idx, a_idx]
+                    )
+                    label = f"Polynomial Regression (deg={degree}, α={alpha})"
+                    candidates.append(('poly', degree, model, label, in_sample[d_idx, a_idx]))
 
         if len(df_clean) >= 4:
             for gamma in [0.5, 1.0, 2.0, 5.0]:
                 kr = KernelRidge(alpha=0.5, kernel='rbf', gamma=gamma)
-                candidates.append(('kernel', None, kr, f"Kernel Ridge (gamma={gamma})"))
+                candidates.append(('kernel', None, kr, f"Kernel Ridge (gamma={gamma})", None))
 
         if SplineTransformer is not None and len(df_clean) >= 4:
             knots = min(6, len(df_clean))
@@ -121,7 +229,7 @@ class TimeSeriesForecaster:
                 SplineTransformer(n_knots=knots, degree=3, include_bias=False),
                 Ridge(alpha=0.1),
             )
-            candidates.append(('spline', None, spline_model, f"Spline Ridge (knots={knots})"))
+            candidates.append(('spline', None, spline_model, f"Spline Ridge (knots={knots})", None))
 
         best_model = None
         best_label = ""
@@ -129,12 +237,13 @@ class TimeSeriesForecaster:
         best_in_sample = None
         best_meta = {"kind": None, "degree": None, "curvature": 0.0}
 
-        for kind, degree, model, label in candidates:
-            try:
-                model.fit(X, y)
-            except Exception:
-                continue
-            preds = model.predict(X).reshape(-1)
+        for kind, degree, model, label, preds in candidates:
+            if preds is None:
+                try:
+                    model.fit(X, y)
+                except Exception:
+                    continue
+                preds = model.predict(X).reshape(-1)
             error = mean_squared_error(y, preds)
             curvature_metric = 0.0
             if len(preds) >= 3:
@@ -263,8 +372,10 @@ class TimeSeriesForecaster:
 
         if forecast_df is None or forecast_df.empty:
             try:
-                forecast_df = self.forecast_prophet(df_clean, periods)
-                method = "Prophet (fallback after polynomial failure)"
+                forecast_df = self.prophet_runner(df_clean, periods)
+                method = PROPHET_FALLBACK_METHOD
+            except (ProphetDeferred, ProphetBusyError):
+                raise
             except Exception as prophet_error:
                 fallback_reason = f"Polynomial error: {poly_error}; Prophet error: {str(prophet_error)}"
                 raise ValueError(f"Ошибка прогнозирования: {fallback_reason}")
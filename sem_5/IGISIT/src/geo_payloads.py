@@ -0,0 +1,188 @@
+"""
+Pre-serialized responses for the static geo endpoints.
+
+The river/lake structures in src/config.py and the GeoJSON modules never
+change while the server runs, so their JSON is rendered once, compressed
+with gzip (and brotli when the ``brotli`` package is installed) and served
+as raw bytes with a strong ETag.  Objects derived from the same data
+(e.g. simplification levels) are built first, so payload builders can use
+them.  The watched modules are stat-ed at most once per ``check_interval``
+seconds; when one of them changes on disk the modules are reloaded and every
+derived object and payload is rebuilt.
+"""
+
+import gzip
+import hashlib
+import importlib
+import json
+import logging
+import os
+import threading
+import time
+from types import ModuleType
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from starlette.requests import Request
+from starlette.responses import Response
+
+try:
+    import brotli
+except ImportError:  # optional, gzip is always available
+    brotli = None
+
+logger = logging.getLogger(__name__)
+
+JSON_MEDIA_TYPE = "application/json"
+
+
+class StaticPayload:
+    def __init__(self, data: Any, compresslevel: int = 9, quality: int = 11):
+        """
+        ``compresslevel`` is the gzip level and ``quality`` the brotli one;
+        lower both for payloads built on a request path.
+        """
+        # Same encoding as FastAPI's JSONResponse.
+        self.body = json.dumps(
+            data, ensure_ascii=False, allow_nan=False, separators=(",", ":")
+        ).encode("utf-8")
+        digest = hashlib.sha256(self.body).hexdigest()[:32]
+        self.variants: Dict[str, Tuple[bytes, str]] = {
+            "identity": (self.body, f'"{digest}"'),
+            "gzip": (
+                gzip.compress(self.body, compresslevel=compresslevel, mtime=0),
+                f'"{digest}-gz"',
+            ),
+        }
+        if brotli is not None:
+            self.variants["br"] = (
+                brotli.compress(self.body, quality=quality),
+                f'"{digest}-br"',
+            )
+        self.etags = {etag for _, etag in self.variants.values()}
+
+
+def accepted_encodings(header: Optional[str]) -> Dict[str, float]:
+    accepted: Dict[str, float] = {}
+    for part in (header or "").split(","):
+        name, _, params = part.strip().partition(";")
+        if not name:
+            continue
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        accepted[name.strip().lower()] = quality
+    return accepted
+
+
+def etag_matches(header: Optional[str], etags) -> bool:
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    # If-None-Match uses weak comparison, so W/"x" matches "x".
+    candidates = {tag.strip().removeprefix("W/") for tag in header.split(",")}
+    return not candidates.isdisjoint(etags)
+
+
+class GeoPayloadCache:
+    def __init__(
+        self,
+        modules: Sequence[ModuleType],
+        builders: Dict[str, Callable[[], Any]],
+        max_age: int = 300,
+        check_interval: float = 1.0,
+        derived: Optional[Dict[str, Callable[[], Any]]] = None,
+    ):
+        self.modules = list(modules)
+        self.builders = builders
+        self.derived_builders = derived or {}
+        self.cache_control = f"public, max-age={max_age}"
+        self.check_interval = check_interval
+        self.rebuilds = 0
+        self._payloads: Dict[str, StaticPayload] = {}
+        self._derived: Dict[str, Any] = {}
+        self._mtimes: List[Optional[int]] = []
+        self._checked_at = 0.0
+        # Reentrant: payload builders read derived objects during build().
+        self._lock = threading.RLock()
+
+    def _module_mtimes(self) -> List[Optional[int]]:
+        mtimes: List[Optional[int]] = []
+        for module in self.modules:
+            try:
+                mtimes.append(os.stat(module.__file__).st_mtime_ns)
+            except (OSError, TypeError):
+                mtimes.append(None)
+        return mtimes
+
+    def build(self) -> None:
+        with self._lock:
+            mtimes = self._module_mtimes()
+            if self._payloads and mtimes != self._mtimes:
+                try:
+                    # Reload in the given order so dependants see fresh values.
+                    for module in self.modules:
+                        importlib.reload(module)
+                except Exception:
+                    # Keep serving the old payloads until the next edit.
+                    logger.exception("Reloading geo config modules failed")
+                    self._mtimes = mtimes
+                    return
+                logger.info("Geo config modules changed, payloads rebuilt")
+            self._mtimes = mtimes
+            self._checked_at = time.monotonic()
+            self._derived = {
+                key: builder() for key, builder in self.derived_builders.items()
+            }
+            self._payloads = {
+                key: StaticPayload(builder()) for key, builder in self.builders.items()
+            }
+            self.rebuilds += 1
+
+    def _refresh(self) -> None:
+        now = time.monotonic()
+        if not self._payloads and not self._derived:
+            self.build()
+        elif now - self._checked_at >= self.check_interval:
+            self._checked_at = now
+            if self._module_mtimes() != self._mtimes:
+                self.build()
+
+    def get(self, key: str) -> StaticPayload:
+        self._refresh()
+        return self._payloads[key]
+
+    def derived(self, key: str) -> Any:
+        self._refresh()
+        return self._derived[key]
+
+    def response(self, request: Request, key: str) -> Response:
+        return payload_response(request, self.get(key), self.cache_control)
+
+
+def payload_response(request: Request, payload: StaticPayload, cache_control: str) -> Response:
+    """Picks the best accepted encoding and answers If-None-Match with 304."""
+    accepted = accepted_encodings(request.headers.get("accept-encoding"))
+    encoding = "identity"
+    for candidate in ("br", "gzip"):
+        if candidate in payload.variants and accepted.get(
+            candidate, accepted.get("*", 0.0)
+        ) > 0:
+            encoding = candidate
+            break
+    body, etag = payload.variants[encoding]
+    headers = {
+        "ETag": etag,
+        "Cache-Control": cache_control,
+        "Vary": "Accept-Encoding",
+    }
+
+    if etag_matches(request.headers.get("if-none-match"), payload.etags):
+        return Response(status_code=304, headers=headers)
+    if encoding != "identity":
+        headers["Content-Encoding"] = encoding
+    return Response(content=body, media_type=JSON_MEDIA_TYPE, headers=headers)
@@ -0,0 +1,273 @@
+"""
+Zoom-dependent simplification and viewport clipping of GeoJSON layers.
+
+SimplifiedCollection runs Douglas-Peucker once per line or ring at
+tolerance zero and records for every vertex the largest tolerance at which
+it survives.  Simplifying for a zoom level is then a single comparison per
+vertex and gives exactly the Douglas-Peucker result for that tolerance.
+Clipping uses Liang-Barsky for lines and Sutherland-Hodgman for polygon
+rings.  Coordinates are [lon, lat] in degrees, bboxes are
+(min_lon, min_lat, max_lon, max_lat).
+"""
+
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+BBox = Tuple[float, float, float, float]
+
+MAX_ZOOM = 18
+# Vertices closer than this many screen pixels to the simplified line are
+# dropped (a 256 px tile spans 360 / 2**zoom degrees).
+PIXEL_TOLERANCE = 1.0
+
+
+def tolerance_for_zoom(zoom: int) -> float:
+    return PIXEL_TOLERANCE * 360.0 / (256 * 2 ** zoom)
+
+
+def parse_bbox(text: str) -> BBox:
+    try:
+        parts = [float(part) for part in text.split(",")]
+    except ValueError:
+        parts = []
+    if len(parts) != 4 or not all(np.isfinite(parts)):
+        raise ValueError("bbox must be min_lon,min_lat,max_lon,max_lat")
+    min_lon, min_lat, max_lon, max_lat = parts
+    if min_lon > max_lon or min_lat > max_lat:
+        raise ValueError("bbox minimum exceeds maximum")
+    return min_lon, min_lat, max_lon, max_lat
+
+
+def vertex_importance(points: np.ndarray) -> np.ndarray:
+    """
+    Largest Douglas-Peucker tolerance at which each vertex is still kept;
+    endpoints are always kept.
+    """
+    count = len(points)
+    importance = np.full(count, np.inf)
+    if count <= 2:
+        return importance
+    importance[1:-1] = 0.0
+    stack = [(0, count - 1, np.inf)]
+    while stack:
+        start, end, ceiling = stack.pop()
+        if end - start < 2:
+            continue
+        inner = points[start + 1:end]
+        origin = points[start]
+        direction = points[end] - origin
+        length = np.hypot(direction[0], direction[1])
+        offsets = inner - origin
+        if length == 0:
+            distances = np.hypot(offsets[:, 0], offsets[:, 1])
+        else:
+            distances = np.abs(
+                direction[0] * offsets[:, 1] - direction[1] * offsets[:, 0]
+            ) / length
+        split = int(np.argmax(distances))
+        # A vertex can only survive while the split that exposed it does.
+        value = min(float(distances[split]), ceiling)
+        middle = start + 1 + split
+        importance[middle] = value
+        stack.append((start, middle, value))
+        stack.append((middle, end, value))
+    return importance
+
+
+def simplify(points: np.ndarray, importance: np.ndarray, tolerance: float,
+             min_points: int = 2) -> np.ndarray:
+    keep = importance > tolerance
+    if keep.sum() < min_points:
+        keep = np.zeros(len(points), dtype=bool)
+        keep[np.argsort(-importance, kind="stable")[:min_points]] = True
+    return points[keep]
+
+
+def liang_barsky(start: np.ndarray, delta: np.ndarray, bbox: BBox):
+    """
+    Parameters t0 <= t1 of the part of every segment start + t * delta
+    (t in [0, 1]) inside bbox, and the mask of segments that touch it.
+    """
+    min_lon, min_lat, max_lon, max_lat = bbox
+    p = np.stack([-delta[:, 0], delta[:, 0], -delta[:, 1], delta[:, 1]], axis=1)
+    q = np.stack(
+        [
+            start[:, 0] - min_lon,
+            max_lon - start[:, 0],
+            start[:, 1] - min_lat,
+            max_lat - start[:, 1],
+        ],
+        axis=1,
+    )
+    with np.errstate(divide="ignore", invalid="ignore"):
+        ratio = q / p
+    t0 = np.where(p < 0, ratio, 0.0).max(axis=1)
+    t1 = np.where(p > 0, ratio, 1.0).min(axis=1)
+    rejected = ((p == 0) & (q < 0)).any(axis=1)
+    return t0, t1, ~rejected & (t0 <= t1)
+
+
+def clip_line(points: np.ndarray, bbox: BBox) -> List[np.ndarray]:
+    """Parts of a polyline inside bbox (Liang-Barsky on every segment)."""
+    if len(points) < 2:
+        return []
+    start = points[:-1]
+    delta = points[1:] - start
+    t0, t1, visible = liang_barsky(start, delta, bbox)
+
+    parts: List[np.ndarray] = []
+    current: List[np.ndarray] = []
+    previous = -2
+    for idx in np.flatnonzero(visible):
+        head = start[idx] + t0[idx] * delta[idx]
+        tail = start[idx] + t1[idx] * delta[idx]
+        continues = previous == idx - 1 and t1[previous] == 1.0 and t0[idx] == 0.0
+        if not continues:
+            if len(current) >= 2:
+                parts.append(np.array(current))
+            current = [head]
+        current.append(tail)
+        previous = idx
+    if len(current) >= 2:
+        parts.append(np.array(current))
+    return parts
+
+
+def clip_ring(points: np.ndarray, bbox: BBox) -> Optional[np.ndarray]:
+    """Closed ring clipped to bbox (Sutherland-Hodgman), None if empty."""
+    ring = points[:-1] if len(points) > 1 and np.array_equal(points[0], points[-1]) else points
+    min_lon, min_lat, max_lon, max_lat = bbox
+    edges = ((0, min_lon, 1.0), (0, max_lon, -1.0), (1, min_lat, 1.0), (1, max_lat, -1.0))
+    for axis, limit, sign in edges:
+        if len(ring) == 0:
+            return None
+        inside = sign * (ring[:, axis] - limit) >= 0
+        previous = np.roll(ring, 1, axis=0)
+        previous_inside = np.roll(inside, 1)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            # Only edges that cross the limit are used, those never divide by 0.
+            t = (limit - previous[:, axis]) / (ring[:, axis] - previous[:, axis])
+            crossing = previous + t[:, None] * (ring - previous)
+        crossing[:, axis] = limit
+        # For every vertex: the crossing into/out of the half-plane, then
+        # the vertex itself when it is inside.
+        slots = np.stack([crossing, ring], axis=1).reshape(-1, 2)
+        valid = np.stack([inside != previous_inside, inside], axis=1).reshape(-1)
+        ring = slots[valid]
+    if len(ring) < 3:
+        return None
+    return np.vstack([ring, ring[:1]])
+
+
+def _bbox_of(arrays: List[np.ndarray]) -> BBox:
+    stacked = np.vstack(arrays)
+    return (
+        float(stacked[:, 0].min()),
+        float(stacked[:, 1].min()),
+        float(stacked[:, 0].max()),
+        float(stacked[:, 1].max()),
+    )
+
+
+def _intersects(a: BBox, b: BBox) -> bool:
+    return a[0] <= b[2] and b[0] <= a[2] and a[1] <= b[3] and b[1] <= a[3]
+
+
+class _Feature:
+    def __init__(self, feature: Dict):
+        geometry = feature["geometry"]
+        self.properties = feature.get("properties", {})
+        self.kind = geometry["type"]
+        coordinates = geometry["coordinates"]
+        if self.kind == "Point":
+            polygons = [[[coordinates]]]
+        elif self.kind in ("LineString", "MultiPoint"):
+            polygons = [[coordinates]]
+        elif self.kind in ("MultiLineString", "Polygon"):
+            polygons = [coordinates]
+        elif self.kind == "MultiPolygon":
+            polygons = coordinates
+        else:
+            raise ValueError(f"Unsupported geometry type: {self.kind}")
+        # Uniform layout: polygons -> rings/lines -> (points, importance).
+        self.parts = [
+            [
+                (points, vertex_importance(points))
+                for points in (np.asarray(line, dtype=float) for line in lines)
+            ]
+            for lines in polygons
+        ]
+        self.bbox = _bbox_of([points for lines in self.parts for points, _ in lines])
+
+    def render(self, tolerance: Optional[float], bbox: Optional[BBox]) -> Optional[Dict]:
+        if bbox is not None and not _intersects(self.bbox, bbox):
+            return None
+        if self.kind in ("Point", "MultiPoint"):
+            points = self.parts[0][0][0]
+            if bbox is not None:
+                inside = (
+                    (points[:, 0] >= bbox[0]) & (points[:, 0] <= bbox[2])
+                    & (points[:, 1] >= bbox[1]) & (points[:, 1] <= bbox[3])
+                )
+                points = points[inside]
+                if not len(points):
+                    return None
+            if self.kind == "Point":
+                return self._feature("Point", points[0].tolist())
+            return self._feature("MultiPoint", points.tolist())
+
+        polygonal = self.kind in ("Polygon", "MultiPolygon")
+        shapes = []
+        for lines in self.parts:
+            shape = []
+            for ring_idx, (points, importance) in enumerate(lines):
+                if tolerance is not None:
+                    points = simplify(points, importance, tolerance, 4 if polygonal else 2)
+                if not polygonal:
+                    shape.extend(clip_line(points, bbox) if bbox is not None else [points])
+                    continue
+                clipped = clip_ring(points, bbox) if bbox is not None else points
+                if clipped is None:
+                    if ring_idx == 0:
+                        break  # exterior ring is gone, so are the holes
+                    continue
+                shape.append(clipped)
+            if shape:
+                shapes.append([points.tolist() for points in shape])
+
+        if not shapes:
+            return None
+        if polygonal:
+            if len(shapes) == 1:
+                return self._feature("Polygon", shapes[0])
+            return self._feature("MultiPolygon", shapes)
+        lines = [line for shape in shapes for line in shape]
+        if len(lines) == 1:
+            return self._feature("LineString", lines[0])
+        return self._feature("MultiLineString", lines)
+
+    def _feature(self, kind: str, coordinates) -> Dict:
+        return {
+            "type": "Feature",
+            "properties": self.properties,
+            "geometry": {"type": kind, "coordinates": coordinates},
+        }
+
+
+class SimplifiedCollection:
+    def __init__(self, geojson: Dict):
+        self.features = [_Feature(feature) for feature in geojson.get("features", [])]
+
+    def render(self, zoom: Optional[int] = None, bbox: Optional[BBox] = None) -> Dict:
+        """
+        FeatureCollection simplified for ``zoom`` (full resolution when
+        None) and clipped to ``bbox`` when given.
+        """
+        tolerance = None if zoom is None else tolerance_for_zoom(min(zoom, MAX_ZOOM))
+        features = []
+        for feature in self.features:
+            rendered = feature.render(tolerance, bbox)
+            if rendered is not None:
+                features.append(rendered)
+        return {"type": "FeatureCollection", "features": features}
@@ -0,0 +1,70 @@
+"""
+JSON response class for large numeric payloads.
+
+Returning a Response instance makes FastAPI skip response_model validation
+and jsonable_encoder, which walk every element of the payload.  The body is
+encoded with orjson when it is installed (NumPy arrays are serialized
+natively), otherwise with the standard json module.  Either way NaN and
+infinities are written as null, never as the non-standard NaN/Infinity
+tokens.
+"""
+
+import json
+import math
+from typing import Any
+
+import numpy as np
+from starlette.responses import JSONResponse
+
+try:
+    import orjson
+except ImportError:  # optional, falls back to json
+    orjson = None
+
+
+def dumps(content: Any) -> bytes:
+    """UTF-8 JSON as FastJSONResponse renders it (also used for NDJSON lines)."""
+    if orjson is not None:
+        return orjson.dumps(content, option=orjson.OPT_SERIALIZE_NUMPY)
+    try:
+        return _dumps(content)
+    except ValueError:
+        # Non-finite Python floats; rare, so only then walk the payload.
+        return _dumps(_finite(content))
+
+
+class FastJSONResponse(JSONResponse):
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+def _dumps(content: Any) -> bytes:
+    return json.dumps(
+        content,
+        ensure_ascii=False,
+        allow_nan=False,
+        separators=(",", ":"),
+        default=_to_builtin,
+    ).encode("utf-8")
+
+
+def _finite(value: Any) -> Any:
+    if isinstance(value, float):
+        return value if math.isfinite(value) else None
+    if isinstance(value, dict):
+        return {key: _finite(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_finite(item) for item in value]
+    return value
+
+
+def _to_builtin(value: Any) -> Any:
+    # NumPy arrays and scalars without orjson; NaN/inf become null as
+    # orjson writes them.
+    if getattr(value, "dtype", None) is not None and value.dtype.kind == "f":
+        data = value.astype(object)
+        data[~np.isfinite(value)] = None
+        return data.tolist()
+    if hasattr(value, "tolist"):
+        return value.tolist()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
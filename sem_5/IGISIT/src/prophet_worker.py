@@ -0,0 +1,202 @@
+"""
+Dedicated worker processes for the Prophet fallback.
+
+Fitting Prophet loads Stan and takes seconds, so the API process never
+imports it: a small pool of spawned workers imports Prophet once, fits a
+tiny warm-up model and then serves jobs over a pipe.  A job's timeout
+starts once its worker has finished warming up (waiting for the warm-up
+is bounded separately and never kills the worker).  Jobs can be
+cancelled; a worker that overruns or is cancelled mid-job is killed and
+replaced.  When all workers are busy and the wait queue is full new jobs
+are rejected immediately with ProphetBusyError.
+"""
+
+import logging
+import multiprocessing
+import queue
+import threading
+import time
+from typing import List, Optional
+
+import pandas as pd
+
+from .forecasting import ProphetBusyError
+
+logger = logging.getLogger(__name__)
+
+POLL_INTERVAL = 0.1
+
+
+def _worker_main(conn) -> None:
+    from .forecasting import TimeSeriesForecaster
+
+    forecaster = TimeSeriesForecaster()
+    try:
+        warmup = pd.DataFrame(
+            {
+                'year': pd.to_datetime([2000, 2001, 2002, 2003], format='%Y'),
+                'value': [1.0, 2.0, 1.5, 2.5],
+            }
+        )
+        forecaster.forecast_prophet(warmup, periods=1)
+    except Exception as exc:  # pragma: no cover - depends on Stan install
+        logger.warning("Prophet warm-up failed: %s", exc)
+    conn.send(('ready', None))
+
+    while True:
+        job = conn.recv()
+        if job is None:
+            break
+        df, periods = job
+        try:
+            conn.send(('ok', forecaster.forecast_prophet(df, periods)))
+        except Exception as exc:
+            conn.send(('error', str(exc)))
+
+
+class _Worker:
+    def __init__(self, context):
+        self.conn, child_conn = context.Pipe()
+        self.process = context.Process(
+            target=_worker_main, args=(child_conn,), daemon=True
+        )
+        self.process.start()
+        child_conn.close()
+        self.ready = False
+
+    def wait_ready(self, timeout: float, cancel: Optional[threading.Event] = None) -> bool:
+        """
+        Waits for the warm-up to finish.  Returns False on timeout or
+        cancel, leaving the worker warming; EOFError if it died.
+        """
+        deadline = time.monotonic() + timeout
+        while not self.ready:
+            if self.conn.poll(POLL_INTERVAL):
+                self.conn.recv()
+                self.ready = True
+            elif (cancel is not None and cancel.is_set()) or time.monotonic() >= deadline:
+                return False
+        return True
+
+    def kill(self) -> None:
+        self.process.kill()
+        self.process.join()
+        self.conn.close()
+
+
+class ProphetWorkerPool:
+    def __init__(
+        self,
+        workers: int = 1,
+        timeout: float = 30.0,
+        max_queue: int = 4,
+        start_timeout: float = 120.0,
+    ):
+        """
+        ``timeout`` bounds the wait for a free worker and, separately, the
+        fit itself; ``start_timeout`` bounds the wait for a warming worker.
+        """
+        self.size = workers
+        self.timeout = timeout
+        self.start_timeout = start_timeout
+        self.max_queue = max_queue
+        self._context = multiprocessing.get_context('spawn')
+        self._idle: 'queue.Queue[_Worker]' = queue.Queue()
+        self._workers: List[_Worker] = []
+        self._pending = 0
+        self._lock = threading.Lock()
+        self._started = False
+
+    def start(self) -> None:
+        with self._lock:
+            if self._started:
+                return
+            for _ in range(self.size):
+                worker = _Worker(self._context)
+                self._workers.append(worker)
+                self._idle.put(worker)
+            self._started = True
+
+    def shutdown(self) -> None:
+        with self._lock:
+            for worker in self._workers:
+                worker.kill()
+            self._workers.clear()
+            self._idle = queue.Queue()
+            self._started = False
+
+    def _replace(self, worker: _Worker) -> None:
+        worker.kill()
+        with self._lock:
+            if worker in self._workers:
+                self._workers.remove(worker)
+            if not self._started:
+                return
+            fresh = _Worker(self._context)
+            self._workers.append(fresh)
+        self._idle.put(fresh)
+
+    @staticmethod
+    def _check_cancel(cancel: Optional[threading.Event]) -> None:
+        if cancel is not None and cancel.is_set():
+            raise InterruptedError("Prophet job cancelled")
+
+    def _take_idle(self, timeout: float, cancel: Optional[threading.Event]) -> _Worker:
+        deadline = time.monotonic() + timeout
+        while True:
+            self._check_cancel(cancel)
+            remaining = max(0.0, deadline - time.monotonic())
+            try:
+                return self._idle.get(timeout=min(POLL_INTERVAL, remaining))
+            except queue.Empty:
+                if time.monotonic() >= deadline:
+                    raise TimeoutError("Timed out waiting for a Prophet worker")
+
+    def forecast(
+        self,
+        df: pd.DataFrame,
+        periods: int = 10,
+        timeout: Optional[float] = None,
+        cancel: Optional[threading.Event] = None,
+    ) -> pd.DataFrame:
+        if self.size < 1:
+            raise ProphetBusyError("Prophet fallback is disabled")
+        self.start()
+        with self._lock:
+            if self._pending >= self.size + self.max_queue:
+                raise ProphetBusyError("Prophet fallback queue is full")
+            self._pending += 1
+
+        timeout = timeout or self.timeout
+        try:
+            worker = self._take_idle(timeout, cancel)
+            try:
+                ready = worker.wait_ready(self.start_timeout, cancel)
+            except BaseException:
+                self._replace(worker)
+                raise
+            if not ready:
+                # Still warming up: the next job gets it.
+                self._idle.put(worker)
+                self._check_cancel(cancel)
+                raise TimeoutError("Prophet worker did not start in time")
+
+            deadline = time.monotonic() + timeout
+            try:
+                worker.conn.send((df, periods))
+                while not worker.conn.poll(POLL_INTERVAL):
+                    self._check_cancel(cancel)
+                    if time.monotonic() >= deadline:
+                        raise TimeoutError("Prophet fallback timed out")
+                status, payload = worker.conn.recv()
+            except BaseException:
+                self._replace(worker)
+                raise
+            self._idle.put(worker)
+        finally:
+            with self._lock:
+                self._pending -= 1
+
+        if status != 'ok':
+            raise ValueError(payload)
+        return payload
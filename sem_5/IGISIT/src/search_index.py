@@ -0,0 +1,175 @@
+"""
+Search over indicator, entity and category names of all datasets.
+
+Names are case-folded (and ё folded to е) once at build time.  Prefix
+matches come from a sorted array of the folded names and of every word
+inside them, searched with bisect - the flat equivalent of a prefix trie
+that keeps the whole index in a few flat arrays.  Queries that do not match a
+prefix fall back to trigram similarity (shared trigrams / union, as
+pg_trgm does) computed with one bincount over the posting lists.
+"""
+
+import bisect
+import re
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+KINDS = ('indicator', 'entity', 'category')
+MIN_SIMILARITY = 0.3
+
+# Ranks of the match types; trigram matches score their similarity (<= 1).
+EXACT, NAME_PREFIX, WORD_PREFIX = 4.0, 3.0, 2.0
+
+_WORD = re.compile(r'\w+')
+_SPACES = re.compile(r'\s+')
+
+
+def normalize(text: str) -> str:
+    return _SPACES.sub(' ', text.casefold().replace('ё', 'е')).strip()
+
+
+def catalog_occurrences(filename: str, catalog) -> List[Tuple[str, str, str, Optional[str]]]:
+    """SearchIndex input for one DatasetCatalog."""
+    occurrences = []
+    pairs = np.unique(
+        np.stack([catalog.series_indicator, catalog.series_category], axis=1), axis=0
+    )
+    for indicator, category in pairs.tolist():
+        if indicator >= 0:
+            occurrences.append((
+                'indicator',
+                catalog.indicators[indicator],
+                filename,
+                catalog.categories[category] if category >= 0 else None,
+            ))
+    categorized = set()
+    for category, entities in catalog.category_entities.items():
+        occurrences.append(('category', category, filename, category))
+        for entity in entities:
+            occurrences.append(('entity', entity, filename, category))
+            categorized.add(entity)
+    for entity in catalog.entities:
+        if entity not in categorized:
+            occurrences.append(('entity', entity, filename, None))
+    return occurrences
+
+
+def trigrams(key: str) -> List[str]:
+    padded = f"  {key} "
+    return sorted({padded[i:i + 3] for i in range(len(padded) - 2)})
+
+
+class SearchIndex:
+    def __init__(self, occurrences: Iterable[Tuple[str, str, str, Optional[str]]]):
+        """
+        ``occurrences`` are (kind, name, filename, category or None) tuples;
+        every distinct (kind, name) becomes one result.
+        """
+        items: Dict[Tuple[str, str], Tuple[set, set]] = {}
+        for kind, name, filename, category in occurrences:
+            datasets, categories = items.setdefault((kind, name), (set(), set()))
+            datasets.add(filename)
+            if category:
+                categories.add(category)
+
+        self.kinds: List[str] = []
+        self.names: List[str] = []
+        self.datasets: List[List[str]] = []
+        self.categories: List[List[str]] = []
+        keys: List[str] = []
+        for (kind, name), (datasets, categories) in sorted(items.items()):
+            self.kinds.append(kind)
+            self.names.append(name)
+            self.datasets.append(sorted(datasets))
+            self.categories.append(sorted(categories))
+            keys.append(normalize(name))
+        self.keys = keys
+        self.kind_codes = np.array([KINDS.index(kind) for kind in self.kinds], dtype=np.int8)
+        self.name_lengths = np.array([len(key) for key in keys], dtype=np.int32)
+
+        # Prefix index: (folded name or word suffix of it, item, is whole name).
+        entries: List[Tuple[str, int, bool]] = []
+        for item, key in enumerate(keys):
+            entries.append((key, item, True))
+            for match in _WORD.finditer(key):
+                if match.start():
+                    entries.append((key[match.start():], item, False))
+        entries.sort()
+        self._prefix_keys = [entry[0] for entry in entries]
+        self._prefix_items = np.array([entry[1] for entry in entries], dtype=np.int64)
+        self._prefix_whole = np.array([entry[2] for entry in entries], dtype=bool)
+
+        # Trigram posting lists.
+        postings: Dict[str, List[int]] = {}
+        gram_counts = np.zeros(len(keys), dtype=np.int32)
+        for item, key in enumerate(keys):
+            grams = trigrams(key)
+            gram_counts[item] = len(grams)
+            for gram in grams:
+                postings.setdefault(gram, []).append(item)
+        self._postings = {gram: np.array(ids, dtype=np.int64) for gram, ids in postings.items()}
+        self._gram_counts = gram_counts
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def _prefix_scores(self, query: str) -> Dict[int, float]:
+        low = bisect.bisect_left(self._prefix_keys, query)
+        high = bisect.bisect_left(self._prefix_keys, query + '\U0010ffff', low)
+        scores: Dict[int, float] = {}
+        items = self._prefix_items[low:high].tolist()
+        whole = self._prefix_whole[low:high].tolist()
+        for item, is_whole in zip(items, whole):
+            if is_whole:
+                score = EXACT if self.keys[item] == query else NAME_PREFIX
+            else:
+                score = WORD_PREFIX
+            if score > scores.get(item, 0.0):
+                scores[item] = score
+        return scores
+
+    def _trigram_scores(self, query: str) -> Tuple[np.ndarray, np.ndarray]:
+        grams = [gram for gram in trigrams(query) if gram in self._postings]
+        if not grams or not len(self):
+            return np.zeros(0, dtype=np.int64), np.zeros(0)
+        shared = np.bincount(
+            np.concatenate([self._postings[gram] for gram in grams]), minlength=len(self)
+        )
+        candidates = np.flatnonzero(shared)
+        union = len(trigrams(query)) + self._gram_counts[candidates] - shared[candidates]
+        similarity = shared[candidates] / union
+        keep = similarity >= MIN_SIMILARITY
+        return candidates[keep], similarity[keep]
+
+    def search(self, query: str, limit: int = 20, kinds: Optional[Sequence[str]] = None) -> List[Dict]:
+        query = normalize(query)
+        if not query or limit <= 0:
+            return []
+
+        allowed = {KINDS.index(kind) for kind in kinds or KINDS if kind in KINDS}
+        scores = {
+            item: score for item, score in self._prefix_scores(query).items()
+            if self.kind_codes[item] in allowed
+        }
+        if len(scores) < limit:
+            for item, score in zip(*self._trigram_scores(query)):
+                item = int(item)
+                if item not in scores and self.kind_codes[item] in allowed:
+                    scores[item] = float(score)
+
+        # Best score first, then shorter and alphabetically earlier names.
+        ranked = sorted(
+            scores.items(),
+            key=lambda pair: (-pair[1], int(self.name_lengths[pair[0]]), self.keys[pair[0]]),
+        )[:limit]
+        return [
+            {
+                "kind": self.kinds[item],
+                "name": self.names[item],
+                "score": round(score, 3),
+                "datasets": self.datasets[item],
+                "categories": self.categories[item],
+            }
+            for item, score in ranked
+        ]
@@ -0,0 +1,292 @@
+"""
+Datasets published in POSIX shared memory for multi-worker deployments.
+
+A single publisher process (scripts/publish_shared_datasets.py) loads every
+dataset once and copies it into its own shared-memory segment:
+
+    segment = magic (8 bytes) | header length (uint64 LE) | JSON header
+              | zero padding to a 64-byte boundary | arrays, 64-byte aligned
+
+The JSON header carries the year axis and string tables (as in the .bin
+format), the CSV version the data was built from and the dtype/shape/offset
+of every array: the value matrix, the per-row codes and every derived
+array of DatasetStore (long table, key index, groups and entity year
+maps).  Workers map the segments read-only and build nothing, so the
+numbers and indexes exist once per node however many workers run.
+
+Which segments are current is described by a JSON manifest segment per
+generation.  The registry segment ``<prefix>_registry`` holds only the
+current generation number; the publisher writes all segments of a new
+generation before bumping it, and unlinks retired segments after a grace
+period (workers that still map them keep their pages until they detach).
+"""
+
+import json
+import logging
+import os
+import struct
+import time
+from multiprocessing import resource_tracker, shared_memory
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from .binary_dataset import (
+    align as _align,
+    array_layout,
+    arrays_from_buffer,
+    store_arrays,
+    store_header,
+)
+from .dataset_store import DatasetStore
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b'IGWRSHM1'
+ALIGNMENT = 64
+REGISTRY_SIZE = 64
+# Where Linux exposes POSIX shared memory; readers map segments from here.
+SHM_DIR = '/dev/shm'
+
+
+def registry_name(prefix: str) -> str:
+    return f"{prefix}_registry"
+
+
+def manifest_name(prefix: str, generation: int) -> str:
+    return f"{prefix}_{generation}_manifest"
+
+
+def encode_store(store: DatasetStore, version: Tuple[int, int]) -> Tuple[bytes, Dict[str, np.ndarray], int]:
+    """
+    Returns (prefix bytes up to the first array, arrays, total size) for
+    the shared-memory layout described in the module docstring.
+    """
+    arrays = store_arrays(store)
+    layout, position = array_layout(arrays)
+
+    header = json.dumps(
+        {
+            **store_header(store),
+            "version": list(version),
+            "arrays": layout,
+        },
+        ensure_ascii=False,
+    ).encode('utf-8')
+    prefix = MAGIC + struct.pack('<Q', len(header)) + header
+    prefix += b'\0' * ((-len(prefix)) % ALIGNMENT)
+    return prefix, arrays, len(prefix) + max(position, 1)
+
+
+def decode_store(buffer: np.ndarray) -> Tuple[DatasetStore, Tuple[int, int]]:
+    """
+    Builds a DatasetStore over a mapped segment (uint8 array) without
+    copying any of its arrays.
+    """
+    if bytes(buffer[:len(MAGIC)]) != MAGIC:
+        raise ValueError("Not a shared dataset segment")
+    (header_len,) = struct.unpack('<Q', bytes(buffer[len(MAGIC):len(MAGIC) + 8]))
+    start = len(MAGIC) + 8
+    header = json.loads(bytes(buffer[start:start + header_len]).decode('utf-8'))
+    arrays = arrays_from_buffer(buffer, _align(start + header_len), header['arrays'])
+    return DatasetStore.from_binary(header, arrays), tuple(header['version'])
+
+
+def _create_segment(name: str, size: int) -> shared_memory.SharedMemory:
+    try:
+        return shared_memory.SharedMemory(name=name, create=True, size=size)
+    except FileExistsError:
+        # Left behind by a publisher that was killed; nobody references it.
+        stale = shared_memory.SharedMemory(name=name)
+        stale.close()
+        stale.unlink()
+        return shared_memory.SharedMemory(name=name, create=True, size=size)
+
+
+class SharedDatasetPublisher:
+    """
+    Loads datasets through a DataLoader and publishes them to shared
+    memory.  Unchanged datasets keep their segment across generations.
+    """
+
+    def __init__(self, loader, filenames: Iterable[str], prefix: str, keep_seconds: float = 60.0):
+        self.loader = loader
+        self.filenames = list(filenames)
+        self.prefix = prefix
+        self.keep_seconds = keep_seconds
+        self.registry = self._open_registry()
+        # Continue numbering after a previous publisher so that names never
+        # collide and attached workers notice the restart.
+        self.generation = struct.unpack_from('<Q', self.registry.buf, 0)[0]
+        self.published: Dict[str, Dict] = {}
+        self._segments: Dict[str, shared_memory.SharedMemory] = {}
+        self._retired: List[Tuple[float, str]] = []
+
+    def _open_registry(self) -> shared_memory.SharedMemory:
+        name = registry_name(self.prefix)
+        try:
+            registry = shared_memory.SharedMemory(name=name, create=True, size=REGISTRY_SIZE)
+            struct.pack_into('<Q', registry.buf, 0, 0)
+        except FileExistsError:
+            registry = shared_memory.SharedMemory(name=name)
+        # The registry outlives the publisher: workers keep it mapped and
+        # a restarted publisher reuses it.
+        resource_tracker.unregister(registry._name, 'shared_memory')
+        return registry
+
+    def _write_segment(self, name: str, prefix: bytes, arrays: Dict[str, np.ndarray], size: int) -> None:
+        segment = _create_segment(name, size)
+        view = np.ndarray((segment.size,), dtype=np.uint8, buffer=segment.buf)
+        view[:len(prefix)] = np.frombuffer(prefix, dtype=np.uint8)
+        position = len(prefix)
+        for array in arrays.values():
+            view[position:position + array.nbytes] = array.reshape(-1).view(np.uint8)
+            position = _align(position + array.nbytes)
+        del view
+        self._segments[name] = segment
+
+    def publish_changed(self) -> bool:
+        """
+        Publishes a new generation if any dataset changed, appeared or
+        disappeared since the last call.  Returns True when it did.
+        """
+        generation = self.generation + 1
+        datasets: Dict[str, Dict] = {}
+        changed = False
+        for index, filename in enumerate(self.filenames):
+            try:
+                version = self.loader.dataset_version(filename)
+            except FileNotFoundError:
+                continue
+            entry = self.published.get(filename)
+            if entry is not None and tuple(entry['version']) == version:
+                datasets[filename] = entry
+                continue
+            try:
+                store = self.loader.load_store(filename)
+            except Exception as exc:
+                logger.warning("Failed to load %s for publishing: %s", filename, exc)
+                if entry is not None:
+                    datasets[filename] = entry
+                continue
+            prefix, arrays, size = encode_store(store, version)
+            name = f"{self.prefix}_{generation}_{index}"
+            self._write_segment(name, prefix, arrays, size)
+            datasets[filename] = {"segment": name, "version": list(version)}
+            changed = True
+
+        if not changed and datasets.keys() == self.published.keys():
+            self._unlink_retired()
+            return False
+
+        manifest = json.dumps({"generation": generation, "datasets": datasets}).encode('utf-8')
+        name = manifest_name(self.prefix, generation)
+        self._write_segment(name, struct.pack('<Q', len(manifest)) + manifest, {}, len(manifest) + 8)
+
+        now = time.monotonic()
+        if self.generation:
+            self._retired.append((now, manifest_name(self.prefix, self.generation)))
+        live = {entry['segment'] for entry in datasets.values()}
+        for entry in self.published.values():
+            if entry['segment'] not in live:
+                self._retired.append((now, entry['segment']))
+
+        # All segments of the generation exist before readers can see it.
+        struct.pack_into('<Q', self.registry.buf, 0, generation)
+        self.generation = generation
+        self.published = datasets
+        logger.info("Published generation %s (%s datasets)", generation, len(datasets))
+        self._unlink_retired()
+        return True
+
+    def _unlink_retired(self, force: bool = False) -> None:
+        deadline = time.monotonic() - self.keep_seconds
+        keep = []
+        for retired_at, name in self._retired:
+            if not force and retired_at > deadline:
+                keep.append((retired_at, name))
+                continue
+            segment = self._segments.pop(name, None)
+            if segment is not None:
+                segment.close()
+                segment.unlink()
+        self._retired = keep
+
+    def run(self, interval: float = 5.0) -> None:
+        """Publishes, then polls the data files every ``interval`` seconds."""
+        try:
+            while True:
+                self.publish_changed()
+                time.sleep(interval)
+        finally:
+            self.close()
+
+    def close(self) -> None:
+        """Unlinks every segment; the registry stays with its generation."""
+        self._retired = [(0.0, name) for name in self._segments]
+        self._unlink_retired(force=True)
+        self.registry.close()
+
+
+class SharedDatasetReader:
+    """
+    Worker side: maps the published segments read-only and caches one
+    DatasetStore per segment.  Every lookup checks the registry generation
+    (one 8-byte read) and switches to the new manifest when it changed.
+    """
+
+    def __init__(self, prefix: str, shm_dir: str = SHM_DIR):
+        self.prefix = prefix
+        self.shm_dir = shm_dir
+        self.generation = 0
+        self._registry: Optional[np.ndarray] = None
+        self._manifest: Dict[str, Dict] = {}
+        self._stores: Dict[str, Tuple[DatasetStore, Tuple[int, int]]] = {}
+
+    def _map(self, name: str) -> np.ndarray:
+        return np.memmap(os.path.join(self.shm_dir, name), dtype=np.uint8, mode='r')
+
+    def _current_generation(self) -> int:
+        if self._registry is None:
+            try:
+                self._registry = self._map(registry_name(self.prefix))
+            except (OSError, ValueError):
+                return 0
+        return int(self._registry[:8].view('<u8')[0])
+
+    def _refresh(self) -> None:
+        generation = self._current_generation()
+        if generation == self.generation:
+            return
+        try:
+            buffer = self._map(manifest_name(self.prefix, generation))
+            (length,) = struct.unpack('<Q', bytes(buffer[:8]))
+            manifest = json.loads(bytes(buffer[8:8 + length]).decode('utf-8'))
+        except (OSError, ValueError, struct.error) as exc:
+            # Publisher gone; serve local copies until it publishes again.
+            logger.warning("Shared dataset manifest %s unavailable: %s", generation, exc)
+            manifest = {"datasets": {}}
+        self._manifest = manifest['datasets']
+        live = {entry['segment'] for entry in self._manifest.values()}
+        self._stores = {name: cached for name, cached in self._stores.items() if name in live}
+        self.generation = generation
+
+    def store(self, filename: str) -> Optional[Tuple[DatasetStore, Tuple[int, int]]]:
+        """
+        (store, CSV version) of the published dataset, or None when it is
+        not published (the caller then loads it locally).
+        """
+        self._refresh()
+        entry = self._manifest.get(filename)
+        if entry is None:
+            return None
+        name = entry['segment']
+        cached = self._stores.get(name)
+        if cached is None:
+            try:
+                cached = decode_store(self._map(name))
+            except (OSError, ValueError) as exc:
+                logger.warning("Failed to attach shared dataset %s: %s", name, exc)
+                return None
+            self._stores[name] = cached
+        return cached